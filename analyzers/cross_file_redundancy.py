@@ -1,10 +1,17 @@
 import ast
+import asyncio
 import re
 import json
-import difflib
+import hashlib
+import numpy as np
 from typing import List, Dict
 from pathlib import Path
 from core.symbol_table import Symbol, SymbolType
+from core.ast_rules import Rule
+from core.lsh import MinHashLSH, multiset_items
+from core.similarity import TokenVocabulary, cluster_pairs, count_vectors, pair_similarity
+from core.source_store import SourceStore
+from core.tree_registry import TreeRegistry
 
 
 class DuplicateFunction:
@@ -15,13 +22,154 @@ class DuplicateFunction:
         self.suggestion = ""
 
 
+def _node_token(node: ast.AST) -> str:
+    """Fingerprint token for one AST node (see CrossFileRedundancyDetector._python_fingerprint)."""
+    if isinstance(node, ast.BinOp):
+        return f"BinOp_{type(node.op).__name__}"
+    if isinstance(node, ast.JoinedStr):
+        return "FStr"
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str):
+            return "ConstStr"
+        if isinstance(node.value, (int, float)):
+            return "ConstNum"
+        return "Const"
+    return type(node).__name__
+
+
+class FunctionFingerprintRule(Rule):
+    """
+    Structural fingerprints of every function in a module, keyed by (name, line),
+    identical to _python_fingerprint() of the function's own source.
+
+    That fingerprint lists the function's subtree breadth-first; within one walk
+    this is the depth-first token sequence stably sorted by depth. A function's
+    decorators are not part of its source, so their subtrees are left out.
+    """
+
+    def begin(self, tree, source=None):
+        self.depth = 0
+        self.active = []  # [function node, its depth, [(relative depth, token)], decorator ids, skipped-until depth]
+        self.fingerprints = {}
+
+    def result(self):
+        return self.fingerprints
+
+    def visit_AST(self, node):
+        token = None
+        for entry in self.active:
+            if entry[4] is None and id(node) in entry[3]:
+                entry[4] = self.depth
+            if entry[4] is None:
+                if token is None:
+                    token = _node_token(node)
+                entry[2].append((self.depth - entry[1] + 1, token))
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.active.append([node, self.depth, [(1, _node_token(node))], {id(d) for d in node.decorator_list}, None])
+        self.depth += 1
+
+    def leave_AST(self, node):
+        self.depth -= 1
+        if self.active and self.active[-1][0] is node:
+            _, _, tokens, _, _ = self.active.pop()
+            tokens.sort(key=lambda item: item[0])
+            self.fingerprints[(node.name, node.lineno)] = " ".join(["Module"] + [t for _, t in tokens])
+        for entry in self.active:
+            if entry[4] == self.depth:
+                entry[4] = None
+
+
+def _is_docstring(stmt: ast.AST) -> bool:
+    return (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant)
+            and isinstance(stmt.value.value, str))
+
+
+class CloneHashRule(Rule):
+    """
+    Clone hash of every function in a module, keyed by (name, line).
+
+    The hash covers the function's subtree in depth-first order, with depths so the
+    shape is fixed. Names the function binds (its own name, parameters, assignment /
+    loop / with / except targets, nested definitions) are renamed by first
+    occurrence; constants are reduced to their type. Functions that differ only in
+    local identifiers and literal values share a hash. Decorators and the docstring
+    are left out; attribute, keyword and free names (globals, builtins) are kept.
+    """
+
+    def begin(self, tree, source=None):
+        self.depth = 0
+        self.active = []  # [function node, its depth, tokens, bound names, skipped node ids, skipped-until depth]
+        self.hashes = {}
+
+    def result(self):
+        return self.hashes
+
+    def visit_AST(self, node):
+        for entry in self.active:
+            if entry[5] is None and id(node) in entry[4]:
+                entry[5] = self.depth
+            if entry[5] is None:
+                entry[2].append(str(self.depth - entry[1]))
+                entry[2].extend(self._tokens(node, entry[3]))
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            skipped = {id(d) for d in node.decorator_list}
+            if node.body and _is_docstring(node.body[0]):
+                skipped.add(id(node.body[0]))
+            # Recursive calls refer to the function's own name
+            self.active.append([node, self.depth, [], {node.name}, skipped, None])
+        self.depth += 1
+
+    def leave_AST(self, node):
+        self.depth -= 1
+        if self.active and self.active[-1][0] is node:
+            _, _, tokens, bound, _, _ = self.active.pop()
+            renamed = {}
+            for i, token in enumerate(tokens):
+                if isinstance(token, tuple):
+                    name = token[1]
+                    if name in bound:
+                        tokens[i] = renamed.setdefault(name, f"v{len(renamed)}")
+                    else:
+                        tokens[i] = f"={name}"
+            digest = hashlib.blake2b("\x1f".join(tokens).encode("utf-8"), digest_size=16)
+            self.hashes[(node.name, node.lineno)] = digest.hexdigest()
+        for entry in self.active:
+            if entry[5] == self.depth:
+                entry[5] = None
+
+    @staticmethod
+    def _tokens(node: ast.AST, bound: set) -> list:
+        """Tokens for one node; identifiers come back as ("id", name) until renaming."""
+        if isinstance(node, ast.Name):
+            if not isinstance(node.ctx, ast.Load):
+                bound.add(node.id)
+            return ["Name", ("id", node.id)]
+        if isinstance(node, ast.arg):
+            bound.add(node.arg)
+            return ["arg", ("id", node.arg)]
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+            return [type(node).__name__, ("id", node.name)]
+        if isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+            return ["ExceptHandler", ("id", node.name)]
+        if isinstance(node, ast.Attribute):
+            return ["Attribute", f".{node.attr}"]
+        if isinstance(node, ast.keyword):
+            return ["keyword", f"{node.arg}="]
+        return [_node_token(node)]
+
+
 class CrossFileRedundancyDetector:
     """
     Detects semantic duplicates: functions with same LOGIC but different NAMES/VARIABLES.
     
     Pipeline:
-      1. Structural Filter  — compare AST fingerprints to find candidate pairs
-      2. LLM Verification   — ask the model to confirm functional equivalence
+      1. Renamed Clones       — functions sharing a normalized-AST hash, confirmed as a group
+      2. Candidate Generation — MinHash/LSH over node-type counts, tuned to the similarity threshold
+      3. Structural Filter    — node-type count similarity of candidate pairs (vectorized)
+      4. Clone Clusters       — union-find of similar pairs, one medoid per cluster
+      5. LLM Verification     — ask the model to confirm each member against its medoid
     """
 
     # Dunder methods to skip — boilerplate that is naturally similar across classes
@@ -34,11 +182,31 @@ class CrossFileRedundancyDetector:
 
     MIN_BODY_LINES = 3           # minimum function body lines to consider
     AST_SIMILARITY_THRESHOLD = 0.30  # structural similarity cutoff for LLM pass
+    SIMILARITY_METRIC = "jaccard"    # weighted Jaccard over node-type (+ adjacent pair) counts, or "cosine"
     AUTO_CONFIRM_THRESHOLD = 0.95    # above this → auto-confirm without LLM (near-exact structure only)
+    LLM_CONCURRENCY = 8              # LLM verification requests in flight at once
+
+    # LSH candidate generation: pairs sharing a band of their MinHash signatures get compared.
+    # Bands are derived from AST_SIMILARITY_THRESHOLD (rows 3, recall 0.95 → 110 bands).
+    LSH_ROWS = 3
+    LSH_RECALL = 0.95  # chance that a pair exactly at the threshold becomes a candidate
+
+    TREE_CONSUMER = "duplicates"
+    CLONE_TREE_CONSUMER = "clones"
+    # Python fingerprints and clone hashes come from the shared per-file walk instead of re-parsing each function
+    TREE_RULE = FunctionFingerprintRule
+    CLONE_TREE_RULE = CloneHashRule
 
-    def __init__(self, symbol_table, llm_client=None):
+    def __init__(self, symbol_table, llm_client=None, source_store: SourceStore = None, tree_registry: TreeRegistry = None, llm_concurrency: int = None):
         self.symbol_table = symbol_table
         self.llm_client = llm_client
+        self.llm_concurrency = max(1, llm_concurrency or self.LLM_CONCURRENCY)
+        if tree_registry is None:
+            tree_registry = TreeRegistry(source_store)
+            tree_registry.register_consumer(self.TREE_CONSUMER, ["python"], rule=self.TREE_RULE)
+            tree_registry.register_consumer(self.CLONE_TREE_CONSUMER, ["python"], rule=self.CLONE_TREE_RULE)
+        self.trees = tree_registry
+        self.sources = tree_registry.sources
 
     # ── Main entry point ─────────────────────────────────────────────
     async def detect_duplicates(self, console=None) -> List[DuplicateFunction]:
@@ -46,11 +214,18 @@ class CrossFileRedundancyDetector:
 
         # ── Step 0: exact duplicate definitions (same name, same scope) ──
         seen_files = {sym.file for sym in self.symbol_table.symbols.values()}
+        file_fingerprints: Dict[str, Dict[tuple, str]] = {}
+        file_clone_hashes: Dict[str, Dict[tuple, str]] = {}
 
         for file_path in seen_files:
+            if file_path.suffix != '.py':
+                continue
             try:
-                source = file_path.read_text(encoding='utf-8')
-                tree = ast.parse(source)
+                source = self.sources.read_text(file_path)
+                tree = self.trees.python_tree(file_path)
+                file_fingerprints[str(file_path)] = self.trees.rule_result(file_path, self.TREE_CONSUMER, self.TREE_RULE)
+                file_clone_hashes[str(file_path)] = self.trees.rule_result(
+                    file_path, self.CLONE_TREE_CONSUMER, self.CLONE_TREE_RULE)
                 exact_dups = self._find_duplicate_defs(tree, file_path, source)
                 if exact_dups:
                     duplicates.extend(exact_dups)
@@ -63,6 +238,9 @@ class CrossFileRedundancyDetector:
                             )
             except Exception:
                 pass
+            finally:
+                self.trees.release(file_path, self.TREE_CONSUMER)
+                self.trees.release(file_path, self.CLONE_TREE_CONSUMER)
 
         # ── Step 1: collect candidate functions ──────────────────────
         functions = [
@@ -83,96 +261,183 @@ class CrossFileRedundancyDetector:
         fingerprints: Dict[str, str] = {}
         for func in functions:
             try:
-                fp = self._fingerprint(func.body_code, func.file.suffix)
+                fp = file_fingerprints.get(str(func.file), {}).get((func.name, func.line))
+                if fp is None:
+                    fp = self._fingerprint(func.body_code, func.file.suffix)
                 fingerprints[func.qualified_name] = fp
             except Exception:
                 fingerprints[func.qualified_name] = ""
 
-        # ── Step 3: pairwise comparison ──────────────────────────────
+        # ── Step 3: renamed clones (one hash bucket per group) ───────
         functions.sort(key=lambda x: x.qualified_name)
-        compared_pairs = set()  # track already-compared pairs to avoid duplicates
+        buckets: Dict[str, List[Symbol]] = {}
+        for func in functions:
+            clone_hash = file_clone_hashes.get(str(func.file), {}).get((func.name, func.line))
+            if clone_hash:
+                buckets.setdefault(clone_hash, []).append(func)
 
-        for i, func1 in enumerate(functions):
-            fp1 = fingerprints.get(func1.qualified_name, "")
-            if not fp1:
+        grouped = set()  # clone-group members other than the first; the first stands in for them below
+        for members in buckets.values():
+            if len(members) < 2:
                 continue
+            dup = DuplicateFunction(
+                functions=members,
+                similarity=1.0,
+                reason=(f"Renamed clones: {len(members)} functions with identical structure "
+                        f"once local names are renamed and constants abstracted."),
+            )
+            dup.suggestion = "Keep one function and call it from the others"
+            duplicates.append(dup)
+            grouped.update(func.qualified_name for func in members[1:])
+            if console:
+                names = ", ".join(f"{f.name} ({f.file.name}:{f.line})" for f in members)
+                console.print(f"  [red]⚠ Clone group: {names}[/red]")
+        functions = [func for func in functions if func.qualified_name not in grouped]
+
+        # ── Step 4: LSH candidate pairs ──────────────────────────────
+        # MinHash over the same count features Step 5 scores, banded so pairs at the similarity threshold collide
+        token_lists = [fingerprints.get(func.qualified_name, "").split() for func in functions]
+        vocabulary = TokenVocabulary()
+        token_arrays = [vocabulary.encode(tokens) for tokens in token_lists]
+        vectors = count_vectors(token_arrays, len(vocabulary))
+        lsh = MinHashLSH.for_threshold(self.AST_SIMILARITY_THRESHOLD, rows=self.LSH_ROWS, recall=self.LSH_RECALL)
+        signatures = [lsh.signature(multiset_items(row)) for row in vectors]
+        candidates = lsh.candidate_pairs(signatures)
+        # skip methods of the same class (e.g. get vs set)
+        class_names = {}
+        class_ids = np.array([class_names.setdefault(func.parent_name, len(class_names)) if func.parent_name else -1
+                              for func in functions], dtype=np.int64)
+        left, right = class_ids[candidates[:, 0]], class_ids[candidates[:, 1]]
+        candidates = candidates[(left < 0) | (left != right)]
+
+        # ── Step 5: structural similarity of all candidates at once ──
+        similarities = pair_similarity(vectors, candidates, self.SIMILARITY_METRIC)
+        passing = np.flatnonzero(similarities >= self.AST_SIMILARITY_THRESHOLD)
 
-            for func2 in functions[i + 1:]:
-                fp2 = fingerprints.get(func2.qualified_name, "")
-                if not fp2:
-                    continue
-
-                # ensure each pair is only compared once
-                pair_key = tuple(sorted([func1.qualified_name, func2.qualified_name]))
-                if pair_key in compared_pairs:
-                    continue
-                compared_pairs.add(pair_key)
+        if console:
+            console.print(
+                f"  [dim]{len(candidates)} candidate pair(s) after LSH banding, "
+                f"{len(passing)} structurally similar (≥{self.AST_SIMILARITY_THRESHOLD:.0%})[/dim]"
+            )
 
-                # skip methods of the same class (e.g. get vs set)
-                if (func1.parent_name and func2.parent_name
-                        and func1.parent_name == func2.parent_name):
-                    continue
+        # ── Step 6: clone clusters, verified against their medoid ────
+        duplicates.extend(await self._verify_clusters(functions, vectors, candidates[passing], similarities[passing], console))
+        return duplicates
 
-                # structural similarity
-                sim = difflib.SequenceMatcher(None, fp1, fp2).ratio()
+    # ── Clone Clusters ───────────────────────────────────────────────
 
+    async def _verify_clusters(self, functions: List[Symbol], vectors: np.ndarray, pairs: np.ndarray,
+                               similarities: np.ndarray, console=None) -> List[DuplicateFunction]:
+        """
+        Group the structurally similar (i, j) pairs into connected clusters and
+        check each member against the cluster medoid (the member with the highest
+        summed similarity), so k copies of a helper cost k - 1 checks instead of
+        k(k-1)/2. Members the LLM rejects are re-clustered among themselves for
+        another round. Each confirmed cluster is reported once, in member order.
+        """
+        reported = []
+        while len(pairs):
+            strength = (np.bincount(pairs[:, 0], weights=similarities, minlength=len(functions))
+                        + np.bincount(pairs[:, 1], weights=similarities, minlength=len(functions)))
+            clusters = []
+            for members in cluster_pairs(len(functions), pairs):
+                medoid = max(members, key=lambda m: (strength[m], -m))
+                clusters.append((medoid, [m for m in members if m != medoid]))
+            medoid_pairs = np.array([(medoid, m) for medoid, others in clusters for m in others], dtype=np.int64)
+            medoid_sims = iter(pair_similarity(vectors, medoid_pairs, self.SIMILARITY_METRIC).tolist())
+
+            # verdicts[(medoid, member)] = (similarity, "auto" | "structural" | LLM result dict)
+            verdicts = {}
+            pending = []
+            for medoid, others in clusters:
                 if console:
-                    console.print(
-                        f"  [dim]{func1.name} ({func1.file.name}:{func1.line}) vs "
-                        f"{func2.name} ({func2.file.name}:{func2.line}): "
-                        f"structural={sim:.0%}[/dim]"
-                    )
-
-                if sim < self.AST_SIMILARITY_THRESHOLD:
-                    continue
-
-                # ── Step 4: LLM verification ─────────────────────────
-                scope = "same-file" if func1.file == func2.file else "cross-file"
+                    head = functions[medoid]
+                    scope = "same-file" if all(functions[m].file == head.file for m in others) else "cross-file"
+                    names = " ↔ ".join(f"{f.name} ({f.file.name}:{f.line})" for f in [head] + [functions[m] for m in others])
+                    label = "Candidate" if len(others) == 1 else f"Clone cluster of {len(others) + 1}"
+                    console.print(f"  [cyan]🔍 {label} ({scope}): {names}[/cyan]")
+                for m in others:
+                    sim = next(medoid_sims)
+                    if sim >= self.AUTO_CONFIRM_THRESHOLD:
+                        # Very high structural match → auto-confirm
+                        verdicts[(medoid, m)] = (sim, "auto")
+                    elif sim < self.AST_SIMILARITY_THRESHOLD:
+                        # only chained to the medoid through other members → next round
+                        verdicts[(medoid, m)] = (sim, {"are_duplicates": False})
+                    elif self.llm_client:
+                        pending.append((medoid, m, sim))
+                    else:
+                        # no LLM → trust structural similarity alone
+                        verdicts[(medoid, m)] = (sim, "structural")
+
+            if pending:
                 if console:
                     console.print(
-                        f"  [cyan]🔍 Candidate ({scope}): "
-                        f"{func1.name} ({func1.file.name}:{func1.line}) ↔ "
-                        f"{func2.name} ({func2.file.name}:{func2.line}) "
-                        f"(structural {sim:.0%})[/cyan]"
+                        f"  [dim]Verifying {len(pending)} cluster member(s) with the LLM "
+                        f"({min(self.llm_concurrency, len(pending))} at a time)...[/dim]"
                     )
+                semaphore = asyncio.Semaphore(self.llm_concurrency)
 
-                is_dup = False
-                reason = f"Structurally similar ({sim:.0%})"
-                suggestion = ""
-
-                if sim >= self.AUTO_CONFIRM_THRESHOLD:
-                    # Very high structural match → auto-confirm
-                    is_dup = True
-                    reason = (f"Near-identical code structure ({sim:.0%} AST match). "
-                              f"Both functions have the same control flow, operations, "
-                              f"and return pattern — only variable names differ.")
-                    suggestion = "Keep one function and remove the other"
-                elif self.llm_client:
-                    result = await self._llm_verify(func1, func2)
-                    is_dup = result.get("are_duplicates", False)
-                    if is_dup:
-                        reason = result.get("shared_logic_summary", "Same logic")
-                        suggestion = result.get("optimization_suggestion", "")
-                else:
-                    # no LLM → trust structural similarity alone
-                    is_dup = True
+                async def verify(medoid, member, sim):
+                    async with semaphore:
+                        return medoid, member, sim, await self._llm_verify(functions[medoid], functions[member])
 
-                if is_dup:
-                    dup = DuplicateFunction(
-                        functions=[func1, func2],
-                        similarity=sim,
-                        reason=reason,
-                    )
-                    dup.suggestion = suggestion
-                    duplicates.append(dup)
-                    if console:
-                        console.print("    [red]⚠ Confirmed duplicate![/red]")
-                else:
+                for finished in asyncio.as_completed([verify(*entry) for entry in pending]):
+                    medoid, member, sim, result = await finished
+                    verdicts[(medoid, member)] = (sim, result)
                     if console:
-                        console.print("    [green]✓ Not a duplicate[/green]")
-
-        return duplicates
-
+                        pair = f"{functions[medoid].name} ↔ {functions[member].name}"
+                        if result.get("are_duplicates", False):
+                            console.print(f"    [red]⚠ Confirmed duplicate: {pair}[/red]")
+                        else:
+                            console.print(f"    [green]✓ Not a duplicate: {pair}[/green]")
+
+            rejected = np.zeros(len(functions), dtype=bool)
+            for medoid, others in clusters:
+                confirmed = []
+                for m in others:
+                    sim, verdict = verdicts[(medoid, m)]
+                    if isinstance(verdict, str) or verdict.get("are_duplicates", False):
+                        confirmed.append((m, sim, verdict))
+                    else:
+                        rejected[m] = True
+                if confirmed:
+                    first = min(medoid, *(m for m, _, _ in confirmed))
+                    reported.append((first, self._cluster_duplicate(functions, medoid, confirmed)))
+            keep = rejected[pairs[:, 0]] & rejected[pairs[:, 1]]
+            pairs, similarities = pairs[keep], similarities[keep]
+
+        reported.sort(key=lambda entry: entry[0])
+        return [dup for _, dup in reported]
+
+    def _cluster_duplicate(self, functions: List[Symbol], medoid: int, confirmed: List[tuple]) -> DuplicateFunction:
+        """One finding for a medoid and its confirmed (member, similarity, verdict) entries."""
+        members = [functions[medoid]] + [functions[m] for m, _, _ in confirmed]
+        sim = min(s for _, s, _ in confirmed)
+        llm_results = [verdict for _, _, verdict in confirmed if isinstance(verdict, dict)]
+        if llm_results:
+            reason = llm_results[0].get("shared_logic_summary", "Same logic")
+            suggestion = llm_results[0].get("optimization_suggestion", "")
+            if len(members) > 2:
+                reason = f"Clone cluster of {len(members)} functions. {reason}"
+        elif all(verdict == "auto" for _, _, verdict in confirmed):
+            if len(members) == 2:
+                reason = (f"Near-identical code structure ({sim:.0%} AST match). "
+                          f"Both functions have the same control flow, operations, "
+                          f"and return pattern — only variable names differ.")
+                suggestion = "Keep one function and remove the other"
+            else:
+                reason = (f"Near-identical code structure: {len(members)} functions, each at least "
+                          f"{sim:.0%} AST match to {members[0].name} — only variable names differ.")
+                suggestion = "Keep one function and call it from the others"
+        else:
+            reason = f"Structurally similar ({sim:.0%})"
+            if len(members) > 2:
+                reason = f"Structurally similar clone cluster of {len(members)} functions (≥{sim:.0%} match to {members[0].name})"
+            suggestion = ""
+        dup = DuplicateFunction(functions=members, similarity=sim, reason=reason)
+        dup.suggestion = suggestion
+        return dup
     # ── Structural Fingerprinting ────────────────────────────────────
 
     def _fingerprint(self, code: str, extension: str) -> str:
@@ -4,20 +4,94 @@ Deterministic logic checks using AST traversal.
 """
 
 import ast
+import builtins
 from pathlib import Path
 from typing import List, Dict
+from core.ast_rules import Rule, run_rules
+from core.source_store import SourceStore
+from core.tree_registry import TreeRegistry
+
+class UndefinedVariableRule(Rule):
+    """Simple scope analysis for undefined variables."""
+
+    def begin(self, tree, source=None):
+        # Build set of defined names (using standard builtins)
+        defined = set(dir(builtins))
+        # Extra safety for core builtins that might be missed in some envs
+        defined.update({'print', 'len', 'range', 'int', 'str', 'round', 'abs', 'min', 'max', 'sum', 'sorted', 'any', 'all'})
+        self.scopes = [defined]
+        self.undefined = []
+
+    def result(self) -> List[Dict]:
+        return self.undefined
+
+    def visit_FunctionDef(self, node):
+        self.scopes[-1].add(node.name)
+        # New scope for function
+        new_scope = self.scopes[-1].copy()
+        for arg in node.args.args:
+            new_scope.add(arg.arg)
+        self.scopes.append(new_scope)
+
+    def leave_FunctionDef(self, node):
+        self.scopes.pop()
+
+    def visit_ClassDef(self, node):
+        self.scopes[-1].add(node.name)
+        # Classes have a scope but it works differently in Python
+        # For simplicity, we'll just add the class name to current scope
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.scopes[-1].add(target.id)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            # Check if name exists in any visible scope
+            is_defined = False
+            for scope in reversed(self.scopes):
+                if node.id in scope:
+                    is_defined = True
+                    break
+            
+            if not is_defined:
+                self.undefined.append({
+                    "line": node.lineno,
+                    "message": f"Undefined variable '{node.id}'"
+                })
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.scopes[-1].add(alias.name if not alias.asname else alias.asname)
+
+    visit_ImportFrom = visit_Import
 
 class StaticBugDetector:
     """Detects deterministic bugs in Python code without AI."""
 
+    TREE_CONSUMER = "bugs"
+    # Checks run as rules, so they share the per-file walk with other analyzers
+    TREE_RULE = UndefinedVariableRule
+
+    def __init__(self, source_store: SourceStore = None, tree_registry: TreeRegistry = None):
+        if tree_registry is None:
+            tree_registry = TreeRegistry(source_store)
+            tree_registry.register_consumer(self.TREE_CONSUMER, ["python"], rule=self.TREE_RULE)
+        self.trees = tree_registry
+        self.sources = tree_registry.sources
+
     def analyze_file(self, file_path: Path) -> List[Dict]:
         """Analyze a Python file for static bugs."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            return self.analyze_code(code)
+            try:
+                return self.trees.rule_result(file_path, self.TREE_CONSUMER, self.TREE_RULE)
+            except SyntaxError:
+                return [] # Handled by Phase 2
         except Exception as e:
             return [{"line": 0, "message": f"Static analysis failed: {e}"}]
+        finally:
+            self.trees.release(file_path, self.TREE_CONSUMER)
 
     def analyze_code(self, code: str) -> List[Dict]:
         """Analyze Python code string for bugs."""
@@ -25,76 +99,8 @@ class StaticBugDetector:
             tree = ast.parse(code)
         except SyntaxError:
             return [] # Handled by Phase 2
+        return self._analyze_tree(tree)
 
-        issues = []
-        
-        # 1. Undefined Variable Detection
-        issues.extend(self._find_undefined_variables(tree))
-        
-        return issues
-
-    def _find_undefined_variables(self, tree: ast.AST) -> List[Dict]:
-        """Simple scope analysis for undefined variables."""
-        undefined = []
-        
-        # Build set of defined names (using standard builtins)
-        import builtins
-        defined = set(dir(builtins))
-        # Extra safety for core builtins that might be missed in some envs
-        defined.update({'print', 'len', 'range', 'int', 'str', 'round', 'abs', 'min', 'max', 'sum', 'sorted', 'any', 'all'})
-        
-        class ScopeVisitor(ast.NodeVisitor):
-            def __init__(self):
-                self.scopes = [defined.copy()]
-            
-            def visit_FunctionDef(self, node):
-                self.scopes[-1].add(node.name)
-                # New scope for function
-                new_scope = self.scopes[-1].copy()
-                for arg in node.args.args:
-                    new_scope.add(arg.arg)
-                self.scopes.append(new_scope)
-                self.generic_visit(node)
-                self.scopes.pop()
-
-            def visit_ClassDef(self, node):
-                self.scopes[-1].add(node.name)
-                # Classes have a scope but it works differently in Python
-                # For simplicity, we'll just add the class name to current scope
-                self.generic_visit(node)
-
-            def visit_Assign(self, node):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        self.scopes[-1].add(target.id)
-                self.generic_visit(node)
-
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Load):
-                    # Check if name exists in any visible scope
-                    is_defined = False
-                    for scope in reversed(self.scopes):
-                        if node.id in scope:
-                            is_defined = True
-                            break
-                    
-                    if not is_defined:
-                        undefined.append({
-                            "line": node.lineno,
-                            "message": f"Undefined variable '{node.id}'"
-                        })
-                self.generic_visit(node)
-
-            def visit_Import(self, node):
-                for alias in node.names:
-                    self.scopes[-1].add(alias.name if not alias.asname else alias.asname)
-                self.generic_visit(node)
-
-            def visit_ImportFrom(self, node):
-                for alias in node.names:
-                    self.scopes[-1].add(alias.name if not alias.asname else alias.asname)
-                self.generic_visit(node)
-
-        visitor = ScopeVisitor()
-        visitor.visit(tree)
-        return undefined
+    def _analyze_tree(self, tree: ast.AST) -> List[Dict]:
+        """Run all static checks over a parsed module."""
+        return run_rules(tree, [self.TREE_RULE()])[0]
@@ -6,8 +6,11 @@ Deterministic syntax checking:
 """
 
 import ast
+import bisect
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from core.source_store import SourceStore
+from core.tree_registry import TreeRegistry
 
 try:
     import tree_sitter_languages
@@ -16,6 +19,9 @@ try:
 except ImportError:
     TREESITTER_AVAILABLE = False
 
+# Bump whenever syntax checking logic changes — invalidates cached results
+CHECKER_VERSION = "1"
+
 class FileSyntaxError:
     def __init__(self, message: str = "", parser: str = "unknown", line: int = 0, column: int = 0):
         self.line = line
@@ -26,11 +32,47 @@ class FileSyntaxError:
         self.type = "syntax_error"
         self.severity = "critical"
 
+class _ErrorSite:
+    """Where a Tree-sitter ERROR/MISSING node sits (enough to rebuild its message after an edit)."""
+    __slots__ = ("start_byte", "end_byte", "row", "column", "is_missing", "node_type", "text")
+
+    def __init__(self, node):
+        self.start_byte = node.start_byte
+        self.end_byte = node.end_byte
+        self.row, self.column = node.start_point
+        self.is_missing = getattr(node, 'is_missing', False)
+        self.node_type = node.type
+        self.text = ""
+        if not self.is_missing:
+            try:
+                self.text = node.text.decode('utf-8', errors='replace')[:50]
+            except:
+                pass
+
+class _EditState:
+    """Last Tree-sitter parse of a file in the fix loop, reused for incremental re-parsing."""
+    __slots__ = ("path", "language", "source_bytes", "tree", "sites")
+
+    def __init__(self, path, language, source_bytes, tree, sites):
+        self.path = path
+        self.language = language
+        self.source_bytes = source_bytes
+        self.tree = tree
+        self.sites = sites
+
 class StaticSyntaxAnalyzer:
     """Analyze source files for syntax errors using native AST (Python) or Tree-sitter (C/C++/Java)."""
     
-    def __init__(self, llm_client=None):
+    TREE_CONSUMER = "syntax"
+    
+    def __init__(self, llm_client=None, cache=None, source_store: SourceStore = None, tree_registry: TreeRegistry = None):
         self.llm_client = llm_client
+        self.cache = cache  # Optional ParseCache
+        if tree_registry is None:
+            tree_registry = TreeRegistry(source_store)
+            tree_registry.register_consumer(self.TREE_CONSUMER)
+        self.trees = tree_registry
+        self.sources = tree_registry.sources
         self.lang_map = {
             '.py': 'python',
             '.c': 'c',
@@ -54,6 +96,9 @@ class StaticSyntaxAnalyzer:
                     pass
         else:
             print("[DEBUG] Tree-sitter NOT available (ImportError)")
+        
+        # Fix loop state for the file currently being edited (see recheck_file)
+        self._edit_state: Optional[_EditState] = None
     
     def analyze_file(self, file_path: Path) -> Tuple[bool, List[FileSyntaxError]]:
         """
@@ -66,24 +111,161 @@ class StaticSyntaxAnalyzer:
         ext = file_path.suffix.lower()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source = f.read()
+            source = self.sources.read_text(file_path)
         except Exception as e:
             return False, [FileSyntaxError(f"Read error: {str(e)}", "io-error")]
         
-        if ext == '.py':
-            return self._check_python_code(source)
+        language = self.lang_map.get(ext)
+        if language is None or (language != 'python' and language not in self.ts_parsers):
+            # Unknown extension, or Tree-sitter not available for this language
+            return True, []
         
-        elif ext in self.lang_map:
-            language = self.lang_map[ext]
-            if language in self.ts_parsers:
-                return self._check_treesitter_syntax(source, language)
-            else:
-                # Tree-sitter not available for this language
-                return True, []
+        try:
+            return self._analyze_source(file_path, source, language)
+        finally:
+            self.trees.release(file_path, self.TREE_CONSUMER)
+
+    def _analyze_source(self, file_path: Path, source: str, language: str) -> Tuple[bool, List[FileSyntaxError]]:
+        """Check a file's source, consulting the parse cache and shared tree registry."""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(source, language, f"syntax-{CHECKER_VERSION}")
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                errors = [FileSyntaxError(message=m, parser=p, line=l, column=c) for l, c, m, p in cached]
+                return (len(errors) == 0), errors
         
+        if language == 'python':
+            is_valid, errors = self._check_python_code(source, parse=lambda _: self.trees.python_tree(file_path))
         else:
-            return True, []
+            is_valid, errors = self._check_treesitter_syntax(source, language, tree=self.trees.get(file_path, language))
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, [(e.line, e.column, e.message, e.parser) for e in errors])
+        return is_valid, errors
+
+    def recheck_file(self, file_path: Path) -> Tuple[bool, List[FileSyntaxError]]:
+        """
+        Re-check a file after the user edited it (interactive fix loop).
+
+        Tree-sitter files keep their previous tree: the edit range is taken from the
+        on-disk diff (common prefix/suffix), the old tree is edited and re-parsed
+        incrementally, and only nodes inside the changed ranges are re-walked; errors
+        elsewhere are carried over with shifted positions. Python files are simply
+        re-parsed.
+        """
+        self.trees.invalidate(file_path)
+        language = self.lang_map.get(file_path.suffix.lower())
+        if language is None or language == 'python' or language not in self.ts_parsers:
+            return self.analyze_file(file_path)
+        
+        if not file_path.exists():
+            return False, [FileSyntaxError(f"File not found: {file_path}", "os-error")]
+        try:
+            source = self.sources.read_text(file_path)
+            data = self.sources.read_bytes(file_path)
+        except Exception as e:
+            return False, [FileSyntaxError(f"Read error: {str(e)}", "io-error")]
+        source_bytes = data if isinstance(data, bytes) else data[:]
+        
+        state = self._edit_state
+        if state is None or state.path != str(file_path) or state.language != language:
+            tree = self.ts_parsers[language].parse(source_bytes)
+            sites = self._find_error_sites(tree.root_node)
+        elif state.source_bytes == source_bytes:
+            tree, sites = state.tree, state.sites
+        else:
+            tree, sites = self._reparse_incremental(state, source_bytes)
+        
+        self._edit_state = _EditState(str(file_path), language, source_bytes, tree, sites)
+        if not sites:
+            self._edit_state = None  # File is clean; nothing left to fix
+        
+        source_lines = source.splitlines()
+        errors = [self._site_error(site, source_lines, language) for site in sites]
+        return (len(errors) == 0), errors
+
+    def _reparse_incremental(self, state: _EditState, new_bytes: bytes):
+        """Apply the on-disk diff to the previous tree and re-parse; returns (tree, error sites)."""
+        old_bytes = state.source_bytes
+        
+        # Edit range = everything between the common prefix and the common suffix
+        limit = min(len(old_bytes), len(new_bytes))
+        start = self._common_prefix(old_bytes, new_bytes, limit)
+        suffix = self._common_prefix(old_bytes[start:][::-1], new_bytes[start:][::-1], limit - start)
+        old_end = len(old_bytes) - suffix
+        new_end = len(new_bytes) - suffix
+        
+        start_point = self._byte_point(old_bytes, start)
+        old_end_point = self._byte_point(old_bytes, old_end)
+        new_end_point = self._byte_point(new_bytes, new_end)
+        
+        old_tree = state.tree
+        old_tree.edit(
+            start_byte=start, old_end_byte=old_end, new_end_byte=new_end,
+            start_point=start_point, old_end_point=old_end_point, new_end_point=new_end_point
+        )
+        tree = self.ts_parsers[state.language].parse(new_bytes, old_tree)
+        if not tree.root_node.has_error:
+            return tree, []
+        
+        # Regions whose errors must be re-discovered: structural changes + the edited text itself
+        regions = [(r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree)]
+        regions.append((start, new_end))
+        
+        # Errors from the previous parse, moved past the edit (those overlapping it are dropped)
+        delta = new_end - old_end
+        previous = []
+        for site in state.sites:
+            if site.start_byte <= old_end and site.end_byte >= start:
+                continue
+            if site.start_byte >= old_end:
+                if site.row == old_end_point[0]:
+                    site.column += new_end_point[1] - old_end_point[1]
+                site.row += new_end_point[0] - old_end_point[0]
+                site.start_byte += delta
+                site.end_byte += delta
+            previous.append(site)
+        
+        # Re-walk only subtrees touching a changed region; untouched subtrees keep their old errors
+        sites = []
+        stack = [tree.root_node]
+        while stack:
+            node = stack.pop()
+            if node.type == 'ERROR' or getattr(node, 'is_missing', False):
+                sites.append(_ErrorSite(node))
+            elif not node.has_error:
+                continue
+            elif any(node.start_byte <= hi and node.end_byte >= lo for lo, hi in regions):
+                stack.extend(reversed(node.children))
+            else:
+                lo = bisect.bisect_left(previous, node.start_byte, key=lambda site: site.start_byte)
+                hi = bisect.bisect_right(previous, node.end_byte, key=lambda site: site.start_byte)
+                inside = [site for site in previous[lo:hi] if site.end_byte <= node.end_byte]
+                # A zero-width MISSING node on the boundary may belong to a neighbour: walk instead
+                if any(site.start_byte == site.end_byte in (node.start_byte, node.end_byte) for site in inside):
+                    stack.extend(reversed(node.children))
+                else:
+                    sites.extend(inside)
+        
+        return tree, sites
+
+    @staticmethod
+    def _common_prefix(a: bytes, b: bytes, limit: int, chunk: int = 4096) -> int:
+        """Length of the common prefix (compared chunk-wise so large files stay fast)."""
+        pos = 0
+        while pos < limit and a[pos:pos + chunk] == b[pos:pos + chunk]:
+            pos += chunk
+        pos = min(pos, limit)
+        end = min(pos + chunk, limit)
+        while pos < end and a[pos] == b[pos]:
+            pos += 1
+        return pos
+
+    @staticmethod
+    def _byte_point(data: bytes, offset: int) -> Tuple[int, int]:
+        row = data.count(b'\n', 0, offset)
+        return row, offset - (data.rfind(b'\n', 0, offset) + 1)
 
     def analyze_code(self, code: str, extension: str) -> Tuple[bool, List[FileSyntaxError]]:
         """
@@ -98,10 +280,10 @@ class StaticSyntaxAnalyzer:
         
         return True, []
     
-    def _check_python_code(self, source: str) -> Tuple[bool, List[FileSyntaxError]]:
-        """Check Python code string using ast module."""
+    def _check_python_code(self, source: str, parse=ast.parse) -> Tuple[bool, List[FileSyntaxError]]:
+        """Check Python code string using ast module (or a shared-tree lookup passed as `parse`)."""
         try:
-            ast.parse(source)
+            parse(source)
             return True, []
             
         except SyntaxError as e:
@@ -120,60 +302,66 @@ class StaticSyntaxAnalyzer:
             )
             return False, [error]
 
-    def _check_treesitter_syntax(self, source: str, language: str) -> Tuple[bool, List[FileSyntaxError]]:
+    def _check_treesitter_syntax(self, source: str, language: str, tree=None) -> Tuple[bool, List[FileSyntaxError]]:
         """
         Check C/C++/Java code using Tree-sitter.
         Walks the parse tree for ERROR and MISSING nodes.
         Deduplicates nested errors (if parent is ERROR, skip children).
         """
-        parser = self.ts_parsers[language]
-        tree = parser.parse(bytes(source, 'utf-8'))
+        if tree is None:
+            parser = self.ts_parsers[language]
+            tree = parser.parse(bytes(source, 'utf-8'))
         
         source_lines = source.splitlines()
-        errors = []
+        errors = [self._site_error(site, source_lines, language) for site in self._find_error_sites(tree.root_node)]
+        return (len(errors) == 0), errors
+
+    @staticmethod
+    def _find_error_sites(root) -> List[_ErrorSite]:
+        """
+        Collect ERROR and MISSING nodes in document order.
+        Children of ERROR nodes are skipped to avoid duplicates.
+        """
+        if not root.has_error:
+            return []
         
-        def walk(node, parent_is_error=False):
-            is_error = node.type == 'ERROR'
-            is_missing = getattr(node, 'is_missing', False) 
-            
-            if (is_error or is_missing) and not parent_is_error:
-                line = node.start_point[0] + 1
-                col = node.start_point[1] + 1
-                col = node.start_point[1] + 1
-                end_line = node.end_point[0] + 1
-                
-                # Build a descriptive error message
-                if is_missing:
-                    msg = f"Missing expected token: '{node.type}'"
-                else:
-                    # Get the problematic text (truncated)
-                    try:
-                        text = node.text.decode('utf-8', errors='replace')[:50]
-                        if len(text) > 40:
-                            text = text[:40] + "..."
-                    except:
-                        text = ""
-                    
-                    # Get the source line for context
-                    if 0 < line <= len(source_lines):
-                        src_line = source_lines[line - 1].strip()
-                        msg = f"Syntax error near: '{src_line[:60]}'"
-                    elif text:
-                        msg = f"Unexpected syntax: '{text}'"
-                    else:
-                        msg = "Syntax error"
-                
-                errors.append(FileSyntaxError(
-                    message=msg,
-                    parser=f"{language}-treesitter",
-                    line=line,
-                    column=col
-                ))
+        sites = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.type == 'ERROR' or getattr(node, 'is_missing', False):
+                sites.append(_ErrorSite(node))
+                continue
+            if node.has_error:
+                stack.extend(reversed(node.children))
+        return sites
+
+    @staticmethod
+    def _site_error(site: _ErrorSite, source_lines: List[str], language: str) -> FileSyntaxError:
+        """Build a descriptive error message for an ERROR/MISSING node."""
+        line = site.row + 1
+        col = site.column + 1
+        
+        if site.is_missing:
+            msg = f"Missing expected token: '{site.node_type}'"
+        else:
+            # Get the problematic text (truncated)
+            text = site.text
+            if len(text) > 40:
+                text = text[:40] + "..."
             
-            # Walk children — skip children of ERROR nodes to avoid duplicates
-            for child in node.children:
-                walk(child, parent_is_error=(is_error or parent_is_error))
+            # Get the source line for context
+            if 0 < line <= len(source_lines):
+                src_line = source_lines[line - 1].strip()
+                msg = f"Syntax error near: '{src_line[:60]}'"
+            elif text:
+                msg = f"Unexpected syntax: '{text}'"
+            else:
+                msg = "Syntax error"
         
-        walk(tree.root_node)
-        return (len(errors) == 0), errors
-
+        return FileSyntaxError(
+            message=msg,
+            parser=f"{language}-treesitter",
+            line=line,
+            column=col
+        )
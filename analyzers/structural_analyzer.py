@@ -1,90 +1,198 @@
-import networkx as nx
+import ast
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Tuple, Optional
 from core.symbol_table import SymbolTableBuilder, Symbol as STSymbol, SymbolType as STSymbolType
-from core.ast_parser import StructuralParser
+from core.ast_parser import StructuralParser, PythonStructureRule
+from core.ast_rules import Rule
+from core.source_store import SourceStore
+from core.tree_registry import TreeRegistry
+from core.scc import find_cycles
+from core.compact_graph import CompactGraph
+from core.entry_points import EntryPoints
+from core.class_hierarchy import ClassHierarchy
+
+# Per-process parser used by the --jobs worker pool
+_worker_parser = None
+
+def _init_parse_worker():
+    global _worker_parser
+    _worker_parser = StructuralParser()
+
+def _parse_source(parser: StructuralParser, code: str, file_path: Path) -> Tuple[Optional[Dict], Optional[str]]:
+    """Parse one file's source. Returns (data, error) so results stay picklable."""
+    try:
+        return parser.parse(code, file_path), None
+    except Exception as e:
+        return None, str(e)
+
+def _parse_in_worker(job: Tuple[str, str]) -> Tuple[Optional[Dict], Optional[str]]:
+    path_str, code = job
+    return _parse_source(_worker_parser, code, Path(path_str))
+
+class UnusedVariablesRule(Rule):
+    """Assignments and usages per function scope -> unused-variable candidates of one file."""
+
+    def begin(self, tree, source=None):
+        self.scope_stack = ["global"]
+        # scope -> {name: line_number}
+        self.assigns = {"global": {}}
+        # scope -> set of used names
+        self.usages = {"global": set()}
+        # Track function parameter names to exclude them
+        self.params = {"global": set()}
+
+    @property
+    def scope(self):
+        return self.scope_stack[-1]
+
+    def visit_FunctionDef(self, node):
+        scope_name = node.name
+        self.scope_stack.append(scope_name)
+        self.assigns[scope_name] = {}
+        self.usages[scope_name] = set()
+        self.params[scope_name] = set()
+        
+        # Mark function parameters as params (not unused variables)
+        for arg in node.args.args:
+            self.params[scope_name].add(arg.arg)
+        if node.args.vararg:
+            self.params[scope_name].add(node.args.vararg.arg)
+        if node.args.kwarg:
+            self.params[scope_name].add(node.args.kwarg.arg)
+
+    def leave_FunctionDef(self, node):
+        self.scope_stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    leave_AsyncFunctionDef = leave_FunctionDef
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self.assigns[self.scope][node.id] = node.lineno
+        elif isinstance(node.ctx, (ast.Load, ast.Del)):
+            self.usages[self.scope].add(node.id)
+
+    def result(self) -> Dict[str, List]:
+        candidates = {"globals": [], "locals": []}
+        
+        # Check globals: unused if not used anywhere in the same file
+        for name, line in self.assigns["global"].items():
+            # Skip dunder names
+            if name.startswith("__") and name.endswith("__"):
+                continue
+            # Skip _ prefix (deliberately unused)
+            if name.startswith("_"):
+                continue
+            # Check usage in global scope
+            if name in self.usages["global"]:
+                continue
+            # Check usage in any local scope within same file
+            used_locally = False
+            for scope, usage_set in self.usages.items():
+                if scope != "global" and name in usage_set:
+                    used_locally = True
+                    break
+            if used_locally:
+                continue
+            candidates["globals"].append([name, line])
+        
+        # Check locals: unused if assigned but never loaded in same scope
+        for scope, assigns in self.assigns.items():
+            if scope == "global":
+                continue
+            usages = self.usages.get(scope, set())
+            params = self.params.get(scope, set())
+            for name, line in assigns.items():
+                # Skip parameters
+                if name in params:
+                    continue
+                # Skip _ prefix
+                if name.startswith("_"):
+                    continue
+                # Skip dunder
+                if name.startswith("__") and name.endswith("__"):
+                    continue
+                if name not in usages:
+                    candidates["locals"].append([f"{scope}.{name}", line])
+        
+        return candidates
 
 class StructuralAnalyzer:
     """
     Main analyzer that coordinates parsing and structural analysis:
     - Cross-file Symbol Table (Definitions)
     - Global Usage Tracking (References)
-    - Call Graph (Function cycles)
+    - Call Graph (Function cycles, dead code; one resolved graph per run)
     - Dependency Graph (Import cycles)
     """
     
-    def __init__(self):
-        self.parser = StructuralParser()
+    TREE_CONSUMER = "structure"
+    UNUSED_TREE_CONSUMER = "unused"
+    # Rule-based checks run in the shared per-file walk (see TreeRegistry.rule_result)
+    TREE_RULE = PythonStructureRule
+    UNUSED_TREE_RULE = UnusedVariablesRule
+    # Representative cycles reported per strongly connected group of functions
+    MAX_CYCLES_PER_SCC = 3
+    
+    def __init__(self, jobs: int = 1, cache=None, source_store: SourceStore = None, tree_registry: TreeRegistry = None,
+                 entry_points: EntryPoints = None):
+        if tree_registry is None:
+            tree_registry = TreeRegistry(source_store)
+            tree_registry.register_consumer(self.TREE_CONSUMER, rule=self.TREE_RULE)
+            tree_registry.register_consumer(self.UNUSED_TREE_CONSUMER, ["python"], rule=self.UNUSED_TREE_RULE)
+        self.trees = tree_registry
+        self.sources = tree_registry.sources
+        self.parser = StructuralParser(cache=cache, trees=tree_registry, tree_consumer=self.TREE_CONSUMER)
         self.symbol_table = SymbolTableBuilder()
-        self.call_graph = nx.DiGraph()
-        self.dependency_graph = nx.DiGraph()
         self.file_data_map = {} # path -> parser output
+        self.jobs = max(1, jobs)
+        self._unused_candidates = {}  # path -> per-file unused-variable candidates
+        self._findings = None  # last dead-code / cycle / unused results (for update deltas)
+        # Reachability mode for dead code (None = name-based heuristic)
+        self.entry_points = entry_points
+        self._reachability = None  # (graph, BFS parent array) from the last reachability run
+        self._graph_builder = None  # CallGraphBuilder for the current state (built on demand)
+        self._hierarchy = None  # ClassHierarchy for the current state (built on demand)
 
-    def analyze_codebase(self, files: List[Path]) -> Dict[str, Any]:
-        """Run full structural analysis on a list of files."""
+    def analyze_codebase(self, files: List[Path], manifest=None) -> Dict[str, Any]:
+        """
+        Run full structural analysis on a list of files.
+        With an AnalysisManifest, clean files reuse their stored parse results and
+        per-file findings; only dirty files (changed + dependents) are re-analyzed.
+        """
         print(f"Analysing {len(files)} files structurally...")
         
-        all_identifiers_global = [] 
+        reused = set()
+        if manifest is not None:
+            reused = {
+                str(f) for f in files
+                if manifest.is_clean(f)
+                and manifest.get(f, "data") is not None
+                and manifest.get(f, "unused") is not None
+            }
+        to_parse = [f for f in files if str(f) not in reused]
         
         # 1. Parse all files and collect definitions
+        if self.jobs > 1 and len(to_parse) > 1:
+            results = iter(self._parse_files_parallel(to_parse))
+        else:
+            results = (self._read_and_parse(file_path) for file_path in to_parse)
+        
+        # Merge in input order so symbol table / graph contents match the serial path
         for file_path in files:
+            if str(file_path) in reused:
+                data, error = manifest.get(file_path, "data"), None
+                self._unused_candidates[str(file_path)] = manifest.get(file_path, "unused")
+            else:
+                data, error = next(results)
+            self.trees.release(file_path, self.TREE_CONSUMER)
+            if error:
+                print(f"Error parsing {file_path}: {error}")
+                continue
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
-                
-                ext = file_path.suffix.lower()
-                lang = "python" if ext == ".py" else ("java" if ext == ".java" else "c/cpp")
-                
-                data = self.parser.parse(code, file_path)
-                self.file_data_map[str(file_path)] = data
-                module_name = file_path.stem
-                
-                # Extract symbols and populate SymbolTableBuilder
-                for func in data.get("functions", []):
-                    sym = STSymbol(
-                        name=func["name"],
-                        symbol_type=STSymbolType.FUNCTION,
-                        file_path=file_path,
-                        line=func["line"],
-                        signature=func.get("signature", ""),
-                        body_code=func.get("body_code", ""),
-                        parent_name=func.get("parent_class", "")
-                    )
-                    self.symbol_table.add_symbol(sym, module_name)
-                    # Register nodes in call graph
-                    self.call_graph.add_node(sym.qualified_name)
-                    
-                for cls in data.get("classes", []):
-                    sym = STSymbol(
-                        name=cls["name"],
-                        symbol_type=STSymbolType.CLASS,
-                        file_path=file_path,
-                        line=cls["line"],
-                        signature=f"class {cls['name']}"
-                    )
-                    self.symbol_table.add_symbol(sym, module_name)
-                
-                for var in data.get("variables", []):
-                    # We don't have a special type for globals in STSymbolType, use VARIABLE
-                    sym = STSymbol(
-                        name=var["name"],
-                        symbol_type=STSymbolType.VARIABLE, # Assuming it exists in core.symbol_table
-                        file_path=file_path,
-                        line=var["line"],
-                        signature=var["name"]
-                    )
-                    self.symbol_table.add_symbol(sym, module_name)
-
-                # Track usage identifiers for cross-file variable analysis
-                for id_name in data.get("identifiers", []):
-                    all_identifiers_global.append(id_name)
-                
-                # Track imports for dependency graph
-                for imp in data.get("imports", []):
-                    module_name_imp = imp.get("module") or (imp["names"][0] if imp.get("names") else "")
-                    if module_name_imp:
-                        self.dependency_graph.add_edge(file_path.name, module_name_imp)
-
+                self._register_file(file_path, data)
             except Exception as e:
                 print(f"Error parsing {file_path}: {e}")
         
@@ -92,41 +200,283 @@ class StructuralAnalyzer:
         self.raw_data = self.file_data_map
         
         # 2. Run Structural Checks (using the fully populated symbol table)
+        findings = self._run_checks()
         
-        # Cycle Detection
-        function_cycles = self._detect_function_cycles(self.symbol_table)
+        report = {
+            "symbol_table_object": self.symbol_table,
+            "circular_dependencies": findings["circular_dependencies"],
+            "function_cycles": findings["function_cycles"],
+            "dead_code": findings["dead_code"],
+            "unused_variables": findings["unused_variables"],
+            "raw_data": self.file_data_map
+        }
         
-        # Dead Code
-        dead_code = self._detect_dead_code(self.symbol_table)
+        if manifest is not None:
+            self._update_manifest(manifest, files, reused)
+            report["incremental"] = {
+                "reanalyzed": len(files) - len(reused),
+                "reused": len(reused),
+            }
         
-        # Unused Variables
-        unused_vars = self._detect_unused_variables(self.symbol_table)
+        return report
+
+    def update_files(self, changed: List[Path] = (), removed: List[Path] = ()) -> Dict[str, Dict[str, list]]:
+        """
+        Re-analyze only the given files against the state built by analyze_codebase()
+        (for long-running watch mode). Changed files are re-read and re-parsed, removed
+        files are dropped, and the returned delta lists import cycles / dead code /
+        function cycles / unused variables that appeared ("added") or disappeared ("removed").
+        """
+        if self._findings is None:
+            self.raw_data = self.file_data_map
+            self._findings = self._run_checks()
         
-        return {
-            "symbol_table_object": self.symbol_table,
-            "circular_dependencies": [], # File-level, handled by main.py or separate logic
-            "function_cycles": function_cycles,
-            "dead_code": dead_code,
-            "unused_variables": unused_vars,
-            "raw_data": self.file_data_map
+        touched_modules = set()
+        for file_path in list(removed) + list(changed):
+            self.trees.invalidate(file_path)
+            touched_modules.add(file_path.stem)
+            self._unused_candidates.pop(str(file_path), None)
+        
+        for file_path in removed:
+            self.file_data_map.pop(str(file_path), None)
+        
+        for file_path in changed:
+            data, error = self._read_and_parse(file_path)
+            self.trees.release(file_path, self.TREE_CONSUMER)
+            if error:
+                print(f"Error parsing {file_path}: {error}")
+                self.file_data_map.pop(str(file_path), None)
+                continue
+            # Assign in place so the file keeps its position (matches a fresh run's order)
+            self.file_data_map[str(file_path)] = data
+        
+        # Qualified names are module-scoped, so files sharing a module name are re-registered together
+        for module_name in touched_modules:
+            self._reregister_module(module_name)
+        
+        previous = self._findings
+        self._findings = self._run_checks()
+        return self._findings_delta(previous, self._findings)
+
+    def call_graph_input(self) -> Dict[Path, dict]:
+        """Parsed files in the shape CallGraphBuilder.build_call_graph expects."""
+        parsed_files = {}
+        for file_path_str, data in self.file_data_map.items():
+            fpath = Path(file_path_str)
+            module_name = fpath.stem
+            
+            cg_functions = []
+            for f in data.get("functions", []):
+                prefix = f"{f['parent_class']}." if f.get("parent_class") else ""
+                record = {
+                    "qualified_name": f"{module_name}.{prefix}{f['name']}",
+                    "line": f["line"],
+                    "calls": f.get("calls", [])
+                }
+                if "calls_detailed" in f:
+                    record["calls_detailed"] = f["calls_detailed"]
+                cg_functions.append(record)
+            
+            parsed_files[fpath] = {
+                "functions": cg_functions,
+                "calls": data.get("calls", []),
+                "imports": data.get("imports", [])
+            }
+        return parsed_files
+
+    def class_hierarchy(self) -> ClassHierarchy:
+        """Class MROs, method tables and function lookup maps for the current state (built once per run)."""
+        if self._hierarchy is None:
+            self._hierarchy = ClassHierarchy.from_parsed(self.symbol_table, self.file_data_map)
+        return self._hierarchy
+
+    def call_graph_builder(self):
+        """
+        CallGraphBuilder (function calls + file dependencies) for the current state:
+        the one resolved graph that cycles, dead code, reachability and the graph
+        store all read (built once per run).
+        """
+        if self._graph_builder is None:
+            from core.call_graph_builder import CallGraphBuilder
+            self._graph_builder = CallGraphBuilder(self.symbol_table, self.class_hierarchy())
+            self._graph_builder.build_call_graph(self.call_graph_input())
+        return self._graph_builder
+
+    def graph_records(self) -> Dict[str, Dict[str, list]]:
+        """Per-file rows for GraphStore.sync(): symbols, call edges, file dependencies, findings."""
+        graph = self.call_graph_builder()
+        findings = self._findings if self._findings is not None else self._run_checks()
+        
+        records = {path: {"symbols": [], "calls": [], "file_deps": [], "findings": []} for path in self.file_data_map}
+        for sym in self.symbol_table.symbols.values():
+            record = records.get(str(sym.file))
+            if record is None:
+                continue
+            record["symbols"].append([sym.qualified_name, sym.name, sym.type.value, sym.parent_name or "", sym.line, sym.signature])
+            if sym.type == STSymbolType.FUNCTION:
+                record["calls"].extend([sym.qualified_name, callee] for callee in graph.functions.successors(sym.qualified_name))
+        
+        for path, record in records.items():
+            imports = set(graph.imports.successors(path))
+            for target in graph.files.successors(path):
+                record["file_deps"].append([target, "import" if target in imports else "call"])
+        
+        for sym in findings["dead_code"]:
+            if str(sym.file) in records:
+                records[str(sym.file)]["findings"].append(["dead_code", sym.qualified_name, sym.line, ""])
+        for cycle in findings["function_cycles"]:
+            first = cycle[0]
+            if str(first.file) in records:
+                chain = " -> ".join(s.qualified_name for s in cycle + cycle[:1])
+                records[str(first.file)]["findings"].append(["function_cycle", first.qualified_name, first.line, chain])
+        for var in findings["unused_variables"]:
+            if var["path"] in records:
+                records[var["path"]]["findings"].append(["unused_variable", var["name"], var["line"], var["type"]])
+        return records
+
+    def _update_manifest(self, manifest, files: List[Path], reused: Set[str]):
+        """Store per-file results and file dependencies (import + cross-file call edges)."""
+        graph = self.call_graph_builder()
+        
+        for file_path in files:
+            key = str(file_path)
+            deps = sorted(graph.files.successors(key))
+            manifest.set(file_path, "deps", [d for d in deps if d != key])
+            if key in reused or key not in self.file_data_map:
+                continue
+            manifest.set(file_path, "data", self.file_data_map[key])
+            if key in self._unused_candidates:
+                manifest.set(file_path, "unused", self._unused_candidates[key])
+
+    def _run_checks(self) -> Dict[str, list]:
+        # Symbols may have changed since the last run
+        self._hierarchy = None
+        self._graph_builder = None
+        findings = {
+            # Cycle Detection
+            "circular_dependencies": self._detect_cycles(),
+            "function_cycles": self._detect_function_cycles(self.symbol_table),
+            # Dead Code
+            "dead_code": self._detect_dead_code(self.symbol_table),
+            # Unused Variables
+            "unused_variables": self._detect_unused_variables(self.symbol_table),
         }
+        self._findings = findings
+        return findings
+
+    @staticmethod
+    def _findings_delta(before: Dict[str, list], after: Dict[str, list]) -> Dict[str, Dict[str, list]]:
+        """Diff two sets of findings by identity (file + name), ignoring pure line shifts."""
+        keys = {
+            "circular_dependencies": lambda c: tuple(sorted(set(c))),
+            "dead_code": lambda s: (str(s.file), s.qualified_name),
+            "function_cycles": lambda c: tuple(sorted(s.qualified_name for s in c)),
+            "unused_variables": lambda v: (v["path"], v["name"], v["type"]),
+        }
+        delta = {}
+        for kind, key in keys.items():
+            old = {key(item): item for item in before[kind]}
+            new = {key(item): item for item in after[kind]}
+            delta[kind] = {
+                "added": [item for k, item in new.items() if k not in old],
+                "removed": [item for k, item in old.items() if k not in new],
+            }
+        return delta
 
-    def _build_import_graph(self) -> Dict[str, Set[str]]:
-        """Map file paths to the modules/files they import."""
-        graph = {} # {str(file_path): set(imported_names)}
+    def _reregister_module(self, module_name: str):
+        """Drop and re-add the symbols of every file with this module name."""
+        self.symbol_table.remove_module(module_name)
         
-        for file_path, data in self.raw_data.items():
-            imports = set()
-            for imp in data.get("imports", []):
-                # Handle 'from x import y' and 'import x'
-                if imp["module"]:
-                    imports.add(imp["module"])
-                for name in imp["names"]:
-                    if not imp["module"]:
-                        imports.add(name)
-            graph[file_path] = imports
+        members = [path_str for path_str in self.file_data_map if Path(path_str).stem == module_name]
+        for path_str in members:
+            self._register_file(Path(path_str), self.file_data_map[path_str])
+
+    def _read_source(self, file_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Read one file through the shared SourceStore. Returns (code, error)."""
+        try:
+            return self.sources.read_text(file_path), None
+        except Exception as e:
+            return None, str(e)
+
+    def _read_and_parse(self, file_path: Path) -> Tuple[Optional[Dict], Optional[str]]:
+        code, error = self._read_source(file_path)
+        if error:
+            return None, error
+        return _parse_source(self.parser, code, file_path)
+
+    def _parse_files_parallel(self, files: List[Path]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        """
+        Parse files in a process pool. Results come back in the order of `files`.
+        Cache lookups and stores stay in this process; workers only parse misses.
+        """
+        results: List[Tuple[Optional[Dict], Optional[str]]] = [None] * len(files)
+        pending = []  # (index, code) still needing a parse
+        
+        for i, file_path in enumerate(files):
+            code, error = self._read_source(file_path)
+            if error:
+                results[i] = (None, error)
+                continue
+            cached = self.parser.get_cached(code, file_path)
+            if cached is not None:
+                results[i] = (cached, None)
+            else:
+                pending.append((i, code))
+        
+        if pending:
+            workers = min(self.jobs, len(pending))
+            chunksize = max(1, len(pending) // (workers * 8))
+            jobs = [(str(files[i]), code) for i, code in pending]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker) as pool:
+                parsed = pool.map(_parse_in_worker, jobs, chunksize=chunksize)
+                for (i, code), (data, error) in zip(pending, parsed):
+                    results[i] = (data, error)
+                    if data is not None:
+                        self.parser.store_cached(code, files[i], data)
+        
+        return results
+
+    def _register_file(self, file_path: Path, data: Dict[str, Any]):
+        """Merge one file's parser output into the symbol table and graphs."""
+        self.file_data_map[str(file_path)] = data
+        module_name = file_path.stem
+        
+        # Extract symbols and populate SymbolTableBuilder
+        for func in data.get("functions", []):
+            sym = STSymbol(
+                name=func["name"],
+                symbol_type=STSymbolType.FUNCTION,
+                file_path=file_path,
+                line=func["line"],
+                signature=func.get("signature", ""),
+                parent_name=func.get("parent_class", ""),
+                span=func.get("span"),
+                source=self.sources
+            )
+            self.symbol_table.add_symbol(sym, module_name)
             
-        return graph
+        for cls in data.get("classes", []):
+            sym = STSymbol(
+                name=cls["name"],
+                symbol_type=STSymbolType.CLASS,
+                file_path=file_path,
+                line=cls["line"],
+                signature=f"class {cls['name']}",
+                span=cls.get("span"),
+                source=self.sources
+            )
+            self.symbol_table.add_symbol(sym, module_name)
+        
+        for var in data.get("variables", []):
+            # We don't have a special type for globals in STSymbolType, use VARIABLE
+            sym = STSymbol(
+                name=var["name"],
+                symbol_type=STSymbolType.VARIABLE, # Assuming it exists in core.symbol_table
+                file_path=file_path,
+                line=var["line"],
+                signature=var["name"]
+            )
+            self.symbol_table.add_symbol(sym, module_name)
 
     def _collect_definitions(self) -> Dict[str, Dict]:
         """Aggregate all function/class definitions."""
@@ -139,198 +489,59 @@ class StructuralAnalyzer:
             }
         return defs
 
-    def _detect_cycles(self, graph: Dict[str, Set[str]]) -> List[List[str]]:
-        """Find circular import dependencies."""
+    def _detect_cycles(self, max_cycles_per_scc: int = 1) -> List[List[str]]:
+        """
+        Find circular import dependencies: one entry per strongly connected group of
+        files (up to `max_cycles_per_scc` shortest cycles each), as file names with
+        the first repeated at the end.
+        """
+        # Import edges of the shared graph are already resolved through the module index
+        imports = self.call_graph_builder().imports
         cycles = []
-        # Simplified DFS for cycles
-        def find_path(current, visited, path):
-            visited.add(current)
-            path.append(current)
-            
-            # Approximate mapping: imports are module names, keys are file paths
-            # We need to map module names back to file paths or check strictly by name
-            # This is hard without full module resolution. 
-            # For now, we cycle check simplistic "names" if plausible?
-            # actually, let's skip complex mapping:
-            # If we see import 'utils', and we scanned 'utils.py', we assume link.
-            
-            imps = graph.get(current, set())
-            
-            # Simple heuristic mapping for this project structure
-            # If imported name appears in a scanned file path
-            targets = []
-            for imp in imps:
-                # Find matching file in graph keys
-                for fpath in graph.keys():
-                    if imp in fpath or (imp + ".py") in fpath:
-                         targets.append(fpath)
-            
-            for neighbor in targets:
-                if neighbor in path:
-                    # Found cycle
-                    cycle_slice = path[path.index(neighbor):] + [neighbor]
-                    # Format nicely
-                    clean_cycle = [Path(p).name for p in cycle_slice]
-                    if clean_cycle not in cycles:
-                        cycles.append(clean_cycle)
-                elif neighbor not in visited:
-                    find_path(neighbor, visited, path)
-            
-            path.pop()
-            visited.remove(current)
-
-        # check all nodes
-        # Optimization: only check if unvisited? Cycle detection usually needs full DFS
-        # But for limited set ok.
-        
-        # Only run on subset to avoid massive recursion in huge repos
-        # We limit to finding first few cycles
-        try:
-            for node in list(graph.keys()):
-                find_path(node, set(), [])
-                if len(cycles) > 5: break
-        except RecursionError:
-            pass
-            
+        for group in find_cycles(imports.indptr, imports.indices, max_cycles_per_scc, nodes=imports.nodes):
+            for cycle in group.cycles:
+                # Format nicely
+                cycles.append([Path(p).name for p in cycle + cycle[:1]])
         return cycles
 
     def _detect_function_cycles(self, symbol_builder: SymbolTableBuilder) -> List[List[STSymbol]]:
         """
         Find circular function dependencies (recursion/mutual recursion).
-        Uses dependency-based call resolution instead of name-based matching.
+        Uses the receiver-resolved call graph instead of name-based matching.
         """
-        # Build class hierarchy: class_name -> [base_class_names]
-        class_bases = {}  # class_name -> list of base class names
-        class_methods = {}  # class_name -> {method_name: Symbol}
-        
-        for data in self.raw_data.values():
-            for cls in data.get("classes", []):
-                class_bases[cls["name"]] = cls.get("bases", [])
-                class_methods[cls["name"]] = {}
-        
-        # Populate class_methods from symbols
-        for qname, sym in symbol_builder.symbols.items():
-            if sym.type == STSymbolType.FUNCTION and sym.parent_name:
-                if sym.parent_name not in class_methods:
-                    class_methods[sym.parent_name] = {}
-                class_methods[sym.parent_name][sym.name] = sym
-        
-        # Build standalone functions map: (file, name) -> Symbol
-        standalone_map = {}
-        for qname, sym in symbol_builder.symbols.items():
-            if sym.type == STSymbolType.FUNCTION and not sym.parent_name:
-                key = (str(sym.file), sym.name)
-                standalone_map[key] = sym
-        
-        def resolve_call(call_info, caller_sym):
-            """Resolve a call to its target Symbol(s) based on receiver context."""
-            call_name = call_info["name"]
-            receiver = call_info.get("receiver")
-            
-            if receiver == "self":
-                # self.method() -> method in the same class
-                if caller_sym.parent_name and caller_sym.parent_name in class_methods:
-                    target = class_methods[caller_sym.parent_name].get(call_name)
-                    return [target] if target else []
-            
-            elif receiver == "super":
-                # super().method() -> method in parent class
-                if caller_sym.parent_name and caller_sym.parent_name in class_bases:
-                    for base_name in class_bases[caller_sym.parent_name]:
-                        if base_name in class_methods:
-                            target = class_methods[base_name].get(call_name)
-                            if target:
-                                return [target]
-                return []
-            
-            elif receiver is not None:
-                # ClassName.method() -> method in that specific class
-                if receiver in class_methods:
-                    target = class_methods[receiver].get(call_name)
-                    return [target] if target else []
-                return []
-            
-            else:
-                # Bare call: foo() -> same-file standalone function first
-                key = (str(caller_sym.file), call_name)
-                target = standalone_map.get(key)
-                if target:
-                    return [target]
-                # Fallback: any standalone function with that name (cross-file)
-                results = []
-                for (fpath, name), sym in standalone_map.items():
-                    if name == call_name:
-                        results.append(sym)
-                return results
-        
-        # Build graph: Symbol -> [Symbol]
-        graph = {}
-        for qname, sym in symbol_builder.symbols.items():
-            if sym.type != STSymbolType.FUNCTION:
-                continue
-            
-            graph[sym] = []
-            
-            file_data = self.raw_data.get(str(sym.file))
-            if not file_data:
-                continue
-            
-            func_data = next(
-                (f for f in file_data["functions"]
-                 if f["name"] == sym.name and f["line"] == sym.line),
-                None
-            )
-            if not func_data:
-                continue
-            
-            for call_info in func_data.get("calls_detailed", []):
-                targets = resolve_call(call_info, sym)
-                for target in targets:
-                    if target and target != sym or (target == sym and call_info.get("receiver") != "super"):
-                        graph[sym].append(target)
-        
-        # Find Cycles (DFS)
-        cycles = []
-        visited = set()
-        recursion_stack = []
-        
-        def dfs(current: STSymbol):
-            visited.add(current)
-            recursion_stack.append(current)
-            
-            for neighbor in graph.get(current, []):
-                if neighbor in recursion_stack:
-                    cycle_start = recursion_stack.index(neighbor)
-                    cycle = recursion_stack[cycle_start:]
-                    cycles.append(list(cycle))
-                elif neighbor not in visited:
-                    dfs(neighbor)
-            
-            recursion_stack.pop()
-        
-        for sym in graph.keys():
-            if sym not in visited:
-                dfs(sym)
-        
-        # Dedup cycles
-        unique_cycles = []
-        seen_str = set()
-        
-        for cyc in cycles:
-            sig = "->".join(sorted([s.qualified_name for s in cyc]))
-            if sig not in seen_str:
-                seen_str.add(sig)
-                unique_cycles.append(cyc)
+        graph = self.call_graph_builder()
         
-        return unique_cycles
+        # Each strongly connected group once, with its shortest cycle(s)
+        return [[symbol_builder.get_symbol(qname) for qname in cycle]
+                for cycle in graph.find_call_cycles(self.MAX_CYCLES_PER_SCC)]
+
+    def why_alive(self, qualified_name: str) -> List[str]:
+        """
+        Shortest call chain from an entry point (or module-level code, shown as
+        `<module path>`) to a function, as qualified names. [] if the function is
+        unreachable or dead code did not run in reachability mode.
+        """
+        if self._reachability is None:
+            return []
+        graph, parents = self._reachability
+        return graph.parent_chain(parents, qualified_name)
 
     def _detect_dead_code(self, symbol_builder: SymbolTableBuilder) -> List[Dict]:
-        """Find functions that are never called anywhere across all files."""
-        # Collect ALL calls from ALL files
-        all_calls = set()
+        """
+        Find functions that are never called anywhere across all files: no call site
+        in the resolved graph may reach them (including dynamic `obj.m()` calls, matched
+        by name) and no module-level code calls or references them.
+        """
+        if self.entry_points is not None:
+            return self._detect_unreachable(symbol_builder)
+        
+        possible = self.call_graph_builder().possible
+        called = possible.in_degrees() > 0
+        
+        # Names used outside function bodies (module-level calls, callbacks, registries)
+        module_refs = set()
         for data in self.raw_data.values():
-            for call in data.get("calls", []):
-                all_calls.add(call)
+            module_refs |= self._module_level_references(data)
         
         # Collect decorated function names — these are called by frameworks implicitly
         decorated_funcs = set()
@@ -357,19 +568,71 @@ class StructuralAnalyzer:
             if symbol.name in decorated_funcs:
                 continue
             
-            # Check if this function name appears in ANY call across ALL files
-            if symbol.name not in all_calls:
+            # Check if any call site or module-level reference can reach it
+            if not called[possible.ids[qname]] and symbol.name not in module_refs:
                 dead.append(symbol)
         
         return dead
 
+    def _detect_unreachable(self, symbol_builder: SymbolTableBuilder) -> List[STSymbol]:
+        """
+        Reachability mode: functions that no entry point can reach through the call
+        graph. Module-level code runs on import, so each file's top-level calls and
+        function references are roots too. All roots go into a single BFS; its parent
+        array answers why_alive() afterwards without another traversal.
+        """
+        possible = self.call_graph_builder().possible
+        functions = [sym for sym in symbol_builder.symbols.values() if sym.type == STSymbolType.FUNCTION]
+        
+        decorators = {}
+        for file_path_str, data in self.raw_data.items():
+            for f in data.get("functions", []):
+                if f.get("decorators"):
+                    decorators[(file_path_str, f["name"], f["line"])] = f["decorators"]
+        
+        functions_by_name = self.class_hierarchy().functions_by_name
+        edges = list(possible.edges())
+        roots = []
+        for sym in functions:
+            sym_decorators = decorators.get((str(sym.file), sym.name, sym.line), ())
+            if self.entry_points.matches(sym.name, sym.qualified_name, sym_decorators, sym.file):
+                roots.append(sym.qualified_name)
+        
+        for file_path_str, data in self.raw_data.items():
+            root = f"<module {file_path_str}>"
+            roots.append(root)
+            for name in sorted(self._module_level_references(data)):
+                edges.extend((root, target.qualified_name) for target in functions_by_name.get(name, []))
+        
+        reach = CompactGraph.from_edges([sym.qualified_name for sym in functions], edges)
+        parents = reach.bfs_parents(roots)
+        self._reachability = (reach, parents)
+        return [sym for sym in functions if parents[reach.ids[sym.qualified_name]] == -2]
+
+    @staticmethod
+    def _module_level_references(data: Dict[str, Any]) -> Set[str]:
+        """
+        Names a file calls outside any function body, plus names it references without
+        calling (callbacks, `target=worker`, `handler = self.on_event`, registries): the
+        parser records every call, every loaded name and every loaded attribute per file,
+        so these are what is left after subtracting the calls made inside functions.
+        """
+        in_functions = Counter()
+        bare_calls = Counter()
+        for f in data.get("functions", []):
+            in_functions.update(f.get("calls", []))
+            bare_calls.update(c["name"] for c in f.get("calls_detailed", []) if c.get("receiver") is None)
+        module_calls = Counter(data.get("calls", [])) - in_functions
+        references = Counter(data.get("identifiers", [])) - bare_calls - module_calls
+        method_references = Counter(data.get("attribute_loads", [])) - (in_functions - bare_calls) - module_calls
+        return set(module_calls) | set(references) | set(method_references)
+
     def _detect_unused_variables(self, symbol_builder: SymbolTableBuilder) -> List[Dict]:
         """
         Identify variables that are assigned but never used.
         Checks same-file and cross-file usage via imports.
         Tracks actual line numbers.
         """
-        import ast
         
         unused = []
         
@@ -382,113 +645,45 @@ class StructuralAnalyzer:
         
         for file_path_str, data in self.raw_data.items():
             fpath = Path(file_path_str)
-            mod_name = fpath.stem
-            
-            try:
-                with open(fpath, 'r', encoding='utf-8') as f:
-                    code = f.read()
-                tree = ast.parse(code)
-            except:
-                continue
-            
-            # Track assignments with line numbers and all usages per scope
-            class UsageVisitor(ast.NodeVisitor):
-                def __init__(self):
-                    self.scope_stack = ["global"]
-                    # scope -> {name: line_number}
-                    self.assigns = {"global": {}}
-                    # scope -> set of used names
-                    self.usages = {"global": set()}
-                    # Track function parameter names to exclude them
-                    self.params = {"global": set()}
-                
-                @property
-                def scope(self):
-                    return self.scope_stack[-1]
-                
-                def visit_FunctionDef(self, node):
-                    scope_name = node.name
-                    self.scope_stack.append(scope_name)
-                    self.assigns[scope_name] = {}
-                    self.usages[scope_name] = set()
-                    self.params[scope_name] = set()
-                    
-                    # Mark function parameters as params (not unused variables)
-                    for arg in node.args.args:
-                        self.params[scope_name].add(arg.arg)
-                    if node.args.vararg:
-                        self.params[scope_name].add(node.args.vararg.arg)
-                    if node.args.kwarg:
-                        self.params[scope_name].add(node.args.kwarg.arg)
-                    
-                    self.generic_visit(node)
-                    self.scope_stack.pop()
-                
-                visit_AsyncFunctionDef = visit_FunctionDef
-                
-                def visit_Name(self, node):
-                    if isinstance(node.ctx, ast.Store):
-                        self.assigns[self.scope][node.id] = node.lineno
-                    elif isinstance(node.ctx, (ast.Load, ast.Del)):
-                        self.usages[self.scope].add(node.id)
-                    self.generic_visit(node)
             
-            visitor = UsageVisitor()
-            visitor.visit(tree)
+            candidates = self._unused_candidates.get(file_path_str)
+            if candidates is None:
+                candidates = self._collect_unused_candidates(fpath)
+                self._unused_candidates[file_path_str] = candidates
             
-            # Check globals: unused if not used in same file AND not imported by other files
-            for name, line in visitor.assigns["global"].items():
-                # Skip dunder names
-                if name.startswith("__") and name.endswith("__"):
-                    continue
-                # Skip _ prefix (deliberately unused)
-                if name.startswith("_"):
-                    continue
-                # Check usage in global scope
-                if name in visitor.usages["global"]:
-                    continue
-                # Check usage in any local scope within same file
-                used_locally = False
-                for scope, usage_set in visitor.usages.items():
-                    if scope != "global" and name in usage_set:
-                        used_locally = True
-                        break
-                if used_locally:
-                    continue
+            # Globals: unused in the same file AND not imported by other files
+            for name, line in candidates["globals"]:
                 # Check cross-file usage (imported by other files)
                 if name in cross_file_used:
                     continue
                 
                 unused.append({
                     "file": fpath.name,
+                    "path": file_path_str,
                     "line": line,
                     "name": name,
                     "type": "global_variable"
                 })
             
-            # Check locals: unused if assigned but never loaded in same scope
-            for scope, assigns in visitor.assigns.items():
-                if scope == "global":
-                    continue
-                usages = visitor.usages.get(scope, set())
-                params = visitor.params.get(scope, set())
-                for name, line in assigns.items():
-                    # Skip parameters
-                    if name in params:
-                        continue
-                    # Skip _ prefix
-                    if name.startswith("_"):
-                        continue
-                    # Skip dunder
-                    if name.startswith("__") and name.endswith("__"):
-                        continue
-                    if name not in usages:
-                        unused.append({
-                            "file": fpath.name,
-                            "line": line,
-                            "name": f"{scope}.{name}",
-                            "type": "local_variable"
-                        })
+            for name, line in candidates["locals"]:
+                unused.append({
+                    "file": fpath.name,
+                    "path": file_path_str,
+                    "line": line,
+                    "name": name,
+                    "type": "local_variable"
+                })
         
         return unused
 
+    def _collect_unused_candidates(self, fpath: Path) -> Dict[str, List]:
+        """
+        Per-file part of unused-variable detection (independent of other files):
+        globals unused anywhere in this file, and locals unused in their scope.
+        """
+        try:
+            return self.trees.rule_result(fpath, self.UNUSED_TREE_CONSUMER, UnusedVariablesRule)
+        except Exception:
+            return {"globals": [], "locals": []}
+        finally:
+            self.trees.release(fpath, self.UNUSED_TREE_CONSUMER)
@@ -0,0 +1,72 @@
+"""
+Benchmark: StructuralParser parse time vs. file size (C, C++ and Java).
+
+Generates files with a growing number of functions and times
+StructuralParser.parse() on each. Call extraction is a single pass, so time
+per 1k lines should stay roughly flat as files grow.
+
+Usage: python bench_parse_scaling.py [--sizes 250,500,1000,2000,4000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import os
+import time
+import warnings
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+warnings.filterwarnings("ignore", category=FutureWarning, module="tree_sitter")
+
+from core.ast_parser import StructuralParser
+
+def make_c(n: int) -> str:
+    return "".join(
+        f"int f{i}(int a, int b) {{\n"
+        f"    int x = helper(a, {i});\n"
+        f"    if (x > b) {{ return f{max(i - 1, 0)}(x, b); }}\n"
+        f"    return compute(x, g(b));\n"
+        f"}}\n\n"
+        for i in range(n)
+    )
+
+def make_java(n: int) -> str:
+    methods = "".join(
+        f"    int m{i}(int a, int b) {{\n"
+        f"        int x = helper(a, {i});\n"
+        f"        if (x > b) {{ return m{max(i - 1, 0)}(x, b); }}\n"
+        f"        return util.compute(x, g(b));\n"
+        f"    }}\n\n"
+        for i in range(n)
+    )
+    return f"class Big {{\n{methods}}}\n"
+
+GENERATORS = {".c": make_c, ".cpp": make_c, ".java": make_java}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="250,500,1000,2000,4000", help="Function counts to generate")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per size (best is reported)")
+    args = ap.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    parser = StructuralParser()
+    print(f"{'lang':<6}{'functions':>10}{'lines':>9}{'best ms':>10}{'ms / 1k lines':>15}")
+    for ext, generate in GENERATORS.items():
+        per_kloc = []
+        for n in sizes:
+            code = generate(n)
+            lines = code.count("\n")
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                parser.parse(code, Path(f"bench{ext}"))
+                best = min(best, time.perf_counter() - start)
+            per_kloc.append(best * 1000 / (lines / 1000))
+            print(f"{ext[1:]:<6}{n:>10}{lines:>9}{best * 1000:>10.1f}{per_kloc[-1]:>15.2f}")
+        # Linear scaling ⇒ cost per line roughly constant from smallest to largest file
+        print(f"{'':<6}growth of ms/1k lines, largest vs smallest: {per_kloc[-1] / per_kloc[0]:.2f}x\n")
+
+if __name__ == "__main__":
+    main()
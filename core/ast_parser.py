@@ -9,15 +9,208 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import tree_sitter_languages
 from tree_sitter import Parser, Language, Query
+from core.source_store import line_starts
+from core.ast_rules import Rule, run_rules
+
+# Bump whenever the shape or content of parse() output changes — invalidates cached results
+PARSER_VERSION = "5"
+
+class PythonStructureRule(Rule):
+    """Functions, classes, imports, call sites and identifiers of a Python module (the parse() output)."""
+
+    def begin(self, tree, source=None):
+        # Bodies are recorded as UTF-8 byte spans; ast columns are already byte offsets
+        self.line_starts = line_starts(source.encode('utf-8'))
+        self.current_function = None
+        self.current_class = None
+        self.functions = []
+        self.classes = []
+        self.imports = []
+        self.calls = []
+        self.calls_in_current = []
+        self.calls_detailed_in_current = []
+        self.variables = []
+        self.identifiers = []
+        self.attribute_loads = []
+        self._saved = []  # enclosing (function, calls, detailed calls) / class state, restored on leave
+
+    def result(self):
+        return {
+            "functions": self.functions,
+            "classes": self.classes,
+            "imports": self.imports,
+            "calls": self.calls,
+            "identifiers": self.identifiers,
+            "attribute_loads": self.attribute_loads,
+            "variables": self.variables
+        }
+
+    def span(self, node):
+        return [
+            self.line_starts[node.lineno - 1] + node.col_offset,
+            self.line_starts[node.end_lineno - 1] + node.end_col_offset,
+        ]
+
+    def visit_Import(self, node):
+        names = [alias.name for alias in node.names]
+        self.imports.append({"module": None, "names": names})
+
+    def visit_Assign(self, node):
+        # Capture global variables (not within function/class)
+        if not self.current_function and not self.current_class:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.variables.append({
+                        "name": target.id,
+                        "line": node.lineno
+                    })
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.identifiers.append(node.id)
+
+    def visit_Attribute(self, node):
+        # `obj.attr` loads, including method calls; bound-method references are what remains after subtracting calls
+        if isinstance(node.ctx, ast.Load):
+            self.attribute_loads.append(node.attr)
+
+    def visit_ImportFrom(self, node):
+        names = [alias.name for alias in node.names]
+        self.imports.append({"module": node.module, "names": names, "level": node.level})
+
+    def visit_ClassDef(self, node):
+        self._saved.append(self.current_class)
+        self.current_class = node.name
+        
+        # Extract base class names
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Subscript):
+                # Generic[T] / Base[T] -> the class being parameterized
+                base = base.value
+            if isinstance(base, ast.Name):
+                bases.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                bases.append(base.attr)
+        
+        class_data = {
+            "name": node.name,
+            "line": node.lineno,
+            "methods": [],
+            "attributes": [],
+            "bases": bases,
+            "span": self.span(node)
+        }
+        
+        for item in node.body:
+            if isinstance(item, ast.Assign):
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        class_data["attributes"].append(target.id)
+        
+        self.classes.append(class_data)
+
+    def leave_ClassDef(self, node):
+        self.current_class = self._saved.pop()
+
+    def visit_FunctionDef(self, node):
+        self._saved.append((self.current_function, self.calls_in_current, self.calls_detailed_in_current))
+        self.current_function = node.name
+        self.calls_in_current = []
+        self.calls_detailed_in_current = []
+
+    def leave_FunctionDef(self, node):
+        args = [arg.arg for arg in node.args.args]
+        signature = f"{node.name}({', '.join(args)})"
+
+        # Extract decorator names
+        decorators = []
+        for dec in node.decorator_list:
+            if isinstance(dec, ast.Name):
+                decorators.append(dec.id)
+            elif isinstance(dec, ast.Attribute):
+                decorators.append(dec.attr)
+            elif isinstance(dec, ast.Call):
+                if isinstance(dec.func, ast.Name):
+                    decorators.append(dec.func.id)
+                elif isinstance(dec.func, ast.Attribute):
+                    decorators.append(dec.func.attr)
+
+        func_data = {
+            "name": node.name,
+            "line": node.lineno,
+            "signature": signature,
+            "span": self.span(node),
+            "calls": [c["name"] for c in self.calls_detailed_in_current],
+            "calls_detailed": self.calls_detailed_in_current,
+            "parent_class": self.current_class,
+            "decorators": decorators
+        }
+        self.functions.append(func_data)
+        
+        if self.current_class:
+            for c in self.classes:
+                if c["name"] == self.current_class:
+                    c["methods"].append(node.name)
+                    break
+        
+        self.current_function, self.calls_in_current, self.calls_detailed_in_current = self._saved.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    leave_AsyncFunctionDef = leave_FunctionDef
+
+    def visit_Call(self, node):
+        call_name = None
+        receiver = None  # "self", "super", a class name, or None (bare call)
+        
+        if isinstance(node.func, ast.Name):
+            call_name = node.func.id
+            receiver = None  # bare call like foo()
+        elif isinstance(node.func, ast.Attribute):
+            call_name = node.func.attr
+            # Determine receiver
+            val = node.func.value
+            if isinstance(val, ast.Name):
+                if val.id == "self":
+                    receiver = "self"
+                elif val.id == "super":
+                    receiver = "super"
+                else:
+                    receiver = val.id  # ClassName.method()
+            elif isinstance(val, ast.Call):
+                # super().__init__() — val is Call to super
+                if isinstance(val.func, ast.Name) and val.func.id == "super":
+                    receiver = "super"
+        
+        if call_name:
+            self.calls_detailed_in_current.append({
+                "name": call_name,
+                "receiver": receiver
+            })
+            self.calls.append(call_name)
 
 class StructuralParser:
     """Extracts structural information from source files using AST or Tree-sitter."""
 
-    def __init__(self):
+    LANG_MAP = {
+        '.py': 'python',
+        '.c': 'c',
+        '.cpp': 'cpp',
+        '.cc': 'cpp',
+        '.h': 'c', # Headers can be C or CPP, default to C for simple extract
+        '.hpp': 'cpp',
+        '.java': 'java'
+    }
+
+    def __init__(self, cache=None, trees=None, tree_consumer: str = None):
+        self.cache = cache  # Optional ParseCache
+        self.trees = trees  # Optional TreeRegistry — when set, `code` passed to parse() must be the file's current content
+        self.tree_consumer = tree_consumer  # Consumer name to collect shared-walk results under (requires `trees`)
         self.parsers = {}
         self.languages = {}
         self.queries = {}
         self.queries_usage = {}
+        self.queries_calls = {}
         
         # Initialize Tree-sitter for non-Python languages
         for lang_id in ['c', 'cpp', 'java']:
@@ -76,214 +269,71 @@ class StructuralParser:
                     (type_identifier) @id
                     (field_identifier) @id
                     """)
+                
+                # Call sites (captured in document order, outer calls first)
+                call_patterns = []
+                for call_type in ['call_expression', 'method_invocation']:
+                    try:
+                        lang.query(f"({call_type}) @call")
+                        call_patterns.append(f"({call_type}) @call")
+                    except Exception:
+                        pass  # Node type not in this grammar
+                if call_patterns:
+                    self.queries_calls[lang_id] = lang.query("\n".join(call_patterns))
             except Exception as e:
                 print(f"Warning: Failed to initialize Tree-sitter for {lang_id}: {e}")
 
     def parse(self, code: str, file_path: Path) -> Dict[str, Any]:
         """Unified entry point for parsing any supported file."""
-        ext = file_path.suffix.lower()
-        if ext == '.py':
-            return self._parse_python_ast(code, file_path)
+        lang_id = self.LANG_MAP.get(file_path.suffix.lower())
+        if lang_id is None or (lang_id != 'python' and lang_id not in self.parsers):
+            return {"functions": [], "classes": [], "imports": [], "calls": []}
         
-        lang_map = {
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.h': 'c', # Headers can be C or CPP, default to C for simple extract
-            '.hpp': 'cpp',
-            '.java': 'java'
-        }
+        cached = self.get_cached(code, file_path)
+        if cached is not None:
+            return cached
         
-        lang_id = lang_map.get(ext)
-        if lang_id and lang_id in self.parsers:
-            return self._parse_with_treesitter(code, lang_id)
+        if lang_id == 'python':
+            data = self._parse_python_ast(code, file_path)
+        else:
+            data = self._parse_with_treesitter(code, lang_id, file_path)
         
-        return {"functions": [], "classes": [], "imports": [], "calls": []}
+        self.store_cached(code, file_path, data)
+        return data
+
+    def get_cached(self, code: str, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Look up a previous parse of this exact content, if a cache is configured."""
+        key = self._cache_key(code, file_path)
+        return self.cache.get(key) if key else None
+
+    def store_cached(self, code: str, file_path: Path, data: Dict[str, Any]):
+        key = self._cache_key(code, file_path)
+        if key:
+            self.cache.put(key, data)
+
+    def _cache_key(self, code: str, file_path: Path) -> Optional[str]:
+        if self.cache is None:
+            return None
+        lang_id = self.LANG_MAP.get(file_path.suffix.lower())
+        if lang_id is None:
+            return None
+        return self.cache.make_key(code, lang_id, f"structure-{PARSER_VERSION}")
 
     def _parse_python_ast(self, code: str, file_path: Path) -> Dict[str, Any]:
         """Parse Python code using native AST module."""
+        if self.trees is not None and self.tree_consumer is not None:
+            # Shared walk: the tree registry runs this rule together with every other pending check
+            try:
+                return self.trees.rule_result(file_path, self.tree_consumer, PythonStructureRule)
+            except SyntaxError:
+                return {"functions": [], "classes": [], "imports": [], "calls": []}
         try:
-            tree = ast.parse(code)
+            tree = self.trees.python_tree(file_path) if self.trees is not None else ast.parse(code)
         except SyntaxError:
             return {"functions": [], "classes": [], "imports": [], "calls": []}
+        return run_rules(tree, [PythonStructureRule()], code)[0]
 
-        all_calls = []
-
-        class Analyzer(ast.NodeVisitor):
-            def __init__(self, source_code):
-                self.source_code = source_code
-                self.current_function = None
-                self.current_class = None
-                self.functions = []
-                self.classes = []
-                self.imports = []
-                self.calls_in_current = []
-                self.calls_detailed_in_current = []
-                self.variables = []
-                self.identifiers = []
-
-            def visit_Import(self, node):
-                names = [alias.name for alias in node.names]
-                self.imports.append({"module": None, "names": names})
-                self.generic_visit(node)
-
-            def visit_Assign(self, node):
-                # Capture global variables (not within function/class)
-                if not self.current_function and not self.current_class:
-                    for target in node.targets:
-                        if isinstance(target, ast.Name):
-                            self.variables.append({
-                                "name": target.id,
-                                "line": node.lineno
-                            })
-                self.generic_visit(node)
-
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Load):
-                    self.identifiers.append(node.id)
-                self.generic_visit(node)
-
-
-            def visit_ImportFrom(self, node):
-                names = [alias.name for alias in node.names]
-                self.imports.append({"module": node.module, "names": names})
-                self.generic_visit(node)
-
-            def visit_ClassDef(self, node):
-                prev_class = self.current_class
-                self.current_class = node.name
-                
-                # Extract base class names
-                bases = []
-                for base in node.bases:
-                    if isinstance(base, ast.Name):
-                        bases.append(base.id)
-                    elif isinstance(base, ast.Attribute):
-                        bases.append(base.attr)
-                
-                try:
-                    body_code = ast.get_source_segment(self.source_code, node)
-                except:
-                    body_code = ""
-
-                class_data = {
-                    "name": node.name,
-                    "line": node.lineno,
-                    "methods": [],
-                    "attributes": [],
-                    "bases": bases,
-                    "body_code": body_code
-                }
-                
-                for item in node.body:
-                    if isinstance(item, ast.Assign):
-                        for target in item.targets:
-                            if isinstance(target, ast.Name):
-                                class_data["attributes"].append(target.id)
-                
-                self.classes.append(class_data)
-                self.generic_visit(node)
-                self.current_class = prev_class
-
-            def visit_FunctionDef(self, node):
-                prev_func = self.current_function
-                prev_calls = self.calls_in_current
-                
-                self.current_function = node.name
-                self.calls_in_current = []
-                self.calls_detailed_in_current = []
-                
-                args = [arg.arg for arg in node.args.args]
-                signature = f"{node.name}({', '.join(args)})"
-                
-                try:
-                    body_code = ast.get_source_segment(self.source_code, node)
-                except:
-                    body_code = ""
-
-                # Extract decorator names
-                decorators = []
-                for dec in node.decorator_list:
-                    if isinstance(dec, ast.Name):
-                        decorators.append(dec.id)
-                    elif isinstance(dec, ast.Attribute):
-                        decorators.append(dec.attr)
-                    elif isinstance(dec, ast.Call):
-                        if isinstance(dec.func, ast.Name):
-                            decorators.append(dec.func.id)
-                        elif isinstance(dec.func, ast.Attribute):
-                            decorators.append(dec.func.attr)
-
-                self.generic_visit(node)
-                
-                func_data = {
-                    "name": node.name,
-                    "line": node.lineno,
-                    "signature": signature,
-                    "body_code": body_code,
-                    "calls": [c["name"] for c in self.calls_detailed_in_current],
-                    "calls_detailed": self.calls_detailed_in_current,
-                    "parent_class": self.current_class,
-                    "decorators": decorators
-                }
-                self.functions.append(func_data)
-                
-                if self.current_class:
-                    for c in self.classes:
-                        if c["name"] == self.current_class:
-                            c["methods"].append(node.name)
-                            break
-                
-                self.current_function = prev_func
-                self.calls_in_current = prev_calls
-
-            visit_AsyncFunctionDef = visit_FunctionDef
-
-            def visit_Call(self, node):
-                call_name = None
-                receiver = None  # "self", "super", a class name, or None (bare call)
-                
-                if isinstance(node.func, ast.Name):
-                    call_name = node.func.id
-                    receiver = None  # bare call like foo()
-                elif isinstance(node.func, ast.Attribute):
-                    call_name = node.func.attr
-                    # Determine receiver
-                    val = node.func.value
-                    if isinstance(val, ast.Name):
-                        if val.id == "self":
-                            receiver = "self"
-                        elif val.id == "super":
-                            receiver = "super"
-                        else:
-                            receiver = val.id  # ClassName.method()
-                    elif isinstance(val, ast.Call):
-                        # super().__init__() — val is Call to super
-                        if isinstance(val.func, ast.Name) and val.func.id == "super":
-                            receiver = "super"
-                
-                if call_name:
-                    self.calls_detailed_in_current.append({
-                        "name": call_name,
-                        "receiver": receiver
-                    })
-                    all_calls.append(call_name)
-                
-                self.generic_visit(node)
-
-        analyzer = Analyzer(code)
-        analyzer.visit(tree)
-        
-        return {
-            "functions": analyzer.functions,
-            "classes": analyzer.classes,
-            "imports": analyzer.imports,
-            "calls": all_calls,
-            "identifiers": analyzer.identifiers,
-            "variables": analyzer.variables
-        }
-
-    def _parse_with_treesitter(self, code: str, lang_id: str) -> Dict[str, Any]:
+    def _parse_with_treesitter(self, code: str, lang_id: str, file_path: Path = None) -> Dict[str, Any]:
         """Extract functions and classes using Tree-sitter queries."""
         parser = self.parsers[lang_id]
         query = self.queries.get(lang_id)
@@ -296,7 +346,10 @@ class StructuralParser:
             return None
 
         try:
-            tree = parser.parse(bytes(code, "utf8"))
+            if self.trees is not None and file_path is not None:
+                tree = self.trees.get(file_path, lang_id)
+            else:
+                tree = parser.parse(bytes(code, "utf8"))
             root = tree.root_node
         except Exception as e:
             print(f"Error parsing with Tree-sitter ({lang_id}): {e}")
@@ -319,6 +372,7 @@ class StructuralParser:
         # We need to track which node belongs to which class
         # (Simplified: functions/methods following a class but before next class)
         current_class = None
+        func_nodes = []  # (function node, its "calls" list), in document order
 
         for node, tag in captures:
             if tag == 'class':
@@ -328,7 +382,7 @@ class StructuralParser:
                     "line": node.start_point[0] + 1,
                     "methods": [],
                     "attributes": [],
-                    "body_code": code[node.start_byte:node.end_byte]
+                    "span": [node.start_byte, node.end_byte]
                 })
             
             elif tag == 'func':
@@ -382,10 +436,11 @@ class StructuralParser:
                     "name": name,
                     "line": node.start_point[0] + 1,
                     "signature": signature,
-                    "body_code": code[node.start_byte:node.end_byte],
+                    "span": [node.start_byte, node.end_byte],
                     "calls": [],
                     "parent_class": current_class
                 })
+                func_nodes.append((node, results["functions"][-1]["calls"]))
                 
                 if current_class:
                     results["classes"][-1]["methods"].append(name)
@@ -426,35 +481,31 @@ class StructuralParser:
                     results["global_vars"] = []
                 results["global_vars"].append(child.text.decode('utf8').strip())
         
-        # 2. Extract call sites from each function body
-        def extract_calls(node):
-            """Recursively find call_expression nodes."""
-            calls = []
-            if node.type == 'call_expression':
-                func_node = node.child_by_field_name('function')
-                if func_node:
-                    call_name = func_node.text.decode('utf8')
-                    # Simplify: take last part of dotted names (e.g. System.out.println -> println)
-                    if '.' in call_name:
-                        call_name = call_name.split('.')[-1]
-                    if '::' in call_name:
-                        call_name = call_name.split('::')[-1]
-                    calls.append(call_name)
-            elif node.type == 'method_invocation': # Java specific
-                name_node = node.child_by_field_name('name')
-                if name_node:
-                    calls.append(name_node.text.decode('utf8'))
-            for child in node.children:
-                calls.extend(extract_calls(child))
-            return calls
-        
-        for func in results["functions"]:
-            # Re-parse the function body to find call sites
-            func_line = func["line"] - 1  # 0-indexed
-            for node, tag in captures:
-                if tag == 'func' and node.start_point[0] == func_line:
-                    func["calls"] = extract_calls(node)
-                    break
+        # 2. Extract call sites from each function body in one pass: walk the call
+        #    captures alongside the (start-ordered) functions, keeping a stack of the
+        #    functions enclosing the current position. Calls inside nested functions
+        #    also count for the enclosing ones.
+        call_query = self.queries_calls.get(lang_id)
+        if func_nodes and call_query:
+            open_funcs = []  # (end_byte, calls list), innermost last
+            next_func = 0
+            for node, _ in call_query.captures(root):
+                pos = node.start_byte
+                while next_func < len(func_nodes) and func_nodes[next_func][0].start_byte <= pos:
+                    func_node, func_calls = func_nodes[next_func]
+                    while open_funcs and open_funcs[-1][0] <= func_node.start_byte:
+                        open_funcs.pop()
+                    open_funcs.append((func_node.end_byte, func_calls))
+                    next_func += 1
+                while open_funcs and open_funcs[-1][0] <= pos:
+                    open_funcs.pop()
+                if not open_funcs:
+                    continue
+                
+                call_name = self._call_name(node)
+                if call_name:
+                    for _, func_calls in open_funcs:
+                        func_calls.append(call_name)
 
         if usage_query:
             captures_usage = usage_query.captures(root)
@@ -466,3 +517,22 @@ class StructuralParser:
                     except: pass
 
         return results
+
+    @staticmethod
+    def _call_name(node) -> Optional[str]:
+        """Callee name of a call_expression / method_invocation node."""
+        if node.type == 'call_expression':
+            func_node = node.child_by_field_name('function')
+            if func_node:
+                call_name = func_node.text.decode('utf8')
+                # Simplify: take last part of dotted names (e.g. System.out.println -> println)
+                if '.' in call_name:
+                    call_name = call_name.split('.')[-1]
+                if '::' in call_name:
+                    call_name = call_name.split('::')[-1]
+                return call_name
+        elif node.type == 'method_invocation': # Java specific
+            name_node = node.child_by_field_name('name')
+            if name_node:
+                return name_node.text.decode('utf8')
+        return None
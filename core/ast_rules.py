@@ -0,0 +1,80 @@
+"""
+AST Rules
+Python checks written as node-type handlers, so that any number of them share
+a single traversal of each syntax tree.
+"""
+
+import ast
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+class Rule:
+    """
+    One check over a Python module.
+
+    Handlers are found by name along the node class hierarchy:
+      visit_<Node>(node)  called before the node's children are walked
+      leave_<Node>(node)  called after the whole subtree
+    `<Node>` may be an abstract base (`visit_expr`, `leave_AST`) to receive
+    every node of that kind. begin() runs before the walk, result() after it.
+    """
+
+    def begin(self, tree: ast.AST, source: Optional[str] = None):
+        pass
+
+    def result(self) -> Any:
+        return None
+
+def _handlers(rules: Sequence[Rule], node_class: type, prefix: str) -> Tuple:
+    """Bound handlers of every rule for one node class (base-class handlers first on visit, last on leave)."""
+    bases = [base for base in node_class.__mro__ if base is not object]
+    if prefix == "visit_":
+        bases.reverse()
+    handlers = []
+    for rule in rules:
+        for base in bases:
+            handler = getattr(rule, prefix + base.__name__, None)
+            if handler is not None:
+                handlers.append(handler)
+    return tuple(handlers)
+
+def run_rules(tree: ast.AST, rules: Sequence[Rule], source: Optional[str] = None) -> List[Any]:
+    """
+    Walk `tree` once (depth-first, children in field order, like ast.NodeVisitor)
+    and dispatch every node to all rules. Returns each rule's result().
+    """
+    for rule in rules:
+        rule.begin(tree, source)
+
+    enter: Dict[type, Tuple] = {}
+    leave: Dict[type, Tuple] = {}
+    stack: list = [tree]
+    while stack:
+        node = stack.pop()
+        if node.__class__ is tuple:
+            # (node,) marks the end of a subtree whose leave handlers are due
+            node = node[0]
+            for handler in leave[node.__class__]:
+                handler(node)
+            continue
+
+        cls = node.__class__
+        handlers = enter.get(cls)
+        if handlers is None:
+            handlers = enter[cls] = _handlers(rules, cls, "visit_")
+            leave[cls] = _handlers(rules, cls, "leave_")
+        for handler in handlers:
+            handler(node)
+        if leave[cls]:
+            stack.append((node,))
+
+        children = []
+        for field in cls._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, ast.AST):
+                children.append(value)
+            elif isinstance(value, list):
+                children.extend(item for item in value if isinstance(item, ast.AST))
+        children.reverse()
+        stack.extend(children)
+
+    return [rule.result() for rule in rules]
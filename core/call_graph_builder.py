@@ -1,33 +1,56 @@
 """
 Call Graph Builder
-Constructs function call graph and file dependency graph using NetworkX.
+Constructs function call graph and file dependency graph as compact CSR graphs
+(NetworkX views are exported on demand). Calls are resolved by receiver through
+the shared ClassHierarchy, and every structural check reads the same graphs.
 """
 
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-import networkx as nx
+from typing import Dict, List, Set, Tuple, Union
 from core.symbol_table import Symbol, SymbolTableBuilder
+from core.class_hierarchy import ClassHierarchy
+from core.module_index import ModuleIndex
+from core.scc import CycleGroup, find_cycles
+from core.compact_graph import CompactGraph
 
 class CallGraphBuilder:
     """
     Builds directed graph of function calls across the codebase.
     """
     
-    def __init__(self, symbol_table: SymbolTableBuilder):
+    def __init__(self, symbol_table: SymbolTableBuilder, hierarchy: ClassHierarchy = None):
         self.symbol_table = symbol_table
-        self.function_graph = nx.DiGraph()  # Function -> Function calls
-        self.file_graph = nx.DiGraph()       # File -> File dependencies
+        # Shared MROs / lookup maps (see ClassHierarchy.resolve_call); built here if not passed in
+        self.hierarchy = hierarchy or ClassHierarchy(symbol_table)
+        self.functions = CompactGraph.from_edges([], [])  # Function -> Function calls
+        self.possible = CompactGraph.from_edges([], [])   # Calls plus every target a call may dispatch to
+        self.files = CompactGraph.from_edges([], [])      # File -> File dependencies (imports + calls)
+        self.imports = CompactGraph.from_edges([], [])    # File -> File import edges only
         self.call_sites: Dict[str, List[str]] = {}  # function -> list of functions it calls
+        self._nx_cache = {}
     
     def build_call_graph(self, parsed_files: Dict[Path, dict]):
         """
         Build call graph and file dependency graph from parsed file data.
+        
+        Function records carry `qualified_name`, `line` and their calls: `calls_detailed`
+        (name + receiver) where the parser records it, else bare `calls` names.
+        `functions` holds the exact edges (self / super / ClassName along the MRO,
+        bare names to same-file functions first); `possible` adds what a call might
+        reach at runtime: subclass overrides for `self.m()`, and every function of
+        that name when a call cannot be resolved (e.g. `obj.m()`).
         """
-        # Phase 1: Add all function nodes
-        for qualified_name, symbol in self.symbol_table.symbols.items():
-            self.function_graph.add_node(qualified_name, symbol=symbol)
+        # Phase 1: All function nodes
+        function_nodes = list(self.symbol_table.symbols)
+        call_edges: List[Tuple[str, str]] = []
+        possible_edges: List[Tuple[str, str]] = []
+        file_nodes: List[str] = []
+        import_edges: List[Tuple[str, str]] = []
+        
+        # Import targets are looked up by module name, not by scanning every file
+        module_index = ModuleIndex(parsed_files.keys())
         
-        # Phase 2: Add call edges (Function -> Function)
+        # Phase 2: Call edges (Function -> Function)
         for file_path, data in parsed_files.items():
             for func_data in data.get("functions", []):
                 caller = func_data.get("qualified_name")
@@ -35,61 +58,91 @@ class CallGraphBuilder:
                 
                 if caller:
                     self.call_sites[caller] = calls
-                    for call_name in calls:
-                        callee = self._resolve_call(call_name, file_path)
-                        if callee and callee in self.symbol_table.symbols:
-                            self.function_graph.add_edge(caller, callee)
+                    symbol = self.symbol_table.get_symbol(caller)
+                    if symbol is None:
+                        continue
+                    # Files sharing a module name share qualified names: a shadowed definition's
+                    # calls still keep their targets alive, but only the symbol's own body gives exact edges
+                    own = str(symbol.file) == str(file_path) and symbol.line == func_data.get("line", symbol.line)
+                    detailed = func_data.get("calls_detailed")
+                    if detailed is None:
+                        # Tree-sitter languages only record call names
+                        detailed = [{"name": name} for name in calls]
+                    for call in detailed:
+                        targets, possible = self._resolve_targets(call, symbol)
+                        if own:
+                            call_edges.extend((caller, t.qualified_name) for t in targets)
+                        possible_edges.extend((caller, t.qualified_name) for t in possible)
             
-            # Phase 3: Add import edges (File -> File) directly from parser data
+            # Phase 3: Import edges (File -> File) directly from parser data
             caller_file = str(file_path)
-            if not self.file_graph.has_node(caller_file):
-                self.file_graph.add_node(caller_file)
+            file_nodes.append(caller_file)
                 
             for imp in data.get("imports", []):
-                # Handle 'from module import names'
-                if imp.get("module"):
-                    module_name = imp["module"]
-                    # Find file corresponding to this module
-                    # (Simple heuristic: module name matches filename)
-                    for other_path in parsed_files.keys():
-                        if other_path.stem == module_name:
-                            self.file_graph.add_edge(caller_file, str(other_path))
-                
-                # Handle 'import name'
-                for name in imp.get("names", []):
-                    for other_path in parsed_files.keys():
-                        if other_path.stem == name:
-                            self.file_graph.add_edge(caller_file, str(other_path))
-        
-        # Phase 4: Build file dependency graph from function calls as well
-        self._build_file_graph()
-    
-    def _resolve_call(self, call_name: str, current_file: Path) -> str:
-        """
-        Resolve a function call to its qualified name.
-        Simple heuristic: check if exact match exists in symbol table.
-        """
-        # Try exact match first
-        if call_name in self.symbol_table.symbols:
-            return call_name
-        
-        # Try matching by name only (find in same file first)
-        candidates = self.symbol_table.find_symbols_by_name(call_name)
-        
-        # Prefer symbols in same file
-        for candidate in candidates:
-            if candidate.file == current_file:
-                return candidate.qualified_name
+                # Resolve through the module index (packages, __init__.py, relative imports)
+                for target in module_index.resolve_import(imp, file_path):
+                    if target != caller_file:
+                        import_edges.append((caller_file, target))
         
-        # Return first match if any
-        if candidates:
-            return candidates[0].qualified_name
+        self.functions = CompactGraph.from_edges(function_nodes, call_edges)
+        self.possible = CompactGraph.from_edges(function_nodes, possible_edges)
+        self.imports = CompactGraph.from_edges(file_nodes, import_edges)
         
-        return None
+        # Phase 4: File dependencies from cross-file function calls as well
+        self.files = CompactGraph.from_edges(file_nodes, import_edges + self._call_file_edges())
+        self._nx_cache = {}
     
-    def _build_file_graph(self):
-        """Build file dependency graph from function call graph."""
-        for caller, callee in self.function_graph.edges():
+    @property
+    def function_graph(self):
+        """NetworkX export of the call graph (nodes carry their `symbol`); built on first access."""
+        if "functions" not in self._nx_cache:
+            graph = self.functions.to_networkx()
+            for qualified_name in self.functions.nodes:
+                graph.nodes[qualified_name]["symbol"] = self.symbol_table.get_symbol(qualified_name)
+            self._nx_cache["functions"] = graph
+        return self._nx_cache["functions"]
+    
+    @property
+    def file_graph(self):
+        """NetworkX export of the file dependency graph; built on first access."""
+        if "files" not in self._nx_cache:
+            self._nx_cache["files"] = self.files.to_networkx()
+        return self._nx_cache["files"]
+    
+    def save_snapshot(self, directory: Union[str, Path]):
+        """Write both graphs as binary snapshots (functions.npz / files.npz)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.functions.save(directory / "functions.npz")
+        self.files.save(directory / "files.npz")
+    
+    def load_snapshot(self, directory: Union[str, Path]) -> bool:
+        """Replace both graphs with a snapshot written by save_snapshot(); False if unavailable."""
+        directory = Path(directory)
+        functions = CompactGraph.load(directory / "functions.npz")
+        files = CompactGraph.load(directory / "files.npz")
+        if functions is None or files is None:
+            return False
+        self.functions, self.files = functions, files
+        self._nx_cache = {}
+        return True
+    
+    def _resolve_targets(self, call: dict, caller: Symbol) -> Tuple[List[Symbol], List[Symbol]]:
+        """(exact targets, possible targets) of one call site; `super().m()` never links a method to itself."""
+        hierarchy = self.hierarchy
+        targets = hierarchy.resolve_call(call, caller)
+        possible = hierarchy.resolve_call(call, caller, dispatch=True) if call.get("receiver") == "self" else targets
+        if not possible:
+            possible = hierarchy.functions_by_name.get(call["name"], [])
+        if call.get("receiver") == "super":
+            targets = [t for t in targets if t != caller]
+            possible = [t for t in possible if t != caller]
+        return targets, possible
+    
+    def _call_file_edges(self) -> List[Tuple[str, str]]:
+        """File dependency edges implied by cross-file function calls."""
+        edges = []
+        for caller, callee in self.functions.edges():
             caller_symbol = self.symbol_table.get_symbol(caller)
             callee_symbol = self.symbol_table.get_symbol(callee)
             
@@ -98,18 +151,30 @@ class CallGraphBuilder:
                 callee_file = str(callee_symbol.file)
                 
                 if caller_file != callee_file:
-                    self.file_graph.add_edge(caller_file, callee_file)
+                    edges.append((caller_file, callee_file))
+        return edges
     
-    def find_circular_dependencies(self) -> List[List[str]]:
+    def find_circular_dependencies(self, max_cycles_per_scc: int = 1) -> List[List[str]]:
         """
         Detect circular dependencies in file graph.
-        Returns list of cycles (each cycle is a list of file paths).
+        Returns list of cycles (each cycle is a list of file paths): up to
+        `max_cycles_per_scc` shortest cycles per strongly connected component.
         """
-        try:
-            cycles = list(nx.simple_cycles(self.file_graph))
-            return cycles
-        except:
-            return []
+        cycles = []
+        for group in self.find_dependency_cycle_groups(max_cycles_per_scc):
+            cycles.extend(group.cycles)
+        return cycles
+    
+    def find_dependency_cycle_groups(self, max_cycles_per_scc: int = 1) -> List[CycleGroup]:
+        """Each tangle of mutually dependent files once (its SCC), with representative cycles."""
+        return find_cycles(self.files.indptr, self.files.indices, max_cycles_per_scc, nodes=self.files.nodes)
+    
+    def find_call_cycles(self, max_cycles_per_scc: int = 1) -> List[List[str]]:
+        """Recursion / mutual recursion: up to `max_cycles_per_scc` shortest cycles per group of functions."""
+        cycles = []
+        for group in find_cycles(self.functions.indptr, self.functions.indices, max_cycles_per_scc, nodes=self.functions.nodes):
+            cycles.extend(group.cycles)
+        return cycles
     
     def find_dead_code(self, entry_points: List[str] = None) -> List[Symbol]:
         """
@@ -120,35 +185,23 @@ class CallGraphBuilder:
                          If None, finds functions with no incoming edges
         """
         if entry_points:
-            # Find all reachable functions from entry points
-            reachable = set()
-            for entry in entry_points:
-                if entry in self.function_graph:
-                    reachable.add(entry)
-                    reachable.update(nx.descendants(self.function_graph, entry))
-            
-            # Dead code = all functions - reachable
-            all_functions = set(self.function_graph.nodes())
-            dead = all_functions - reachable
+            # One traversal from all entry points at once; dead code = everything not reached
+            reachable = self.functions.reachable_mask(entry_points)
+            dead = [self.functions.nodes[i] for i in (~reachable).nonzero()[0].tolist()]
         else:
             # Simple heuristic: functions with no incoming edges (except entry points)
-            dead = set()
-            for node in self.function_graph.nodes():
-                if self.function_graph.in_degree(node) == 0:
-                    # Check if it's not a common entry point name
-                    symbol = self.symbol_table.get_symbol(node)
-                    if symbol and symbol.name not in {'main', '__main__', 'run', 'start'}:
-                        dead.add(node)
+            dead = []
+            for i in (self.functions.in_degrees() == 0).nonzero()[0].tolist():
+                node = self.functions.nodes[i]
+                # Check if it's not a common entry point name
+                symbol = self.symbol_table.get_symbol(node)
+                if symbol and symbol.name not in {'main', '__main__', 'run', 'start'}:
+                    dead.append(node)
         
         # Convert to Symbol objects
         return [self.symbol_table.get_symbol(qname) for qname in dead 
                 if self.symbol_table.get_symbol(qname)]
     
     def get_call_chain(self, from_func: str, to_func: str) -> List[str]:
-        """Get shortest call chain between two functions."""
-        try:
-            if nx.has_path(self.function_graph, from_func, to_func):
-                return nx.shortest_path(self.function_graph, from_func, to_func)
-        except:
-            pass
-        return []
+        """Get shortest call chain between two functions ([] if there is none)."""
+        return self.functions.shortest_path(from_func, to_func)
@@ -0,0 +1,216 @@
+"""
+Class Hierarchy
+Per-run index of classes, their method resolution order and method tables,
+plus the function lookup maps used to resolve call sites.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.symbol_table import Symbol, SymbolTableBuilder, SymbolType
+
+def _c3_merge(sequences: List[List[str]]) -> Optional[List[str]]:
+    """
+    C3 linearization merge step; None if the bases admit no consistent order.
+    Sequences are consumed through head pointers, with a count of each name's
+    occurrences in the unconsumed tails, so each step costs O(len(sequences)).
+    """
+    sequences = [seq for seq in sequences if seq]
+    heads = [0] * len(sequences)
+    in_tails = Counter(name for seq in sequences for name in seq[1:])
+    result = []
+    while True:
+        live = [k for k, seq in enumerate(sequences) if heads[k] < len(seq)]
+        if not live:
+            return result
+        for k in live:
+            head = sequences[k][heads[k]]
+            if not in_tails[head]:
+                break
+        else:
+            return None
+        result.append(head)
+        for k in live:
+            seq = sequences[k]
+            if seq[heads[k]] == head:
+                heads[k] += 1
+                if heads[k] < len(seq):
+                    in_tails[seq[heads[k]]] -= 1
+
+class ClassHierarchy:
+    """
+    Built once per symbol-table state and shared by every check that resolves calls.
+
+    Classes are keyed by bare name (like the parser's `bases`), later definitions
+    win on name clashes, except that a class's own methods are looked up in the
+    caller's file first. MROs follow Python's C3 rule (falling back to depth-first
+    order for inconsistent or clashing hierarchies); per-class method tables are
+    merged along the MRO on first use, so a (class, method) lookup is a dict hit.
+    """
+
+    def __init__(self, symbol_table: SymbolTableBuilder, classes: Iterable[Dict[str, Any]] = ()):
+        self.symbol_table = symbol_table
+        self.bases: Dict[str, List[str]] = {}  # class name -> base class names
+        self.methods: Dict[str, Dict[str, Symbol]] = {}  # class name -> {method name: Symbol} (own methods)
+        self._subclasses: Dict[str, List[str]] = {}  # class name -> direct subclasses (from every definition)
+        for cls in classes:
+            self.bases[cls["name"]] = cls.get("bases", [])
+            self.methods[cls["name"]] = {}
+            for base in dict.fromkeys(cls.get("bases", [])):
+                if base != cls["name"]:
+                    self._subclasses.setdefault(base, []).append(cls["name"])
+
+        self.local_methods: Dict[Tuple[str, str], Dict[str, Symbol]] = {}  # (file, class) -> own methods there
+        self.standalone: Dict[Tuple[str, str], Symbol] = {}  # (file, name) -> top-level function
+        self.standalone_by_name: Dict[str, List[Symbol]] = {}
+        self.standalone_by_module: Dict[Tuple[str, str], List[Symbol]] = {}  # (module, name) -> top-level functions
+        self.functions_by_name: Dict[str, List[Symbol]] = {}  # functions and methods
+        for sym in symbol_table.symbols.values():
+            if sym.type != SymbolType.FUNCTION:
+                continue
+            self.functions_by_name.setdefault(sym.name, []).append(sym)
+            if sym.parent_name:
+                self.methods.setdefault(sym.parent_name, {})[sym.name] = sym
+                self.local_methods.setdefault((str(sym.file), sym.parent_name), {})[sym.name] = sym
+            else:
+                self.standalone[(str(sym.file), sym.name)] = sym
+        for (_, name), sym in self.standalone.items():
+            self.standalone_by_name.setdefault(name, []).append(sym)
+            self.standalone_by_module.setdefault((Path(sym.file).stem, name), []).append(sym)
+
+        self._mro: Dict[str, List[str]] = {}
+        self._tables: Dict[str, Dict[str, Symbol]] = {}
+        self._super: Dict[Tuple[str, str], Optional[Symbol]] = {}
+        self._overrides: Dict[Tuple[str, str], List[Symbol]] = {}
+
+    @classmethod
+    def from_parsed(cls, symbol_table: SymbolTableBuilder, parsed: Dict[str, dict]) -> "ClassHierarchy":
+        """From parser output per file (uses each file's "classes" records)."""
+        return cls(symbol_table, (c for data in parsed.values() for c in data.get("classes", [])))
+
+    # ── Classes ───────────────────────────────────────────────
+
+    def __contains__(self, class_name: str) -> bool:
+        return class_name in self.methods
+
+    def mro(self, class_name: str) -> List[str]:
+        """The class followed by its ancestors in method resolution order."""
+        mro = self._mro.get(class_name)
+        if mro is None:
+            mro = self._linearize(class_name)
+        return mro
+
+    def _linearize(self, class_name: str) -> List[str]:
+        """
+        C3 over the base graph without recursion: a depth-first walk with an explicit
+        stack finishes every base before the classes that inherit from it (topological
+        order), so each class is merged once from its bases' memoised MROs.
+        """
+        visiting = {class_name}  # classes on the stack
+        stack = [(class_name, [b for b in self.bases.get(class_name, []) if b != class_name], 0)]
+        while stack:
+            name, bases, pos = stack[-1]
+            if pos < len(bases):
+                stack[-1] = (name, bases, pos + 1)
+                base = bases[pos]
+                if base not in self._mro and base not in visiting:
+                    visiting.add(base)
+                    stack.append((base, [b for b in self.bases.get(base, []) if b != base], 0))
+                continue
+            stack.pop()
+            visiting.discard(name)
+            # A base still being visited is an inheritance loop through clashing names (`class Foo(Foo)`): cut it there
+            parents = [self._mro.get(base, [base]) for base in bases]
+            merged = _c3_merge(parents + [bases])
+            if merged is None:
+                merged = list(dict.fromkeys(n for parent in parents for n in parent))
+            self._mro[name] = [name] + [n for n in merged if n != name]
+        return self._mro[class_name]
+
+    def method_table(self, class_name: str) -> Dict[str, Symbol]:
+        """Every method visible on a class (own and inherited) -> its implementation."""
+        table = self._tables.get(class_name)
+        if table is None:
+            table = {}
+            for name in reversed(self.mro(class_name)):
+                table.update(self.methods.get(name, {}))
+            self._tables[class_name] = table
+        return table
+
+    def lookup(self, class_name: str, method: str) -> Optional[Symbol]:
+        """Implementation of `class_name.method` (walking the MRO), or None."""
+        if class_name not in self.methods:
+            return None
+        return self.method_table(class_name).get(method)
+
+    def lookup_super(self, class_name: str, method: str) -> Optional[Symbol]:
+        """What `super().method` resolves to inside `class_name`: the next definition along its MRO."""
+        key = (class_name, method)
+        if key not in self._super:
+            target = None
+            if class_name in self.methods:
+                for name in self.mro(class_name)[1:]:
+                    target = self.methods.get(name, {}).get(method)
+                    if target is not None:
+                        break
+            self._super[key] = target
+        return self._super[key]
+
+    def overrides(self, class_name: str, method: str) -> List[Symbol]:
+        """Definitions of `method` in subclasses of `class_name` (transitively), in discovery order."""
+        key = (class_name, method)
+        if key not in self._overrides:
+            found = []
+            seen = {class_name}
+            queue = list(self._subclasses.get(class_name, []))
+            while queue:
+                name = queue.pop(0)
+                if name in seen:
+                    continue
+                seen.add(name)
+                target = self.methods.get(name, {}).get(method)
+                if target is not None:
+                    found.append(target)
+                queue.extend(self._subclasses.get(name, []))
+            self._overrides[key] = found
+        return self._overrides[key]
+
+    # ── Call sites ────────────────────────────────────────────
+
+    def resolve_call(self, call: Dict[str, Any], caller: Symbol, dispatch: bool = False) -> List[Symbol]:
+        """
+        Functions a call site can reach, by receiver: `self.m()` / `Class.m()` along the
+        class MRO, `super().m()` past the caller's class, `module.f()` to that module's
+        top-level function, bare `f()` to a same-file function first, else every
+        top-level function of that name.
+        With `dispatch`, `self.m()` also reaches overrides of `m` in subclasses, since
+        `self` may be an instance of any of them at runtime.
+        """
+        name = call["name"]
+        receiver = call.get("receiver")
+        if receiver == "self" or receiver == "super":
+            if not caller.parent_name:
+                return []
+            if receiver == "self":
+                target = self._lookup_from(caller.file, caller.parent_name, name)
+                if dispatch:
+                    return ([target] if target else []) + self.overrides(caller.parent_name, name)
+            else:
+                target = self.lookup_super(caller.parent_name, name)
+            return [target] if target else []
+        if receiver is not None:
+            target = self._lookup_from(caller.file, receiver, name)
+            if target is None and receiver not in self.methods:
+                # A module does not call itself through its own name: same-stem files shadow others (e.g. stdlib)
+                return [sym for sym in self.standalone_by_module.get((receiver, name), []) if sym.file != caller.file]
+            return [target] if target else []
+
+        target = self.standalone.get((str(caller.file), name))
+        if target:
+            return [target]
+        return list(self.standalone_by_name.get(name, []))
+
+    def _lookup_from(self, file_path: Path, class_name: str, method: str) -> Optional[Symbol]:
+        """lookup(), preferring the class defined in `file_path` when several files define that name."""
+        target = self.local_methods.get((str(file_path), class_name), {}).get(method)
+        return target or self.lookup(class_name, method)
@@ -0,0 +1,204 @@
+"""
+Compact Graph
+Immutable directed graph over interned node keys, stored as CSR arrays (NumPy).
+
+Costs a few bytes per edge instead of NetworkX's per-edge dicts, answers
+neighbour queries with array slices, runs BFS-style traversals level by level
+in vectorised NumPy, hands its arrays straight to core.scc for cycle
+detection, and snapshots to a single `.npz` that loads in milliseconds.
+`to_networkx()` exports a regular DiGraph when needed.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+class CompactGraph:
+    """
+    Directed graph with nodes interned to integer IDs 0..n-1.
+
+    Forward and reverse adjacency are both kept in CSR form:
+    successors of node i are `indices[indptr[i]:indptr[i + 1]]`.
+    Node keys are strings (qualified names, file paths).
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, nodes: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 rev_indptr: np.ndarray, rev_indices: np.ndarray):
+        self.nodes = nodes
+        self.ids: Dict[str, int] = {node: i for i, node in enumerate(nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.rev_indptr = rev_indptr
+        self.rev_indices = rev_indices
+
+    # ── Construction ──────────────────────────────────────────
+
+    @classmethod
+    def from_edges(cls, nodes: Iterable[str], edges: Iterable[Tuple[str, str]]) -> "CompactGraph":
+        """Build from node keys plus (source, target) edges; unknown endpoints become nodes, duplicates collapse."""
+        node_list = list(dict.fromkeys(nodes))
+        ids = {node: i for i, node in enumerate(node_list)}
+        src, dst = [], []
+        for a, b in edges:
+            for key in (a, b):
+                if key not in ids:
+                    ids[key] = len(node_list)
+                    node_list.append(key)
+            src.append(ids[a])
+            dst.append(ids[b])
+        return cls._from_id_arrays(node_list, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64))
+
+    @classmethod
+    def _from_id_arrays(cls, nodes: List[str], src: np.ndarray, dst: np.ndarray) -> "CompactGraph":
+        n = len(nodes)
+        if len(src):
+            # Deduplicate edges and sort by (source, target)
+            keys = np.unique(src * max(n, 1) + dst)
+            src, dst = keys // max(n, 1), keys % max(n, 1)
+        indptr, indices = cls._csr(n, src, dst)
+        order = np.lexsort((src, dst))
+        rev_indptr, rev_indices = cls._csr(n, dst[order], src[order])
+        return cls(nodes, indptr, indices, rev_indptr, rev_indices)
+
+    @staticmethod
+    def _csr(n: int, rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """rows must already be sorted."""
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        if len(rows):
+            np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, np.ascontiguousarray(cols, dtype=np.int32)
+
+    # ── Basic queries ─────────────────────────────────────────
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node: str):
+        return node in self.ids
+
+    def successor_ids(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def successors(self, node: str) -> List[str]:
+        i = self.ids.get(node)
+        return [] if i is None else [self.nodes[j] for j in self.successor_ids(i).tolist()]
+
+    def predecessor_ids(self, i: int) -> np.ndarray:
+        return self.rev_indices[self.rev_indptr[i]:self.rev_indptr[i + 1]]
+
+    def predecessors(self, node: str) -> List[str]:
+        i = self.ids.get(node)
+        return [] if i is None else [self.nodes[j] for j in self.predecessor_ids(i).tolist()]
+
+    def in_degrees(self) -> np.ndarray:
+        return np.diff(self.rev_indptr)
+
+    def edges(self) -> Iterable[Tuple[str, str]]:
+        src = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        for i, j in zip(src.tolist(), self.indices.tolist()):
+            yield self.nodes[i], self.nodes[j]
+
+    # ── Traversals ────────────────────────────────────────────
+
+    def reachable_mask(self, sources: Iterable[str], reverse: bool = False) -> np.ndarray:
+        """Boolean mask of nodes reachable from any source (sources included)."""
+        indptr, indices = (self.rev_indptr, self.rev_indices) if reverse else (self.indptr, self.indices)
+        visited = np.zeros(len(self.nodes), dtype=bool)
+        frontier = np.array(sorted({self.ids[s] for s in sources if s in self.ids}), dtype=np.int64)
+        visited[frontier] = True
+        while len(frontier):
+            neighbours, _ = self._expand(indptr, indices, frontier)
+            neighbours = np.unique(neighbours)
+            frontier = neighbours[~visited[neighbours]]
+            visited[frontier] = True
+        return visited
+
+    def reachable(self, sources: Iterable[str], reverse: bool = False) -> List[str]:
+        mask = self.reachable_mask(sources, reverse)
+        return [self.nodes[i] for i in np.flatnonzero(mask).tolist()]
+
+    def bfs_parents(self, sources: Iterable[str], reverse: bool = False) -> np.ndarray:
+        """
+        Multi-source BFS tree: parent[i] is the node i was first reached from,
+        -1 for sources, -2 for unreachable nodes.
+        """
+        indptr, indices = (self.rev_indptr, self.rev_indices) if reverse else (self.indptr, self.indices)
+        parent = np.full(len(self.nodes), -2, dtype=np.int64)
+        frontier = np.array(sorted({self.ids[s] for s in sources if s in self.ids}), dtype=np.int64)
+        parent[frontier] = -1
+        while len(frontier):
+            neighbours, origin = self._expand(indptr, indices, frontier)
+            fresh = parent[neighbours] == -2
+            neighbours, origin = neighbours[fresh], origin[fresh]
+            # First discoverer wins (np.unique returns first occurrence indices)
+            neighbours, first = np.unique(neighbours, return_index=True)
+            parent[neighbours] = origin[first]
+            frontier = neighbours
+        return parent
+
+    def shortest_path(self, source: str, target: str) -> List[str]:
+        """Fewest-hops path from source to target ([] if unreachable)."""
+        if source not in self.ids or target not in self.ids:
+            return []
+        return self.parent_chain(self.bfs_parents([source]), target)
+
+    def parent_chain(self, parent: np.ndarray, target: str) -> List[str]:
+        """Path from the BFS source that reached `target` down to it, from a bfs_parents() array."""
+        j = self.ids.get(target)
+        if j is None or parent[j] == -2:
+            return []
+        path = [j]
+        while parent[path[-1]] >= 0:
+            path.append(int(parent[path[-1]]))
+        return [self.nodes[i] for i in reversed(path)]
+
+    @staticmethod
+    def _expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """All neighbours of a frontier in one gather; returns (neighbours, the frontier node each came from)."""
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        neighbours = indices[offsets + np.arange(total)].astype(np.int64)
+        return neighbours, np.repeat(frontier, counts)
+
+    # ── Snapshots / export ────────────────────────────────────
+
+    def save(self, path: Union[str, Path]):
+        """Write a binary snapshot (.npz, no pickling)."""
+        # Node keys as one NUL-separated UTF-8 blob: a single decode + split on load
+        names = '\0'.join(self.nodes).encode('utf-8')
+        np.savez(
+            path,
+            version=np.array([self.SNAPSHOT_VERSION]),
+            node_count=np.array([len(self.nodes)]),
+            names=np.frombuffer(names, dtype=np.uint8),
+            indptr=self.indptr, indices=self.indices,
+            rev_indptr=self.rev_indptr, rev_indices=self.rev_indices,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["CompactGraph"]:
+        """Load a snapshot written by save(); None if missing or from another version."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"][0]) != cls.SNAPSHOT_VERSION:
+                    return None
+                count = int(data["node_count"][0])
+                nodes = data["names"].tobytes().decode('utf-8').split('\0') if count else []
+                return cls(nodes, data["indptr"], data["indices"], data["rev_indptr"], data["rev_indices"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def to_networkx(self):
+        """Export as a networkx.DiGraph (NetworkX is only needed for this)."""
+        import networkx as nx
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_edges_from(self.edges())
+        return graph
@@ -0,0 +1,133 @@
+"""
+Entry Points
+Which functions count as roots for reachability-based dead-code analysis.
+"""
+
+import json
+import re
+from fnmatch import fnmatchcase, translate
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+class PatternSet:
+    """
+    Names matched against many glob patterns at once. Plain names go into a set,
+    `prefix*` / `*suffix` globs into sets probed once per distinct pattern length,
+    and only the remaining globs are compiled into a single regex, so thousands of
+    patterns cost little more per lookup than a handful.
+    """
+
+    WILDCARDS = "*?["
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.exact = set()
+        self.prefixes = set()
+        self.suffixes = set()
+        self.globs: List[str] = []
+        self._regex = None
+        self.update(patterns)
+
+    def update(self, patterns: Iterable[str]):
+        for pattern in patterns:
+            body = pattern.strip('*')
+            if not any(ch in pattern for ch in self.WILDCARDS):
+                self.exact.add(pattern)
+            elif not any(ch in body for ch in self.WILDCARDS) and body and pattern.count('*') == 1:
+                (self.prefixes if pattern.endswith('*') else self.suffixes).add(body)
+            else:
+                self.globs.append(pattern)
+        self._prefix_lengths = sorted({len(p) for p in self.prefixes})
+        self._suffix_lengths = sorted({len(p) for p in self.suffixes})
+        self._regex = re.compile("|".join(translate(p) for p in self.globs)) if self.globs else None
+
+    def match(self, name: str) -> bool:
+        if name in self.exact:
+            return True
+        if any(name[:n] in self.prefixes for n in self._prefix_lengths if n <= len(name)):
+            return True
+        if any(name[-n:] in self.suffixes for n in self._suffix_lengths if n <= len(name)):
+            return True
+        return self._regex is not None and self._regex.match(name) is not None
+
+    def __bool__(self):
+        return bool(self.exact or self.prefixes or self.suffixes or self.globs)
+
+class EntryPoints:
+    """
+    Root selection for reachability analysis. A function is an entry point if its
+    name, qualified name or one of its decorators matches, or it lives in a
+    matching file.
+
+    Patterns given as one string (CLI / config "entry_points" list):
+      `main`, `test_*`        bare function name
+      `cli.*`, `app.App.run`  qualified name (anything containing a dot)
+      `@route`, `@*.command`  decorator (only its last dotted part is recorded)
+    """
+
+    # Called by the interpreter, test runners or frameworks rather than by project code
+    DEFAULT_NAMES = ["main", "test_*", "*_test", "__*__"]
+    DEFAULT_DECORATORS = ["*"]
+
+    def __init__(self, names: Iterable[str] = (), qualified: Iterable[str] = (),
+                 decorators: Iterable[str] = (), files: Iterable[str] = (), defaults: bool = True):
+        self.names = PatternSet(names)
+        self.qualified = PatternSet(qualified)
+        self.decorators = PatternSet(d.rsplit('.', 1)[-1] for d in decorators)
+        self.files = list(files)
+        if defaults:
+            self.names.update(self.DEFAULT_NAMES)
+            self.decorators.update(self.DEFAULT_DECORATORS)
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str], defaults: bool = True) -> "EntryPoints":
+        entry_points = cls(defaults=defaults)
+        entry_points.add(patterns)
+        return entry_points
+
+    @classmethod
+    def load(cls, path: Path, extra_patterns: Iterable[str] = ()) -> "EntryPoints":
+        """
+        Read a JSON config:
+          {"entry_points": ["main", "@route", "cli.*"],
+           "names": [...], "qualified": [...], "decorators": [...],
+           "files": ["*/scripts/*"], "defaults": true}
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        entry_points = cls(
+            names=config.get("names", []),
+            qualified=config.get("qualified", []),
+            decorators=config.get("decorators", []),
+            files=config.get("files", []),
+            defaults=config.get("defaults", True),
+        )
+        entry_points.add(config.get("entry_points", []))
+        entry_points.add(extra_patterns)
+        return entry_points
+
+    def add(self, patterns: Iterable[str]):
+        names, qualified, decorators = [], [], []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+            if pattern.startswith('@'):
+                decorators.append(pattern[1:].rsplit('.', 1)[-1])
+            elif '.' in pattern:
+                qualified.append(pattern)
+            else:
+                names.append(pattern)
+        self.names.update(names)
+        self.qualified.update(qualified)
+        self.decorators.update(decorators)
+
+    def matches(self, name: str, qualified_name: str, decorators: Iterable[str] = (),
+                file_path: Optional[Path] = None) -> bool:
+        if self.names.match(name) or self.qualified.match(qualified_name):
+            return True
+        if self.decorators and any(self.decorators.match(d) for d in decorators):
+            return True
+        if self.files and file_path is not None:
+            posix = Path(file_path).as_posix()
+            return any(fnmatchcase(posix, pattern) for pattern in self.files)
+        return False
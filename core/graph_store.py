@@ -0,0 +1,224 @@
+"""
+Graph Store
+Persists symbols, call edges, file dependencies and findings to an indexed
+SQLite database so "who calls X" / "how does A reach B" can be answered
+after a run without re-analyzing the project.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, digest TEXT
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    file_id INTEGER NOT NULL, qualified_name TEXT NOT NULL, name TEXT NOT NULL,
+    kind TEXT, parent TEXT, line INTEGER, signature TEXT
+);
+CREATE TABLE IF NOT EXISTS calls (file_id INTEGER NOT NULL, caller TEXT NOT NULL, callee TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS file_deps (file_id INTEGER NOT NULL, target TEXT NOT NULL, kind TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS findings (
+    file_id INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT, line INTEGER, detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_qname ON symbols(qualified_name);
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols(file_id);
+CREATE INDEX IF NOT EXISTS idx_calls_caller ON calls(caller);
+CREATE INDEX IF NOT EXISTS idx_calls_callee ON calls(callee);
+CREATE INDEX IF NOT EXISTS idx_calls_file ON calls(file_id);
+CREATE INDEX IF NOT EXISTS idx_file_deps_file ON file_deps(file_id);
+CREATE INDEX IF NOT EXISTS idx_file_deps_target ON file_deps(target);
+CREATE INDEX IF NOT EXISTS idx_findings_file ON findings(file_id);
+"""
+
+class GraphStore:
+    """
+    SQLite-backed code graph, one row set per source file.
+
+    sync() takes per-file records (see StructuralAnalyzer.graph_records) and
+    only rewrites files whose records changed since the last sync (compared by
+    digest), so re-syncing after an edit touches a handful of rows.
+    Symbols are referenced by qualified name, files by path.
+    """
+
+    SCHEMA_VERSION = "1"
+    TABLES = ("symbols", "calls", "file_deps", "findings")
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Writing ───────────────────────────────────────────────
+
+    def sync(self, records: Dict[str, Dict[str, list]]) -> Dict[str, int]:
+        """
+        Make the store match `records` (file path -> {"symbols", "calls", "file_deps",
+        "findings"} row lists). Returns counts of written / unchanged / removed files.
+        """
+        stats = {"written": 0, "unchanged": 0, "removed": 0}
+        existing = {path: (file_id, digest) for file_id, path, digest in
+                    self.conn.execute("SELECT id, path, digest FROM files")}
+        with self.conn:
+            for path in set(existing) - set(records):
+                self._delete_rows(existing[path][0])
+                self.conn.execute("DELETE FROM files WHERE id = ?", (existing[path][0],))
+                stats["removed"] += 1
+
+            for path, record in records.items():
+                digest = hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+                if path in existing:
+                    file_id, old_digest = existing[path]
+                    if old_digest == digest:
+                        stats["unchanged"] += 1
+                        continue
+                    self._delete_rows(file_id)
+                    self.conn.execute("UPDATE files SET digest = ? WHERE id = ?", (digest, file_id))
+                else:
+                    file_id = self.conn.execute(
+                        "INSERT INTO files (path, digest) VALUES (?, ?)", (path, digest)).lastrowid
+                self._insert_rows(file_id, record)
+                stats["written"] += 1
+        return stats
+
+    def _insert_rows(self, file_id: int, record: Dict[str, list]):
+        self.conn.executemany(
+            "INSERT INTO symbols (file_id, qualified_name, name, kind, parent, line, signature) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(file_id, *row) for row in record.get("symbols", [])])
+        self.conn.executemany(
+            "INSERT INTO calls (file_id, caller, callee) VALUES (?, ?, ?)",
+            [(file_id, *row) for row in record.get("calls", [])])
+        self.conn.executemany(
+            "INSERT INTO file_deps (file_id, target, kind) VALUES (?, ?, ?)",
+            [(file_id, *row) for row in record.get("file_deps", [])])
+        self.conn.executemany(
+            "INSERT INTO findings (file_id, kind, name, line, detail) VALUES (?, ?, ?, ?, ?)",
+            [(file_id, *row) for row in record.get("findings", [])])
+
+    def _delete_rows(self, file_id: int):
+        for table in self.TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+
+    def _ensure_schema(self):
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is not None and row[0] != self.SCHEMA_VERSION:
+            with self.conn:
+                for table in ("meta", "files") + self.TABLES:
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (self.SCHEMA_VERSION,))
+
+    # ── Queries ───────────────────────────────────────────────
+
+    def find_symbols(self, name: str) -> List[Dict[str, Any]]:
+        """Functions/classes matching a qualified name, a dotted suffix of one (`Class.method`) or a bare name."""
+        rows = self.conn.execute(
+            "SELECT s.qualified_name, s.name, s.kind, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+            "WHERE s.qualified_name = ? ORDER BY f.path, s.line", (name,)).fetchall()
+        if not rows:
+            bare = name.rsplit('.', 1)[-1]
+            rows = [r for r in self.conn.execute(
+                "SELECT s.qualified_name, s.name, s.kind, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+                "WHERE s.name = ? ORDER BY f.path, s.line", (bare,))
+                if r[0] == name or r[0].endswith('.' + name)]
+        return [dict(zip(("qualified_name", "name", "kind", "file", "line"), r)) for r in rows]
+
+    def callers(self, qualified_name: str) -> List[Dict[str, Any]]:
+        return self._neighbours("SELECT DISTINCT c.caller FROM calls c WHERE c.callee = ?", qualified_name)
+
+    def callees(self, qualified_name: str) -> List[Dict[str, Any]]:
+        return self._neighbours("SELECT DISTINCT c.callee FROM calls c WHERE c.caller = ?", qualified_name)
+
+    def _neighbours(self, query: str, qualified_name: str) -> List[Dict[str, Any]]:
+        names = [r[0] for r in self.conn.execute(query, (qualified_name,))]
+        result = []
+        for name in sorted(names):
+            location = self._location(name)
+            result.append({"qualified_name": name, "file": location[0], "line": location[1]})
+        return result
+
+    def _location(self, qualified_name: str) -> Tuple[Optional[str], Optional[int]]:
+        row = self.conn.execute(
+            "SELECT f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id WHERE s.qualified_name = ? LIMIT 1",
+            (qualified_name,)).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def chain(self, source: str, target: str, max_depth: int = 50) -> List[str]:
+        """Shortest call chain source -> target (BFS, one indexed query per level); [] if none."""
+        if source == target:
+            return [source]
+        parent = {source: None}
+        frontier = [source]
+        for _ in range(max_depth):
+            if not frontier:
+                break
+            next_frontier = []
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(frontier), 500):
+                batch = frontier[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT caller, callee FROM calls WHERE caller IN ({','.join('?' * len(batch))}) ORDER BY caller, callee",
+                    batch)
+                for caller, callee in rows:
+                    if callee in parent:
+                        continue
+                    parent[callee] = caller
+                    if callee == target:
+                        path = [callee]
+                        while parent[path[-1]] is not None:
+                            path.append(parent[path[-1]])
+                        return path[::-1]
+                    next_frontier.append(callee)
+            frontier = next_frontier
+        return []
+
+    def resolve_file(self, path: str) -> List[str]:
+        """Stored file paths equal to `path` or ending with it (`pkg/mod.py`)."""
+        rows = self.conn.execute("SELECT path FROM files WHERE path = ?", (path,)).fetchall()
+        if not rows:
+            suffix = path.replace('\\', '/')
+            if suffix.startswith('./'):
+                suffix = suffix[2:]
+            rows = [r for r in self.conn.execute("SELECT path FROM files ORDER BY path")
+                    if r[0].replace('\\', '/').endswith('/' + suffix) or r[0] == suffix]
+        return [r[0] for r in rows]
+
+    def file_deps(self, path: str, reverse: bool = False) -> List[Tuple[str, str]]:
+        """(file, kind) pairs this file depends on, or with `reverse` the files depending on it."""
+        if reverse:
+            query = ("SELECT DISTINCT f.path, d.kind FROM file_deps d JOIN files f ON f.id = d.file_id "
+                     "WHERE d.target = ? ORDER BY f.path, d.kind")
+        else:
+            query = ("SELECT DISTINCT d.target, d.kind FROM file_deps d JOIN files f ON f.id = d.file_id "
+                     "WHERE f.path = ? ORDER BY d.target, d.kind")
+        return [tuple(r) for r in self.conn.execute(query, (path,))]
+
+    def findings(self, kind: str = None) -> List[Dict[str, Any]]:
+        query = "SELECT f.path, x.kind, x.name, x.line, x.detail FROM findings x JOIN files f ON f.id = x.file_id"
+        args = ()
+        if kind:
+            query += " WHERE x.kind = ?"
+            args = (kind,)
+        rows = self.conn.execute(query + " ORDER BY f.path, x.line", args)
+        return [dict(zip(("file", "kind", "name", "line", "detail"), r)) for r in rows]
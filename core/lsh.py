@@ -0,0 +1,114 @@
+"""
+MinHash LSH
+Candidate generation for near-duplicate detection over token count vectors.
+
+Each item becomes a set of integer features and a MinHash signature (one
+minimum per hash function, so two signatures agree in a given position with
+probability equal to the Jaccard similarity of the sets). Signatures are cut
+into bands; items sharing a band bucket become candidate pairs. The cost is
+linear in the number of items plus the pairs that actually collide, instead of
+comparing every pair.
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+_PRIME = (1 << 31) - 1  # Mersenne prime for the universal hash family a*x + b mod p
+_OCCURRENCE_BITS = 20   # multiset_items: column << bits | occurrence
+
+
+def multiset_items(counts: np.ndarray) -> np.ndarray:
+    """
+    Distinct integer features of a count vector: column c with count k becomes
+    (c, 0) .. (c, k - 1), so the Jaccard index of two feature sets equals the
+    weighted Jaccard sum(min) / sum(max) of the counts.
+    """
+    columns = np.flatnonzero(counts)
+    repeats = counts[columns].astype(np.int64)
+    if not len(repeats):
+        return np.empty(0, dtype=np.uint64)
+    occurrence = np.arange(int(repeats.sum())) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    return ((np.repeat(columns, repeats) << _OCCURRENCE_BITS) + occurrence).astype(np.uint64)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures + banded LSH index.
+
+    `bands * rows` hash functions; a pair with Jaccard similarity s collides in at
+    least one band with probability 1 - (1 - s**rows)**bands. for_threshold() picks
+    the bands so that pairs at a given similarity are found with a given recall.
+    Hashes are seeded, so results are the same in every process.
+    """
+
+    def __init__(self, bands: int = 32, rows: int = 4, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.RandomState(seed)
+        num_perm = bands * rows
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    @classmethod
+    def for_threshold(cls, threshold: float, rows: int = 3, recall: float = 0.95, seed: int = 1) -> "MinHashLSH":
+        """Fewest bands of `rows` hashes that make pairs at `threshold` candidates with probability >= `recall`."""
+        hit = threshold ** rows
+        if hit >= 1.0:
+            return cls(1, rows, seed)
+        bands = math.ceil(math.log(1.0 - recall) / math.log(1.0 - hit))
+        return cls(max(1, bands), rows, seed)
+
+    def collision_probability(self, similarity: float) -> float:
+        """Chance that a pair with this Jaccard similarity becomes a candidate."""
+        return 1.0 - (1.0 - similarity ** self.rows) ** self.bands
+
+    def signature(self, items: np.ndarray) -> Optional[np.ndarray]:
+        """MinHash signature of a set of integer features (None for an empty set)."""
+        hashes = np.unique(np.asarray(items, dtype=np.uint64)) % np.uint64(_PRIME)
+        if not len(hashes):
+            return None
+        # (num_perm, n_items) permuted hashes; a, x < 2**31 so a*x + b stays below 2**63
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(_PRIME)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def candidate_pairs(self, signatures: List[Optional[np.ndarray]]) -> np.ndarray:
+        """(m, 2) index pairs (i < j, sorted) that share at least one band; None signatures never match."""
+        present = np.array([i for i, sig in enumerate(signatures) if sig is not None], dtype=np.int64)
+        if len(present) < 2:
+            return np.empty((0, 2), dtype=np.int64)
+        matrix = np.stack([signatures[i] for i in present]).astype(np.uint64)
+        n = len(signatures)
+        found = np.empty(0, dtype=np.int64)  # sorted, distinct pair keys i * n + j
+        pending: List[np.ndarray] = []
+        pending_size = 0
+        for band in range(self.bands):
+            block = matrix[:, band * self.rows:(band + 1) * self.rows]
+            # Bucket ID per item: which distinct combination of the band's values it has
+            _, keys = np.unique(block, axis=0, return_inverse=True)
+            keys = keys.ravel()
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            # Pair every member with each later member of its bucket
+            later = np.repeat(ends, ends - starts) - np.arange(len(order)) - 1
+            total = int(later.sum())
+            if not total:
+                continue
+            left = np.repeat(np.arange(len(order)), later)
+            right = left + 1 + np.arange(total) - np.repeat(np.cumsum(later) - later, later)
+            i, j = present[order[left]], present[order[right]]
+            pending.append(np.minimum(i, j) * n + np.maximum(i, j))
+            pending_size += total
+            if pending_size > 2 * len(found) + (1 << 22):
+                found, pending, pending_size = _distinct([found] + pending), [], 0
+        found = _distinct([found] + pending)
+        return np.stack([found // n, found % n], axis=1)
+
+
+def _distinct(chunks: List[np.ndarray]) -> np.ndarray:
+    """Sorted distinct values of several integer arrays (sort-based; no hashing)."""
+    keys = np.sort(np.concatenate(chunks))
+    return keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
@@ -0,0 +1,137 @@
+"""
+Analysis Manifest
+Per-file record of the previous run (content hash → parse results, findings,
+dependencies) used by incremental analysis to skip unchanged files.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Set
+from core.ast_parser import PARSER_VERSION
+from core.source_store import SourceStore
+
+class AnalysisManifest:
+    """
+    Tracks which files changed since the last run.
+
+    Each entry holds the file's size/mtime (fast unchanged check), content
+    hash, and whatever per-file results the phases stored for it (e.g.
+    "syntax", "data", "unused", "deps"). A file whose content changed, and
+    every file that (transitively) depends on it through the recorded "deps"
+    edges, is *dirty* and must be re-analyzed; everything else can be
+    served from the manifest.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Path, source_store: SourceStore = None):
+        self.path = Path(path)
+        self.sources = source_store or SourceStore()
+        self._previous: Dict[str, Dict[str, Any]] = self._load()
+        self._current: Dict[str, Dict[str, Any]] = {}
+        self._changed: Set[str] = set()
+        self.dirty: Set[str] = set()
+
+    def check(self, file_path: Path) -> bool:
+        """
+        Record the file's current state. Returns True if its content is unchanged
+        since the last run (previous results are then carried over).
+        """
+        key = str(file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            self._changed.add(key)
+            return False
+
+        prev = self._previous.get(key)
+        if prev and prev.get("size") == st.st_size and prev.get("mtime") == st.st_mtime_ns:
+            self._current[key] = dict(prev)
+            return True
+
+        try:
+            digest = hashlib.sha256(self.sources.read_bytes(file_path)).hexdigest()
+        except OSError:
+            digest = None
+
+        if prev and digest is not None and prev.get("hash") == digest:
+            entry = dict(prev)
+        else:
+            entry = {"hash": digest}
+            self._changed.add(key)
+        entry["size"] = st.st_size
+        entry["mtime"] = st.st_mtime_ns
+        self._current[key] = entry
+        return key not in self._changed
+
+    def finalize_scan(self, files: Iterable[Path]) -> Set[str]:
+        """
+        Call once every scanned file went through check(). Computes the dirty set:
+        changed/new files plus everything depending on a changed or removed file.
+        """
+        for f in files:
+            if str(f) not in self._current:
+                self.check(f)
+
+        removed = set(self._previous) - set(self._current)
+
+        dependents: Dict[str, Set[str]] = {}
+        for path, entry in self._previous.items():
+            for dep in entry.get("deps", ()):
+                dependents.setdefault(dep, set()).add(path)
+
+        dirty = set(self._changed)
+        stack = list(self._changed | removed)
+        while stack:
+            for user in dependents.get(stack.pop(), ()):
+                if user not in dirty and user in self._current:
+                    dirty.add(user)
+                    stack.append(user)
+
+        self.dirty = dirty
+        return dirty
+
+    def is_clean(self, file_path: Path) -> bool:
+        key = str(file_path)
+        return key in self._current and key not in self.dirty
+
+    def get(self, file_path: Path, field: str, default: Any = None) -> Any:
+        entry = self._current.get(str(file_path))
+        return entry.get(field, default) if entry else default
+
+    def set(self, file_path: Path, field: str, value: Any):
+        self._current.setdefault(str(file_path), {})[field] = value
+
+    def forget(self, file_path: Path):
+        """Drop a file's results (e.g. it was edited during this run); it is re-checked on the next run."""
+        self._current.pop(str(file_path), None)
+
+    def save(self):
+        payload = {
+            "format": self.FORMAT_VERSION,
+            "python": list(sys.version_info[:2]),
+            "parser": PARSER_VERSION,
+            "entries": self._current,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(marshal.dumps(payload), 1))
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'rb') as f:
+                payload = marshal.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            return {}
+        if (not isinstance(payload, dict)
+                or payload.get("format") != self.FORMAT_VERSION
+                or payload.get("python") != list(sys.version_info[:2])
+                or payload.get("parser") != PARSER_VERSION):
+            return {}
+        return payload.get("entries", {})
@@ -0,0 +1,126 @@
+"""
+Module Index
+Maps Python module names to the scanned files that define them, so import
+statements resolve to files in O(1) instead of comparing against every file.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+class ModuleIndex:
+    """
+    Dotted module name -> file, built once per run.
+
+    A file is registered under its full dotted path from its import roots only:
+    the directory above its outermost package (the longest chain of
+    `__init__.py` directories, so `src/pkg/sub/mod.py` is `pkg.sub.mod`) and the
+    common root of the scanned files (which covers namespace packages). Bare
+    names in a plain directory resolve to siblings of the importing file, the
+    way a script's directory is on sys.path, so `import json` never lands on an
+    unrelated `other/json.py`. Packages map to their `__init__.py`. When several
+    files share a name, the one closest to the importing file wins. Relative
+    imports are resolved against the importing file's directory.
+    """
+
+    def __init__(self, files: Iterable[Path]):
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_path: Dict[str, str] = {}  # module path without extension -> file
+        self._packages: Set[str] = set()  # directories with an __init__.py
+
+        py_files = [Path(f) for f in files if Path(f).suffix == '.py']
+        if not py_files:
+            return
+        scan_root = Path(os.path.commonpath([str(f.parent) for f in py_files]))
+        self._packages = {str(f.parent) for f in py_files if f.name == '__init__.py'}
+
+        for f in py_files:
+            if f.stem == '__init__':
+                self._by_path[str(f.parent)] = str(f)
+            else:
+                self._by_path[str(f.with_suffix(''))] = str(f)
+
+            package_root = f.parent
+            while str(package_root) in self._packages:
+                package_root = package_root.parent
+            roots = set()
+            if str(scan_root) not in self._packages:
+                roots.add(scan_root)  # inside a package, names relative to the scan root are not importable
+            if package_root != f.parent:
+                roots.add(package_root)
+            for root in roots:
+                try:
+                    parts = list(f.relative_to(root).with_suffix('').parts)
+                except ValueError:
+                    continue
+                if parts[-1] == '__init__':
+                    parts.pop()
+                if parts:
+                    self._by_name.setdefault('.'.join(parts), []).append(str(f))
+
+    def resolve_import(self, imp: dict, importer: Path) -> List[str]:
+        """
+        Files an import entry (parser output: module / names / level) depends on.
+        `import a.b` -> a/b; `from a import b` -> a/b if it is a module, else a;
+        `from . import b` / `from .a import b` -> relative to the importer.
+        """
+        module = imp.get("module")
+        names = imp.get("names", [])
+        level = imp.get("level", 0)
+
+        if level:
+            base = Path(importer).parent
+            for _ in range(level - 1):
+                base = base.parent
+            if module:
+                base = base.joinpath(*module.split('.'))
+            targets = [self._by_path.get(str(base / name)) for name in names if name != '*']
+            targets = [t for t in targets if t]
+            if not targets:
+                package = self._by_path.get(str(base))
+                targets = [package] if package else []
+            return targets
+
+        if module:
+            targets = [self.resolve(f"{module}.{name}", importer) for name in names if name != '*']
+            targets = [t for t in targets if t]
+            if not targets:
+                package = self.resolve(module, importer)
+                targets = [package] if package else []
+            return targets
+
+        # `import a.b.c` — fall back to the deepest package that is part of the project
+        targets = []
+        for name in names:
+            parts = name.split('.')
+            for end in range(len(parts), 0, -1):
+                target = self.resolve('.'.join(parts[:end]), importer)
+                if target:
+                    targets.append(target)
+                    break
+        return targets
+
+    def resolve(self, dotted_name: str, importer: Path = None) -> Optional[str]:
+        """The file for a dotted module name (closest to `importer` when ambiguous)."""
+        if importer is not None and str(Path(importer).parent) not in self._packages:
+            # Script-style import of a module next to the importer
+            sibling = self._by_path.get(str(Path(importer).parent.joinpath(*dotted_name.split('.'))))
+            if sibling:
+                return sibling
+        candidates = self._by_name.get(dotted_name)
+        if not candidates:
+            return None
+        if len(candidates) == 1 or importer is None:
+            return candidates[0]
+
+        importer_parts = Path(importer).parent.parts
+        def closeness(candidate: str):
+            parts = Path(candidate).parent.parts
+            shared = 0
+            for a, b in zip(parts, importer_parts):
+                if a != b:
+                    break
+                shared += 1
+            # Most shared directories first, then the shallowest path (nearest the root)
+            return (-shared, len(parts), candidate)
+        return min(candidates, key=closeness)
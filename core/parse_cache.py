@@ -0,0 +1,128 @@
+"""
+Parse Cache
+Content-addressed on-disk cache for parser output, with size-bounded LRU eviction.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+class ParseCache:
+    """
+    Stores parser results keyed by (content hash, language, parser version).
+
+    Entries are marshal-encoded and zlib-compressed, one file per entry under
+    a two-level fan-out directory. Recency is persisted through file mtimes so
+    the LRU order survives between runs.
+    """
+
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, least recent first
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(content: Union[str, bytes], language: str, version: str) -> str:
+        """Build a cache key. Python's version is included since both ast and marshal depend on it."""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        h = hashlib.sha256()
+        h.update(f"{version}\0{language}\0{sys.version_info[0]}.{sys.version_info[1]}\0".encode())
+        h.update(content)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = marshal.loads(zlib.decompress(f.read()))
+            os.utime(path)
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store value under key, evicting least recently used entries if over budget."""
+        try:
+            blob = zlib.compress(marshal.dumps(value), 1)
+        except ValueError:
+            return  # Not marshalable — skip caching
+
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        if key in self._entries:
+            self._total_bytes -= self._entries.pop(key)
+        self._entries[key] = len(blob)
+        self._total_bytes += len(blob)
+        self._evict()
+
+    def clear(self):
+        """Remove every entry."""
+        for key in list(self._entries):
+            self._drop(key)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def _load_index(self):
+        """Scan the cache directory and order entries by last use."""
+        found = []
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime, entry.name, st.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _drop(self, key: str):
+        size = self._entries.pop(key, 0)
+        self._total_bytes -= size
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
@@ -1,33 +1,214 @@
 """
 File Scanner
 Recursively discovers code files.
+
+Honours .gitignore files (via pathspec) plus extra include/exclude globs, and
+streams results so downstream phases can start before the walk finishes.
 """
 
 import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pathspec
+
+# (directory the .gitignore lives in, relative to root with trailing '/' or '', compiled spec)
+_IgnoreSpecs = Tuple[Tuple[str, pathspec.GitIgnoreSpec], ...]
 
 class FileScanner:
-    def __init__(self, root_path: Path):
+    DEFAULT_IGNORE_DIRS = {
+        '.git', 'node_modules', '__pycache__', 'venv', '.venv',
+        'build', 'dist', '.tox', '.mypy_cache', '.pytest_cache',
+        'target', 'bin', 'obj', '.code_analyzer'
+    }
+
+    def __init__(
+        self,
+        root_path: Path,
+        include: Iterable[str] = None,
+        exclude: Iterable[str] = None,
+        use_gitignore: bool = True,
+        threads: int = 1
+    ):
         self.root_path = root_path
         self.extensions = {'.py', '.c', '.cpp', '.cc', '.h', '.hpp', '.java'}
-        self.ignore_dirs = {
-            '.git', 'node_modules', '__pycache__', 'venv', '.venv',
-            'build', 'dist', '.tox', '.mypy_cache', '.pytest_cache',
-            'target', 'bin', 'obj'
-        }
-    
+        self.ignore_dirs = set(self.DEFAULT_IGNORE_DIRS)
+        self.use_gitignore = use_gitignore
+        self.threads = max(1, threads)
+        include = list(include or [])
+        exclude = list(exclude or [])
+        self.include_spec = pathspec.GitIgnoreSpec.from_lines(include) if include else None
+        self.exclude_spec = pathspec.GitIgnoreSpec.from_lines(exclude) if exclude else None
+
     def scan(self) -> List[Path]:
         """Scan for code files."""
-        code_files = []
-        
-        for root, dirs, files in os.walk(self.root_path):
-            # Skip common ignored directories
-            dirs[:] = [d for d in dirs if d not in self.ignore_dirs]
-            
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix in self.extensions:
-                    code_files.append(file_path)
-        
-        return code_files
+        return list(self.iter_files())
+
+    def iter_files(self) -> Iterator[Path]:
+        """
+        Walk the tree with os.scandir, yielding code files as they are found.
+        With threads > 1, directory listings are prefetched in a thread pool
+        (useful on network filesystems); yield order is the same either way.
+        """
+        root = str(self.root_path)
+        if self.threads == 1:
+            stack = [(root, '', ())]
+            while stack:
+                files, subdirs = self._list_dir(*stack.pop())
+                yield from files
+                stack.extend(reversed(subdirs))
+            return
+
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            stack = [pool.submit(self._list_dir, root, '', ())]
+            while stack:
+                files, subdirs = stack.pop().result()
+                yield from files
+                # Prefetch every child listing now; consume them depth-first
+                stack.extend(reversed([pool.submit(self._list_dir, *sub) for sub in subdirs]))
+
+    def iter_git_files(self) -> Optional[Iterator[Path]]:
+        """
+        Fast path: list files with `git ls-files` (tracked + untracked, minus ignored).
+        Returns None if the root is not inside a git work tree.
+        """
+        try:
+            proc = subprocess.Popen(
+                ['git', '-C', str(self.root_path), 'ls-files', '-z',
+                 '--cached', '--others', '--exclude-standard'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            return None
+
+        # Peek at the first chunk so a non-repo is reported up front
+        first = proc.stdout.read1(65536)
+        if not first and proc.wait() != 0:
+            return None
+        return self._iter_git_output(proc, first)
+
+    def iter_file_list(self, source: Union[IO[str], str, Path]) -> Iterator[Path]:
+        """
+        Yield code files from a newline- or NUL-separated list: an open stream
+        (e.g. stdin) or the path of a list file, which is closed once read.
+        """
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', encoding='utf-8') as stream:
+                yield from self.iter_file_list(stream)
+            return
+        stream = source
+        pending = ''
+        for chunk in iter(lambda: stream.read(65536), ''):
+            pending += chunk
+            sep = '\0' if '\0' in pending else '\n'
+            *complete, pending = pending.split(sep)
+            for name in complete:
+                path = self._accept_listed(name.strip())
+                if path:
+                    yield path
+        path = self._accept_listed(pending.strip().strip('\0'))
+        if path:
+            yield path
+
+    def _iter_git_output(self, proc: subprocess.Popen, first: bytes) -> Iterator[Path]:
+        pending = first
+        try:
+            while True:
+                *complete, pending = pending.split(b'\0')
+                for raw in complete:
+                    path = self._accept_listed(os.fsdecode(raw))
+                    if path:
+                        yield path
+                chunk = proc.stdout.read(65536)
+                if not chunk:
+                    break
+                pending += chunk
+        finally:
+            proc.stdout.close()
+            proc.wait()
+
+    def _accept_listed(self, name: str) -> Optional[Path]:
+        """Apply extension / ignore-dir / include / exclude filters to an externally listed path."""
+        if not name:
+            return None
+        path = Path(name)
+        if not path.is_absolute():
+            candidate = self.root_path / path
+            path = candidate if candidate.exists() else path
+        if path.suffix not in self.extensions or not path.is_file():
+            return None
+        try:
+            rel = path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            rel = path.as_posix()
+        if any(part in self.ignore_dirs for part in Path(rel).parts[:-1]):
+            return None
+        if not self._wanted_file(rel):
+            return None
+        return path
+
+    def _list_dir(self, dir_path: str, rel_dir: str, specs: _IgnoreSpecs):
+        """
+        List one directory. Returns (code files, subdirectories to visit), where each
+        subdirectory carries the .gitignore specs that apply to it.
+        """
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            return [], []
+
+        if self.use_gitignore and any(e.name == '.gitignore' and e.is_file() for e in entries):
+            spec = self._load_gitignore(os.path.join(dir_path, '.gitignore'))
+            if spec is not None:
+                specs = specs + ((rel_dir, spec),)
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            rel = rel_dir + entry.name
+            try:
+                is_dir = entry.is_dir()
+                is_link = is_dir and entry.is_symlink()
+            except OSError:
+                continue
+            if is_dir:
+                # Skip common ignored directories (and, like os.walk, don't follow symlinked ones)
+                if entry.name in self.ignore_dirs or is_link:
+                    continue
+                if self._ignored(rel + '/', specs):
+                    continue
+                if self.exclude_spec and self.exclude_spec.match_file(rel + '/'):
+                    continue
+                subdirs.append((entry.path, rel + '/', specs))
+            elif os.path.splitext(entry.name)[1] in self.extensions:
+                if self._ignored(rel, specs) or not self._wanted_file(rel):
+                    continue
+                files.append(Path(entry.path))
+        return files, subdirs
+
+    def _wanted_file(self, rel: str) -> bool:
+        if self.exclude_spec and self.exclude_spec.match_file(rel):
+            return False
+        if self.include_spec and not self.include_spec.match_file(rel):
+            return False
+        return True
+
+    @staticmethod
+    def _ignored(rel: str, specs: _IgnoreSpecs) -> bool:
+        """Deepest .gitignore with a matching pattern decides (so nested negations work)."""
+        for base, spec in reversed(specs):
+            result = spec.check_file(rel[len(base):])
+            if result.include is not None:
+                return result.include
+        return False
+
+    @staticmethod
+    def _load_gitignore(path: str) -> Optional[pathspec.GitIgnoreSpec]:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        return pathspec.GitIgnoreSpec.from_lines(lines) if lines else None
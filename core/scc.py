@@ -0,0 +1,148 @@
+"""
+Cycle Engine
+Strongly connected components (iterative Tarjan) plus bounded shortest-cycle
+extraction, for call graphs and file dependency graphs of any size.
+
+Graphs are given in CSR form (the arrays of a CompactGraph): the successors of
+node i are `indices[indptr[i]:indptr[i + 1]]`, nodes are integers 0..n-1.
+"""
+
+from collections import deque
+from typing import Hashable, List, Optional, Sequence
+
+class CycleGroup:
+    """One strongly connected component that contains at least one cycle."""
+
+    def __init__(self, members: List[Hashable], cycles: List[List[Hashable]]):
+        self.members = members  # every node of the SCC, in DFS discovery order
+        self.cycles = cycles    # representative shortest cycles (first node not repeated)
+
+    def __len__(self):
+        return len(self.members)
+
+def _as_list(array) -> List[int]:
+    return array.tolist() if hasattr(array, "tolist") else list(array)
+
+def strongly_connected_components(indptr: Sequence[int], indices: Sequence[int]) -> List[List[int]]:
+    """
+    Tarjan's algorithm without recursion: O(V + E), safe on arbitrarily deep graphs.
+    Components come out in reverse topological order, members in discovery order.
+    """
+    indptr, indices = _as_list(indptr), _as_list(indices)
+    n = len(indptr) - 1
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+
+        while work:
+            node, pos = work[-1]
+            end = indptr[node + 1]
+            descended = False
+            while pos < end:
+                succ = indices[pos]
+                pos += 1
+                if index[succ] == -1:
+                    work[-1] = (node, pos)
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = True
+                    work.append((succ, indptr[succ]))
+                    descended = True
+                    break
+                if on_stack[succ] and index[succ] < lowlink[node]:
+                    lowlink[node] = index[succ]
+            if descended:
+                continue
+
+            # All successors done: close the node
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                component.reverse()
+                components.append(component)
+
+    return components
+
+def find_cycles(indptr: Sequence[int], indices: Sequence[int], max_cycles_per_scc: int = 1,
+                nodes: Optional[Sequence[Hashable]] = None) -> List[CycleGroup]:
+    """
+    Report every cyclic SCC once (size > 1, or a single node with a self-loop),
+    with up to `max_cycles_per_scc` representative shortest cycles each.
+    Linear in the graph size for a fixed `max_cycles_per_scc`. Members and cycles
+    are node IDs, or `nodes[id]` when node keys are given.
+    """
+    indptr, indices = _as_list(indptr), _as_list(indices)
+    groups = []
+    for component in strongly_connected_components(indptr, indices):
+        if len(component) == 1:
+            node = component[0]
+            if node not in indices[indptr[node]:indptr[node + 1]]:
+                continue
+        groups.append(CycleGroup(component, _representative_cycles(indptr, indices, component, max_cycles_per_scc)))
+
+    # Report in node order of each component's first node (stable across runs)
+    groups.sort(key=lambda g: min(g.members))
+    if nodes is not None:
+        for group in groups:
+            group.members = [nodes[i] for i in group.members]
+            group.cycles = [[nodes[i] for i in cycle] for cycle in group.cycles]
+    return groups
+
+def shortest_cycle_through(indptr: Sequence[int], indices: Sequence[int], start: int,
+                           within: Optional[set] = None) -> Optional[List[int]]:
+    """Shortest cycle through `start` (BFS, optionally restricted to a node set)."""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for succ in indices[indptr[node]:indptr[node + 1]]:
+            if succ == start:
+                cycle = [node]
+                while parent[cycle[-1]] is not None:
+                    cycle.append(parent[cycle[-1]])
+                cycle.reverse()
+                return cycle
+            if succ not in parent and (within is None or succ in within):
+                parent[succ] = node
+                queue.append(succ)
+    return None
+
+def _representative_cycles(indptr, indices, component: List[int], limit: int) -> List[List[int]]:
+    if limit <= 0:
+        return []
+    members = set(component)
+    cycles = []
+    covered = set()
+    for start in component:
+        if len(cycles) >= limit:
+            break
+        if start in covered:
+            continue
+        cycle = shortest_cycle_through(indptr, indices, start, members)
+        if cycle:
+            cycles.append(cycle)
+            covered.update(cycle)
+    return cycles
@@ -0,0 +1,99 @@
+"""
+Similarity Engine
+Vectorised structural similarity for many token sequences at once.
+
+Token sequences (AST node types, keywords) are interned to integer arrays and
+turned into count vectors: one column per token type plus hashed columns for
+adjacent token pairs, so the order of operations still counts. Similarities of
+many (i, j) pairs are computed block by block with NumPy instead of one
+interpreted comparison per pair.
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+class TokenVocabulary:
+    """Interns tokens to dense integer IDs 0..n-1 in first-seen order."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def encode(self, tokens: Iterable[str]) -> np.ndarray:
+        ids = self.ids
+        return np.fromiter((ids.setdefault(token, len(ids)) for token in tokens), dtype=np.int32)
+
+
+def count_vectors(token_arrays: Sequence[np.ndarray], vocab_size: int, bigram_buckets: int = 512) -> np.ndarray:
+    """
+    (n, vocab_size + bigram_buckets) float32 matrix: token counts, then counts of
+    adjacent token pairs hashed into `bigram_buckets` columns.
+    """
+    width = vocab_size + bigram_buckets
+    vectors = np.zeros((len(token_arrays), width), dtype=np.float32)
+    for row, tokens in enumerate(token_arrays):
+        if not len(tokens):
+            continue
+        columns = tokens.astype(np.int64)
+        if bigram_buckets and len(tokens) > 1:
+            pairs = vocab_size + (columns[:-1] * vocab_size + columns[1:]) % bigram_buckets
+            columns = np.concatenate([columns, pairs])
+        vectors[row] = np.bincount(columns, minlength=width)
+    return vectors
+
+
+def pair_similarity(vectors: np.ndarray, pairs: np.ndarray, metric: str = "jaccard", block: int = 8192) -> np.ndarray:
+    """
+    Similarity of each (i, j) row pair of `vectors`, `block` pairs at a time.
+
+    "jaccard" is the weighted Jaccard index sum(min) / sum(max) (1.0 only for
+    identical counts, sensitive to size differences); "cosine" compares the
+    direction of the count vectors only.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    result = np.zeros(len(pairs), dtype=np.float64)
+    if metric == "cosine":
+        norms = np.linalg.norm(vectors, axis=1)
+    elif metric != "jaccard":
+        raise ValueError(f"Unknown similarity metric: {metric}")
+
+    for start in range(0, len(pairs), block):
+        left = pairs[start:start + block, 0]
+        right = pairs[start:start + block, 1]
+        a, b = vectors[left], vectors[right]
+        if metric == "jaccard":
+            num = np.minimum(a, b).sum(axis=1)
+            den = np.maximum(a, b).sum(axis=1)
+        else:
+            num = (a * b).sum(axis=1)
+            den = norms[left] * norms[right]
+        result[start:start + block] = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+    return result
+
+
+def cluster_pairs(count: int, pairs: np.ndarray) -> List[List[int]]:
+    """
+    Connected components of an (m, 2) array of index pairs over 0..count-1:
+    sorted member lists (two or more members), ordered by their smallest member.
+    """
+    labels = np.arange(count)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    left, right = pairs[:, 0], pairs[:, 1]
+    while len(pairs):
+        # Each node takes the smallest label across its edges, then labels jump to their label's label
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    order = np.argsort(labels, kind="stable")
+    starts = np.flatnonzero(np.r_[True, labels[order][1:] != labels[order][:-1]])
+    return [group.tolist() for group in np.split(order, starts[1:]) if len(group) > 1]
@@ -0,0 +1,107 @@
+"""
+Source Store
+Per-run file content store: every analyzer reads source through here, so each
+file is read from disk exactly once.
+"""
+
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Union
+
+_NEWLINE = re.compile(rb'\r\n|\r|\n')
+
+def line_starts(data: bytes) -> List[int]:
+    """Byte offset at which each line starts (line N starts at result[N - 1]); built once per file."""
+    starts = [0]
+    starts.extend(m.end() for m in _NEWLINE.finditer(data))
+    return starts
+
+class SourceStore:
+    """
+    Reads each file once and hands out bytes and str views of it.
+
+    Files at or above `mmap_threshold` bytes are memory-mapped instead of
+    copied into the heap. Line endings are normalised to '\\n' (matching
+    text-mode `open()`), so byte offsets into `read_bytes()` always agree
+    with `read_text().encode('utf-8')`.
+    """
+
+    DEFAULT_MMAP_THRESHOLD = 1024 * 1024
+
+    def __init__(self, mmap_threshold: int = DEFAULT_MMAP_THRESHOLD):
+        self.mmap_threshold = mmap_threshold
+        self._bytes: Dict[str, Union[bytes, mmap.mmap]] = {}
+        self._text: Dict[str, str] = {}
+        self._errors: Dict[str, Exception] = {}
+        self.disk_reads = 0
+
+    def read_bytes(self, file_path: Path) -> Union[bytes, mmap.mmap]:
+        """UTF-8 source bytes. Large files come back as a read-only mmap (slicing yields bytes)."""
+        key = str(file_path)
+        data = self._bytes.get(key)
+        if data is None:
+            if key in self._errors:
+                raise self._errors[key]
+            try:
+                data = self._load(key)
+            except OSError as e:
+                self._errors[key] = e
+                raise
+            self._bytes[key] = data
+        return data
+
+    def read_text(self, file_path: Path) -> str:
+        """Decoded source text. Raises UnicodeDecodeError / OSError like open() would."""
+        key = str(file_path)
+        text = self._text.get(key)
+        if text is None:
+            if key in self._errors:
+                raise self._errors[key]
+            data = self.read_bytes(file_path)
+            try:
+                text = str(data[:], 'utf-8') if isinstance(data, mmap.mmap) else data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                self._errors[key] = e
+                raise
+            self._text[key] = text
+        return text
+
+    def segment(self, file_path: Path, start: int, end: int) -> str:
+        """Decode one byte span of a file (e.g. a parser "span"), without decoding the rest."""
+        return self.read_bytes(file_path)[start:end].decode('utf-8', errors='replace')
+
+    def view(self, file_path: Path) -> memoryview:
+        """Zero-copy view over the source bytes."""
+        return memoryview(self.read_bytes(file_path))
+
+    def invalidate(self, file_path: Path):
+        """Forget a file (e.g. after it was edited) so the next read goes to disk."""
+        key = str(file_path)
+        self._text.pop(key, None)
+        self._errors.pop(key, None)
+        data = self._bytes.pop(key, None)
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    def close(self):
+        for key in list(self._bytes):
+            self.invalidate(key)
+
+    def _load(self, key: str) -> Union[bytes, mmap.mmap]:
+        self.disk_reads += 1
+        with open(key, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size and size >= self.mmap_threshold:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if mm.find(b'\r') == -1:
+                    return mm
+                data = mm[:]
+                mm.close()
+            else:
+                data = f.read()
+
+        if b'\r' in data:
+            data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        return data
@@ -4,7 +4,7 @@ Creates a global index of all symbols for cross-file analysis.
 """
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 class SymbolType(Enum):
@@ -14,6 +14,12 @@ class SymbolType(Enum):
     VARIABLE = "variable"
 
 class Symbol:
+    # Slots keep large tables compact (no per-instance __dict__)
+    __slots__ = (
+        "name", "type", "file", "line", "signature", "docstring",
+        "span", "source", "_body_code", "parent_name", "attributes", "qualified_name"
+    )
+
     def __init__(
         self,
         name: str,
@@ -24,7 +30,9 @@ class Symbol:
         docstring: str = "",
         body_code: str = "",
         parent_name: str = "",
-        attributes: List[str] = None
+        attributes: List[str] = None,
+        span: Tuple[int, int] = None,
+        source=None
     ):
         self.name = name
         self.type = symbol_type
@@ -32,11 +40,30 @@ class Symbol:
         self.line = line
         self.signature = signature
         self.docstring = docstring
-        self.body_code = body_code
+        self._body_code = body_code or None
+        # Byte span into the file, read through `source` (a SourceStore) when body_code is asked for
+        self.span = span
+        self.source = source
         self.parent_name = parent_name
         self.attributes = attributes or []
         self.qualified_name = ""  # Set by table builder
 
+    @property
+    def body_code(self) -> str:
+        """Source text of the definition, materialised on access (not kept in memory)."""
+        if self._body_code is not None:
+            return self._body_code
+        if self.span is None or self.source is None:
+            return ""
+        try:
+            return self.source.segment(self.file, self.span[0], self.span[1])
+        except OSError:
+            return ""
+
+    @body_code.setter
+    def body_code(self, value: str):
+        self._body_code = value or None
+
 class SymbolTableBuilder:
     """
     Builds a comprehensive symbol table from parsed files.
@@ -44,6 +71,11 @@ class SymbolTableBuilder:
     
     def __init__(self):
         self.symbols: Dict[str, Symbol] = {}
+        # Secondary indexes (qualified name -> symbol, so entries stay ordered like `symbols`)
+        self._by_name: Dict[str, Dict[str, Symbol]] = {}
+        self._by_file: Dict[Path, Dict[str, Symbol]] = {}
+        self._by_member: Dict[Tuple[str, str], Dict[str, Symbol]] = {}
+        self._by_module: Dict[str, Dict[str, Symbol]] = {}
     
     def add_symbol(self, symbol: Symbol, module_name: str):
         """
@@ -54,15 +86,60 @@ class SymbolTableBuilder:
             symbol.qualified_name = f"{module_name}.{symbol.parent_name}.{symbol.name}"
         else:
             symbol.qualified_name = f"{module_name}.{symbol.name}"
-        self.symbols[symbol.qualified_name] = symbol
+        
+        qname = symbol.qualified_name
+        previous = self.symbols.get(qname)
+        if previous is not None:
+            self._unindex(previous)
+        self.symbols[qname] = symbol
+        self._by_name.setdefault(symbol.name, {})[qname] = symbol
+        self._by_file.setdefault(symbol.file, {})[qname] = symbol
+        self._by_member.setdefault((symbol.parent_name or "", symbol.name), {})[qname] = symbol
+        self._by_module.setdefault(module_name, {})[qname] = symbol
     
     def get_symbol(self, qualified_name: str) -> Symbol:
         return self.symbols.get(qualified_name)
     
     def find_symbols_by_name(self, name: str) -> List[Symbol]:
         """Find all symbols with given name (across modules)."""
-        return [s for qn, s in self.symbols.items() if s.name == name]
+        return list(self._by_name.get(name, {}).values())
     
     def get_symbols_in_file(self, file_path: Path) -> List[Symbol]:
         """Get all symbols defined in a file."""
-        return [s for s in self.symbols.values() if s.file == file_path]
+        return list(self._by_file.get(file_path, {}).values())
+    
+    def get_member(self, parent_name: str, name: str) -> Optional[Symbol]:
+        """Look up a method/attribute by (class name, member name); top-level symbols use parent ''."""
+        members = self._by_member.get((parent_name or "", name))
+        if not members:
+            return None
+        return next(reversed(members.values()))
+    
+    def find_members(self, parent_name: str, name: str) -> List[Symbol]:
+        """All symbols named `name` inside classes called `parent_name` (across modules)."""
+        return list(self._by_member.get((parent_name or "", name), {}).values())
+    
+    def remove_module(self, module_name: str) -> List[Symbol]:
+        """Remove (and return) every symbol registered under a module name."""
+        removed = list(self._by_module.get(module_name, {}).values())
+        for s in removed:
+            del self.symbols[s.qualified_name]
+            self._unindex(s)
+        return removed
+    
+    def _unindex(self, symbol: Symbol):
+        qname = symbol.qualified_name
+        module_name = qname[:-len(symbol.name) - 1]
+        if symbol.parent_name:
+            module_name = module_name[:-len(symbol.parent_name) - 1]
+        for index, key in (
+            (self._by_name, symbol.name),
+            (self._by_file, symbol.file),
+            (self._by_member, (symbol.parent_name or "", symbol.name)),
+            (self._by_module, module_name),
+        ):
+            bucket = index.get(key)
+            if bucket is not None and bucket.get(qname) is symbol:
+                del bucket[qname]
+                if not bucket:
+                    del index[key]
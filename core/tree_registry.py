@@ -0,0 +1,203 @@
+"""
+Tree Registry
+Per-run cache of parsed syntax trees (Python ast.Module / Tree-sitter Tree),
+so each file is parsed once per language and shared by every analyzer — and
+Python trees are walked once for all registered rule-based checks.
+"""
+
+import ast
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+from core.ast_rules import Rule, run_rules
+from core.source_store import SourceStore
+
+try:
+    import tree_sitter_languages
+    TREESITTER_AVAILABLE = True
+except ImportError:
+    TREESITTER_AVAILABLE = False
+
+class _TreeEntry:
+    __slots__ = ("tree", "error", "size", "pending")
+
+    def __init__(self, tree, error, size, pending):
+        self.tree = tree
+        self.error = error
+        self.size = size
+        self.pending = pending
+
+class TreeRegistry:
+    """
+    Shares parsed trees between analyzers.
+
+    Consumers announce themselves with `register_consumer()` and call
+    `release()` when they are done with a file. A tree is dropped as soon as
+    every registered consumer has released it; on top of that, estimated tree
+    memory is capped and least recently used trees are evicted (and re-parsed
+    on demand) when the cap is exceeded.
+
+    Consumers may also register a Rule (see core.ast_rules). The first
+    rule_result() request for a Python file runs every pending consumer's rule
+    in one traversal; the other results wait until collected or released.
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    # Rough in-memory tree size per byte of source
+    SIZE_FACTORS = {"python": 30}
+    DEFAULT_SIZE_FACTOR = 10
+
+    def __init__(self, source_store: SourceStore = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.sources = source_store or SourceStore()
+        self.max_bytes = max_bytes
+        self._consumers: Dict[str, Optional[frozenset]] = {}  # consumer -> languages (None = all)
+        self._entries: "OrderedDict[Tuple[str, str], _TreeEntry]" = OrderedDict()
+        self._languages: Dict[str, Set[str]] = {}  # path -> languages with a live entry
+        self._finished: Dict[str, Set[str]] = {}  # path -> consumers done with it
+        self._rules: Dict[str, Callable[[], Rule]] = {}  # consumer -> rule factory
+        self._rule_results: Dict[str, Dict[str, Any]] = {}  # path -> consumer -> uncollected rule result
+        self.walks = 0
+        self._ts_parsers = {}
+        self._total_bytes = 0
+        self.parses = 0
+
+    def register_consumer(self, name: str, languages: Iterable[str] = None, rule: Callable[[], Rule] = None):
+        """
+        Declare a consumer that will request trees (optionally only for some languages).
+        `rule` builds the consumer's Rule for Python files; rules share one walk per file.
+        """
+        self._consumers[name] = frozenset(languages) if languages is not None else None
+        if rule is not None:
+            self._rules[name] = rule
+
+    def get(self, file_path: Path, language: str) -> Any:
+        """
+        Return the tree for a file, parsing it on first request.
+        Python files that fail to parse re-raise the original SyntaxError/ValueError.
+        """
+        key = (str(file_path), language)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._parse(file_path, language)
+            self._entries[key] = entry
+            self._languages.setdefault(key[0], set()).add(language)
+            self._total_bytes += entry.size
+            self._evict(keep=key)
+        else:
+            self._entries.move_to_end(key)
+
+        if entry.error is not None:
+            raise entry.error
+        return entry.tree
+
+    def python_tree(self, file_path: Path) -> ast.Module:
+        return self.get(file_path, "python")
+
+    def rule_result(self, file_path: Path, consumer: str, rule: Callable[[], Rule] = None) -> Any:
+        """
+        Result of a consumer's Rule over a Python file. If it was not computed by an
+        earlier walk, walks the tree now for this rule plus every registered rule whose
+        consumer has not released the file yet. `rule` is used when the consumer was
+        registered without one. Re-raises the tree's SyntaxError/ValueError.
+        """
+        path = str(file_path)
+        results = self._rule_results.get(path, {})
+        if consumer in results:
+            result = results.pop(consumer)
+            if not results:
+                del self._rule_results[path]
+            return result
+
+        factory = self._rules.get(consumer, rule)
+        if factory is None:
+            raise KeyError(f"No rule registered for consumer '{consumer}'")
+        tree = self.python_tree(file_path)
+
+        done = self._finished.get(path, set())
+        factories = {
+            name: other for name, other in self._rules.items()
+            if name != consumer and name not in done and name not in results
+        }
+        names = [consumer] + list(factories)
+        rules = [factory()] + [other() for other in factories.values()]
+        self.walks += 1
+        outputs = run_rules(tree, rules, self.sources.read_text(file_path))
+
+        if len(names) > 1:
+            self._rule_results.setdefault(path, {}).update(zip(names[1:], outputs[1:]))
+        return outputs[0]
+
+    def release(self, file_path: Path, consumer: str):
+        """Mark a consumer as finished with a file; frees trees nobody else is waiting for."""
+        path = str(file_path)
+        self._finished.setdefault(path, set()).add(consumer)
+        results = self._rule_results.get(path)
+        if results is not None:
+            results.pop(consumer, None)
+            if not results:
+                del self._rule_results[path]
+        for language in list(self._languages.get(path, ())):
+            key = (path, language)
+            entry = self._entries[key]
+            entry.pending.discard(consumer)
+            if not entry.pending:
+                self._drop(key)
+
+    def invalidate(self, file_path: Path):
+        """Forget a file's trees and source (e.g. after an edit)."""
+        path = str(file_path)
+        for language in list(self._languages.get(path, ())):
+            self._drop((path, language))
+        self._finished.pop(path, None)
+        self._rule_results.pop(path, None)
+        self.sources.invalidate(file_path)
+
+    def _parse(self, file_path: Path, language: str) -> _TreeEntry:
+        path = str(file_path)
+        done = self._finished.get(path, set())
+        pending = {
+            name for name, langs in self._consumers.items()
+            if (langs is None or language in langs) and name not in done
+        }
+
+        self.parses += 1
+        tree, error = None, None
+        if language == "python":
+            source = self.sources.read_text(file_path)
+            try:
+                tree = ast.parse(source)
+            except (SyntaxError, ValueError) as e:
+                error = e
+            size = len(source) * self.SIZE_FACTORS["python"] if error is None else 0
+        else:
+            data = self.sources.read_bytes(file_path)
+            source_bytes = data if isinstance(data, bytes) else data[:]
+            tree = self._ts_parser(language).parse(source_bytes)
+            size = len(source_bytes) * self.SIZE_FACTORS.get(language, self.DEFAULT_SIZE_FACTOR)
+
+        return _TreeEntry(tree, error, size, pending)
+
+    def _ts_parser(self, language: str):
+        parser = self._ts_parsers.get(language)
+        if parser is None:
+            if not TREESITTER_AVAILABLE:
+                raise RuntimeError(f"Tree-sitter not available for {language}")
+            parser = tree_sitter_languages.get_parser(language)
+            self._ts_parsers[language] = parser
+        return parser
+
+    def _drop(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+            languages = self._languages.get(key[0])
+            languages.discard(key[1])
+            if not languages:
+                del self._languages[key[0]]
+
+    def _evict(self, keep: Tuple[str, str]):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._drop(oldest)
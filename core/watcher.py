@@ -0,0 +1,108 @@
+"""
+File Watcher
+Polls a FileScanner's file set and reports added / modified / removed files.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from core.scanner import FileScanner
+
+class FileChanges:
+    def __init__(self, added: List[Path], modified: List[Path], removed: List[Path]):
+        self.added = added
+        self.modified = modified
+        self.removed = removed
+
+    @property
+    def changed(self) -> List[Path]:
+        """Files that need (re-)analysis."""
+        return self.added + self.modified
+
+    def __bool__(self):
+        return bool(self.added or self.modified or self.removed)
+
+class PollingWatcher:
+    """
+    Detects changes by re-walking the tree and comparing (mtime_ns, size) snapshots.
+
+    Editors often save in several steps (truncate + write, or write a temp file
+    and rename it), so a batch is only reported once the tree has been stable
+    for `settle` seconds.
+    """
+
+    def __init__(self, scanner: FileScanner, interval: float = 1.0, settle: float = 0.2):
+        self.scanner = scanner
+        self.interval = interval
+        self.settle = settle
+        self._snapshot = self._take_snapshot()
+
+    @property
+    def files(self) -> List[Path]:
+        return [Path(p) for p in self._snapshot]
+
+    def poll(self) -> FileChanges:
+        """Compare the tree against the last snapshot (non-blocking)."""
+        current = self._take_snapshot()
+        previous = self._snapshot
+        self._snapshot = current
+        return FileChanges(
+            added=[Path(p) for p in current if p not in previous],
+            modified=[Path(p) for p, sig in current.items() if p in previous and previous[p] != sig],
+            removed=[Path(p) for p in previous if p not in current],
+        )
+
+    def watch(self) -> Iterator[FileChanges]:
+        """Block and yield non-empty change batches forever."""
+        while True:
+            time.sleep(self.interval)
+            changes = self.poll()
+            if not changes:
+                continue
+            # Let multi-step saves finish, folding anything that lands meanwhile into this batch
+            while True:
+                time.sleep(self.settle)
+                more = self.poll()
+                if not more:
+                    break
+                changes = self._merge(changes, more)
+            if changes:
+                yield changes
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.scanner.iter_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[str(path)] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def _merge(self, first: FileChanges, second: FileChanges) -> FileChanges:
+        """Combine two consecutive batches into their net effect."""
+        added = {str(p) for p in first.added}
+        modified = {str(p) for p in first.modified}
+        removed = {str(p) for p in first.removed}
+        for p in map(str, second.added):
+            if p in removed:
+                removed.discard(p)
+                modified.add(p)
+            else:
+                added.add(p)
+        for p in map(str, second.modified):
+            if p not in added:
+                modified.add(p)
+        for p in map(str, second.removed):
+            if p in added:
+                added.discard(p)
+            else:
+                modified.discard(p)
+                removed.add(p)
+        order = list(self._snapshot) + sorted(removed)
+        return FileChanges(
+            added=[Path(p) for p in order if p in added],
+            modified=[Path(p) for p in order if p in modified],
+            removed=[Path(p) for p in order if p in removed],
+        )
@@ -5,7 +5,9 @@ Advanced Code Analyzer - Main CLI
 import typer
 import asyncio
 import os
+import sys
 from pathlib import Path
+from typing import List
 from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
@@ -28,6 +30,24 @@ def analyze(
     output: Path = typer.Option("report.json", "--output", "-o", help="Output report path"),
     vllm_url: str = typer.Option("http://127.0.0.1:8000/v1", "--vllm-url", help="LLM server URL (OpenAI-compatible)"),
     generate_fixes: bool = typer.Option(True, "--fixes/--no-fixes", "--generate-fixes", help="Generate code fixes"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for structural parsing"),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse parse results for unchanged files"),
+    cache_dir: Path = typer.Option(None, "--cache-dir", help="Parse cache location (default: <folder>/.code_analyzer/cache)"),
+    cache_size: int = typer.Option(256, "--cache-size", help="Parse cache size limit in MB"),
+    include: List[str] = typer.Option(None, "--include", help="Only analyze paths matching this glob (repeatable)"),
+    exclude: List[str] = typer.Option(None, "--exclude", help="Skip paths matching this glob (repeatable)"),
+    use_gitignore: bool = typer.Option(True, "--gitignore/--no-gitignore", help="Honour .gitignore files while scanning"),
+    git_files: bool = typer.Option(False, "--git-files", help="List files with `git ls-files` instead of walking the tree"),
+    files_from: str = typer.Option(None, "--files-from", help="Read the file list from a file ('-' for stdin)"),
+    scan_threads: int = typer.Option(1, "--scan-threads", help="Threads for directory walking (helps on network filesystems)"),
+    incremental: bool = typer.Option(False, "--incremental", help="Only re-analyze files changed since the last run (plus their dependents)"),
+    manifest_path: Path = typer.Option(None, "--manifest", help="Incremental manifest location (default: <folder>/.code_analyzer/manifest.bin)"),
+    entry_point: List[str] = typer.Option(None, "--entry-point", help="Dead code by reachability from this entry point: name glob (test_*), qualified name (cli.*) or @decorator (repeatable)"),
+    entry_points_file: Path = typer.Option(None, "--entry-points-file", help="JSON file listing entry points (enables reachability dead-code analysis)"),
+    why_alive: List[str] = typer.Option(None, "--why-alive", help="Show the call chain that keeps this function (qualified name) alive (repeatable)"),
+    store_graph: bool = typer.Option(True, "--graph-store/--no-graph-store", help="Save symbols, call graph and findings for `query`"),
+    graph_db: Path = typer.Option(None, "--graph-db", help="Graph database location (default: <folder>/.code_analyzer/graph.db)"),
+    llm_concurrency: int = typer.Option(8, "--llm-concurrency", help="LLM requests in flight at once while verifying duplicate candidates"),
 
 ):
     """
@@ -38,6 +58,29 @@ def analyze(
         console.print(f"[red]Error: Folder {folder} does not exist[/red]")
         raise typer.Exit(1)
     
+    entry_points = _load_entry_points(entry_point, entry_points_file)
+    
+    # File discovery (streamed into the first phase)
+    from core.scanner import FileScanner
+    scanner = FileScanner(folder, include=include, exclude=exclude, use_gitignore=use_gitignore, threads=scan_threads)
+    file_stream = None
+    if files_from == "-":
+        # The menu and fix loop are interactive: take the list off stdin first, then reattach the terminal
+        file_stream = iter(list(scanner.iter_file_list(sys.stdin)))
+        try:
+            sys.stdin = open("/dev/tty", "r")
+        except OSError:
+            pass
+    elif files_from:
+        if not Path(files_from).is_file():
+            console.print(f"[red]Error: File list {files_from} does not exist[/red]")
+            raise typer.Exit(1)
+        file_stream = scanner.iter_file_list(Path(files_from))
+    elif git_files:
+        file_stream = scanner.iter_git_files()
+        if file_stream is None:
+            console.print("[yellow]Not a git work tree — falling back to directory walk.[/yellow]")
+    
     # Interactive Menu
     menu = Table.grid(padding=(0, 1))
     menu.add_column(style="cyan", justify="right")
@@ -76,10 +119,53 @@ def analyze(
     
     console.print(f"\n[bold blue]🔍 Starting {analysis_mode.upper()} Analysis:[/bold blue] {folder}\n")
     
+    # Persistent parse cache (content-addressed, shared across runs)
+    parse_cache = None
+    if use_cache:
+        from core.parse_cache import ParseCache
+        parse_cache = ParseCache(cache_dir or folder / ".code_analyzer" / "cache", max_bytes=cache_size * 1024 * 1024)
+    
     # Run async analysis
-    asyncio.run(run_analysis(folder, output, vllm_url, generate_fixes, analysis_mode))
+    asyncio.run(run_analysis(
+        folder, output, vllm_url, generate_fixes, analysis_mode,
+        jobs=jobs, parse_cache=parse_cache, file_stream=file_stream, scanner=scanner,
+        manifest_path=(manifest_path or folder / ".code_analyzer" / "manifest.bin") if incremental else None,
+        entry_points=entry_points, why_alive=why_alive,
+        graph_db_path=(graph_db or folder / ".code_analyzer" / "graph.db") if store_graph else None,
+        llm_concurrency=llm_concurrency
+    ))
+
+def _load_entry_points(patterns: List[str], config_path: Path):
+    """EntryPoints for reachability dead-code analysis, or None to keep the name-based check."""
+    if not patterns and not config_path:
+        return None
+    from core.entry_points import EntryPoints
+    if config_path:
+        try:
+            return EntryPoints.load(config_path, patterns or [])
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Error: cannot read entry points from {config_path}: {e}[/red]")
+            raise typer.Exit(1)
+    return EntryPoints.from_patterns(patterns)
+
+def _store_graph(db_path: Path, struct_analyzer, quiet: bool = False):
+    """
+    Sync the graph database with the analyzer's current state (only changed files are rewritten),
+    then write the CompactGraph snapshot next to it for `query chain`.
+    """
+    from core.graph_store import GraphStore
+    try:
+        with GraphStore(db_path) as store:
+            stats = store.sync(struct_analyzer.graph_records())
+        struct_analyzer.call_graph_builder().save_snapshot(_snapshot_dir(db_path))
+    except Exception as e:
+        console.print(f"[yellow]⚠ Could not update graph database {db_path}: {e}[/yellow]")
+        return
+    if not quiet:
+        console.print(f"[dim]Graph database: {stats['written']} file(s) updated, {stats['unchanged']} unchanged, "
+                      f"{stats['removed']} removed ({db_path})[/dim]\n")
 
-async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes: bool, analysis_mode: str = "full"):
+async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes: bool, analysis_mode: str = "full", jobs: int = 1, parse_cache=None, file_stream=None, scanner=None, manifest_path: Path = None, entry_points=None, why_alive: List[str] = None, graph_db_path: Path = None, llm_concurrency: int = 8):
     from core.scanner import FileScanner
     from analyzers.static_syntax import StaticSyntaxAnalyzer, FileSyntaxError
     from analyzers.syntax_fix_generator import SyntaxFixGenerator
@@ -91,19 +177,46 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
     from analyzers.structural_analyzer import StructuralAnalyzer
     from llm.vllm_client import VLLMClient
     from utils.html_report_generator import HTMLReportGenerator
+    from core.source_store import SourceStore
+    from core.tree_registry import TreeRegistry
     
     # Initialize vLLM client
     console.print(f"[cyan]→ Connecting to LLM at {vllm_url}[/cyan]")
     llm_client = VLLMClient(base_url=vllm_url)
     
-    # Scan files
+    # Scan files — streamed, so the first phase starts on early files while the walk continues
     console.print("\nScanning files...")
-    scanner = FileScanner(folder)
-    files = scanner.scan()
-    console.print(f"✓ Found {len(files)} code files\n")
+    if file_stream is None:
+        scanner = scanner or FileScanner(folder)
+        file_stream = scanner.iter_files()
+    files = []
+    
+    # Every phase reads source through one store, so each file hits the disk once
+    source_store = SourceStore()
+    
+    # Each file is parsed once per language; trees are shared by every phase that needs them
+    # and dropped once the last consumer for this mode is done with them.
+    tree_registry = TreeRegistry(source_store)
+    
+    # Incremental mode: results of the previous run for files that did not change
+    manifest = None
+    if manifest_path is not None:
+        from core.manifest import AnalysisManifest
+        manifest = AnalysisManifest(manifest_path, source_store)
+    # Rule-based checks of all registered consumers share a single walk per Python file.
+    tree_registry.register_consumer(StaticSyntaxAnalyzer.TREE_CONSUMER)
+    if analysis_mode in ['full', 'structural', 'redundancy', 'semantic']:
+        tree_registry.register_consumer(StructuralAnalyzer.TREE_CONSUMER, rule=StructuralAnalyzer.TREE_RULE)
+        tree_registry.register_consumer(StructuralAnalyzer.UNUSED_TREE_CONSUMER, ["python"],
+                                        rule=StructuralAnalyzer.UNUSED_TREE_RULE)
+    if analysis_mode in ['full', 'redundancy']:
+        tree_registry.register_consumer(CrossFileRedundancyDetector.TREE_CONSUMER, ["python"],
+                                        rule=CrossFileRedundancyDetector.TREE_RULE)
+        tree_registry.register_consumer(CrossFileRedundancyDetector.CLONE_TREE_CONSUMER, ["python"],
+                                        rule=CrossFileRedundancyDetector.CLONE_TREE_RULE)
     
     # Phase 2: Static Syntax Check
-    syntax_analyzer = StaticSyntaxAnalyzer(llm_client)
+    syntax_analyzer = StaticSyntaxAnalyzer(llm_client, cache=parse_cache, tree_registry=tree_registry)
     syntax_fix_generator = SyntaxFixGenerator(llm_client)
     
     # Results containers
@@ -123,15 +236,28 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
     cycles = {"imports": [], "calls": []}
     symbol_table = None
     
+    def check_syntax(file_path):
+        """Syntax check one file, reusing the manifest's result when the file is unchanged."""
+        if manifest is not None and manifest.check(file_path):
+            stored = manifest.get(file_path, "syntax")
+            if stored is not None:
+                errors = [FileSyntaxError(message=m, parser=p, line=l, column=c) for l, c, m, p in stored]
+                return (len(errors) == 0), errors
+        is_valid, errors = syntax_analyzer.analyze_file(file_path)
+        if manifest is not None:
+            manifest.set(file_path, "syntax", [(e.line, e.column, e.message, e.parser) for e in errors])
+        return is_valid, errors
+    
     # ── File-by-File Syntax Flow ──────────────────────────────
     if analysis_mode in ['full', 'syntax']:
-        for idx, file_path in enumerate(files, 1):
+        for idx, file_path in enumerate(file_stream, 1):
+            files.append(file_path)
             # 1. DETECT — scan this file
-            is_valid, errors = syntax_analyzer.analyze_file(file_path)
+            is_valid, errors = check_syntax(file_path)
             
             if is_valid:
                 valid_files.append(file_path)
-                console.print(f"  [green]✅ {idx}/{len(files)} {file_path.name}[/green]")
+                console.print(f"  [green]✅ {idx} {file_path.name}[/green]")
                 continue
             
             # Store errors for the report
@@ -141,7 +267,10 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
             ]
             
             # 2. SHOW — display errors with code snippet
-            console.print(f"\n[bold]{file_path.name}[/bold]  ({idx}/{len(files)})")
+            console.print(f"\n[bold]{file_path.name}[/bold]  ({idx})")
+            if manifest is not None:
+                # The fix loop may edit the file: re-check it from disk once the scan is done
+                manifest.forget(file_path)
             
             for err in errors:
                 console.print(f"  [red]Line {err.line}, Col {err.column}:[/red] {err.message} [{err.parser}]")
@@ -154,8 +283,8 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
             
             # Interactive fix loop: stay on this file until clean or user skips
             while True:
-                # Re-read and re-parse from disk
-                current_valid, current_errors = syntax_analyzer.analyze_file(file_path)
+                # Re-read from disk (the user may have edited the file); C/C++/Java re-parse incrementally
+                current_valid, current_errors = syntax_analyzer.recheck_file(file_path)
                 
                 if current_valid:
                     applied_fixes[str(file_path)] = True
@@ -165,8 +294,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
                     break
                 
                 # Read current code
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    current_code = f.read()
+                current_code = source_store.read_text(file_path)
                 
                 # 4. SUGGEST — LLM generates fix (shown as suggestion)
                 fix_result = await syntax_fix_generator.fix_file_manual_assist(
@@ -184,6 +312,8 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
                     console.print(f"\n  [yellow]⏩ Skipping {file_path.name}.[/yellow]\n")
                     break
         
+        console.print(f"✓ Found {len(files)} code files\n")
+        
         # Summary
         console.print(f"\n{'─'*50}")
         console.print(f"  [bold]Syntax Check Summary[/bold]")
@@ -195,10 +325,16 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
         console.print(f"{'─'*50}\n")
     else:
         # Non-syntax modes: just silently classify files
-        for file_path in files:
-            is_valid, _ = syntax_analyzer.analyze_file(file_path)
+        for file_path in file_stream:
+            files.append(file_path)
+            is_valid, _ = check_syntax(file_path)
             if is_valid:
                 valid_files.append(file_path)
+        console.print(f"✓ Found {len(files)} code files\n")
+    
+    if manifest is not None:
+        dirty = manifest.finalize_scan(files)
+        console.print(f"[dim]Incremental: {len(dirty)} changed or affected file(s)[/dim]\n")
     
     # Structural Analysis (symbol table + call graph)
     # Phase 2: Structural Analysis
@@ -216,36 +352,28 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
         console.print("Building symbol table & call graph...")
         from analyzers.structural_analyzer import StructuralAnalyzer
         
-        struct_analyzer = StructuralAnalyzer()
+        struct_analyzer = StructuralAnalyzer(jobs=jobs, cache=parse_cache, tree_registry=tree_registry, entry_points=entry_points)
         analysis_files = valid_files if valid_files else files
-        struct_results = struct_analyzer.analyze_codebase(analysis_files)
+        struct_results = struct_analyzer.analyze_codebase(analysis_files, manifest=manifest)
         
         symbol_table = struct_results["symbol_table_object"]
         circular_deps = struct_results["circular_dependencies"]
         dead_code_data = struct_results["dead_code"]
         
         # Reconstruct parsed_files for compatibility with Semantic Phase
-        for file_path_str, data in struct_results["raw_data"].items():
-            fpath = Path(file_path_str)
-            module_name = fpath.stem
-            
-            cg_functions = []
-            for f in data.get("functions", []):
-                 prefix = f"{f['parent_class']}." if f.get("parent_class") else ""
-                 cg_functions.append({
-                     "qualified_name": f"{module_name}.{prefix}{f['name']}",
-                     "calls": f.get("calls", [])
-                 })
-            
-            
-            parsed_files[fpath] = {
-                "functions": cg_functions,
-                "calls": data.get("calls", []),
-                "imports": data.get("imports", [])
-            }
+        parsed_files = struct_analyzer.call_graph_input()
             
         dead_code_symbols = dead_code_data
         console.print(f"✓ Symbol table built ({len(symbol_table.symbols)} symbols indexed)\n")
+        if "incremental" in struct_results:
+            stats = struct_results["incremental"]
+            console.print(f"[dim]Incremental: {stats['reanalyzed']} file(s) re-analyzed, {stats['reused']} reused from the manifest[/dim]\n")
+        
+        if graph_db_path is not None:
+            _store_graph(graph_db_path, struct_analyzer)
+    
+    if manifest is not None:
+        manifest.save()
     
     # Only show structural analysis results for 'structural' or 'full' modes
     if analysis_mode in ['full', 'structural'] and struct_results:
@@ -286,7 +414,8 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
             console.print(f"  [dim]Total: {total_unused} unused variable(s)[/dim]\n")
         
         # ═══ Section 2: Dead Code / Uncalled Functions (file by file) ═══
-        console.print("[bold yellow]═══ Uncalled Functions ═══[/bold yellow]\n")
+        dead_label = "unreachable" if entry_points is not None else "uncalled"
+        console.print(f"[bold yellow]═══ {dead_label.capitalize()} Functions ═══[/bold yellow]\n")
         total_dead = 0
         for fpath in sorted_files:
             file_dead = [s for s in dead_code_symbols if s.file == fpath]
@@ -299,9 +428,21 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
                 console.print(f"    • [yellow]{sym.name}[/yellow]{parent} (line {sym.line})")
             console.print()
         if total_dead == 0:
-            console.print("  [green]✓ No uncalled functions detected.[/green]\n")
+            console.print(f"  [green]✓ No {dead_label} functions detected.[/green]\n")
         else:
-            console.print(f"  [dim]Total: {total_dead} uncalled function(s)[/dim]\n")
+            console.print(f"  [dim]Total: {total_dead} {dead_label} function(s)[/dim]\n")
+        
+        for qname in why_alive or []:
+            chain = struct_analyzer.why_alive(qname)
+            if chain:
+                console.print(f"  [cyan]Why alive:[/cyan] {' → '.join(chain)}")
+            elif entry_points is None:
+                console.print(f"  [yellow]--why-alive needs --entry-point or --entry-points-file[/yellow]")
+                break
+            else:
+                console.print(f"  [cyan]Why alive:[/cyan] {qname} [red]is not reachable[/red]")
+        if why_alive:
+            console.print()
         
         # ═══ Section 3: Recursive / Cycle Calls ═══
         console.print("[bold yellow]═══ Recursive / Cycle Calls ═══[/bold yellow]\n")
@@ -329,7 +470,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
     if analysis_mode in ['full', 'semantic']:
         console.print("\n[bold magenta]═══ Phase 3: Semantic Bug Detection ═══[/bold magenta]\n")
         from analyzers.static_bug_detector import StaticBugDetector
-        static_bug_detector = StaticBugDetector()
+        static_bug_detector = StaticBugDetector(tree_registry=tree_registry)
         bug_detector = LLMBugDetector(llm_client)
         fix_generator = FixGenerator(llm_client)
         from rich import box
@@ -345,7 +486,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
         fix_gen = FixGenerator(llm_client)
         if 'struct_analyzer' not in locals():
             from analyzers.structural_analyzer import StructuralAnalyzer
-            struct_analyzer = StructuralAnalyzer()
+            struct_analyzer = StructuralAnalyzer(cache=parse_cache, tree_registry=tree_registry)
 
         # Iterate through files interactively
         analysis_queue = valid_files if valid_files else files
@@ -356,8 +497,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
             console.print(f"\n[bold cyan]Analyzing File {file_idx}/{len(analysis_queue)}: {file_path.name}[/bold cyan]")
             
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
+                code = source_store.read_text(file_path)
             except Exception as e:
                 console.print(f"[red]Error reading {file_path.name}: {e}[/red]")
                 continue
@@ -456,6 +596,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
             # 2. Sequential Function Analysis
             for target_func in functions:
                 sym_name = target_func['name']
+                func_code = source_store.segment(file_path, *target_func["span"])
                 
                 # Build Context (Identical logic as before)
                 class_ctx = ""
@@ -468,7 +609,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
                             for a in cls_data["attributes"]: skel.append(f"    {a};")
                         skel.append(f"    // ... other methods ...")
                         skel.append(f"    // === TARGET: {sym_name} ===")
-                        for l in target_func["body_code"].splitlines():
+                        for l in func_code.splitlines():
                             skel.append(f"    {l}")
                         skel.append("}")
                         class_ctx = "\n".join(skel)
@@ -480,7 +621,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
                 # LLM Analysis
                 console.print(f"  [dim]Auditing: {sym_name}...[/dim]")
                 bugs, corrected_code = await bug_detector.analyze_symbol(
-                    sym_name, target_func["body_code"], language, file_path,
+                    sym_name, func_code, language, file_path,
                     class_context=class_ctx, dependency_hints=dep_hints,
                     global_vars=global_vars_str, imports_list=imports_str
                 )
@@ -535,7 +676,7 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
                 
                 class_bugs, corrected_code = await bug_detector.analyze_symbol(
                     cls_name, 
-                    cls.get("body_code", ""), 
+                    source_store.segment(file_path, *cls["span"]), 
                     language, 
                     file_path,
                     class_context="", # It IS the class
@@ -574,34 +715,244 @@ async def run_analysis(folder: Path, output: Path, vllm_url: str, generate_fixes
     if analysis_mode in ['full', 'redundancy']:
         console.print("\n[bold blue]Phase 5: Cross-file Redundancy Detection[/bold blue]")
         if symbol_table:
-            redundancy_detector = CrossFileRedundancyDetector(symbol_table, llm_client)
+            redundancy_detector = CrossFileRedundancyDetector(symbol_table, llm_client, tree_registry=tree_registry, llm_concurrency=llm_concurrency)
             duplicates = await redundancy_detector.detect_duplicates(console=console)
             
             console.print(f"\n[bold yellow]═══ Redundant / Duplicate Functions ═══[/bold yellow]\n")
             
             if duplicates:
                 for idx, dup in enumerate(duplicates, 1):
-                    f1, f2 = dup.functions[0], dup.functions[1]
-                    same_file = f1.file == f2.file
+                    # Pairs, or whole groups for renamed clones
+                    same_file = len({f.file for f in dup.functions}) == 1
                     scope = "same-file" if same_file else "cross-file"
+                    names = " ↔ ".join(f"[bold]{f.name}[/bold]" for f in dup.functions)
                     
-                    console.print(f"  [bold red]#{idx}[/bold red] [bold]{f1.name}[/bold] ↔ [bold]{f2.name}[/bold]  [dim]({scope}, {dup.similarity:.0%} match)[/dim]")
-                    console.print(f"    📄 {f1.file.name}:{f1.line} → [yellow]{f1.name}[/yellow]({f1.signature.split('(')[1] if '(' in f1.signature else ''})")
-                    console.print(f"    📄 {f2.file.name}:{f2.line} → [yellow]{f2.name}[/yellow]({f2.signature.split('(')[1] if '(' in f2.signature else ''})")
+                    console.print(f"  [bold red]#{idx}[/bold red] {names}  [dim]({scope}, {dup.similarity:.0%} match)[/dim]")
+                    for f in dup.functions:
+                        console.print(f"    📄 {f.file.name}:{f.line} → [yellow]{f.name}[/yellow]({f.signature.split('(')[1] if '(' in f.signature else ''})")
                     console.print(f"    💡 [cyan]{dup.reason}[/cyan]")
                     if hasattr(dup, 'suggestion') and dup.suggestion:
                         console.print(f"    🔧 [green]{dup.suggestion}[/green]")
                     console.print()
                 
-                console.print(f"  [dim]Total: {len(duplicates)} duplicate pair(s) found[/dim]\n")
+                console.print(f"  [dim]Total: {len(duplicates)} duplicate pair(s) / clone group(s) found[/dim]\n")
             else:
                 console.print("  [green]✓ No redundant or duplicate functions detected.[/green]\n")
         else:
             console.print("[red]  ✗ Redundancy detection requires structural analysis first. Skipping.[/red]\n")
+
+
+@app.command()
+def watch(
+    folder: Path = typer.Argument(..., help="Folder to watch"),
+    interval: float = typer.Option(1.0, "--interval", help="Polling interval in seconds"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for the initial structural parse"),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse parse results for unchanged files"),
+    cache_dir: Path = typer.Option(None, "--cache-dir", help="Parse cache location (default: <folder>/.code_analyzer/cache)"),
+    include: List[str] = typer.Option(None, "--include", help="Only watch paths matching this glob (repeatable)"),
+    exclude: List[str] = typer.Option(None, "--exclude", help="Skip paths matching this glob (repeatable)"),
+    use_gitignore: bool = typer.Option(True, "--gitignore/--no-gitignore", help="Honour .gitignore files while scanning"),
+    entry_point: List[str] = typer.Option(None, "--entry-point", help="Dead code by reachability from this entry point (repeatable, see analyze)"),
+    entry_points_file: Path = typer.Option(None, "--entry-points-file", help="JSON file listing entry points"),
+    store_graph: bool = typer.Option(True, "--graph-store/--no-graph-store", help="Keep the `query` database up to date while watching"),
+    graph_db: Path = typer.Option(None, "--graph-db", help="Graph database location (default: <folder>/.code_analyzer/graph.db)"),
+):
+    """
+    Keep the symbol table and call graph in memory and report dead-code / cycle
+    changes as files are edited.
+    """
+    from core.scanner import FileScanner
+    from core.watcher import PollingWatcher
+    from analyzers.structural_analyzer import StructuralAnalyzer
+    
+    if not folder.exists():
+        console.print(f"[red]Error: Folder {folder} does not exist[/red]")
+        raise typer.Exit(1)
+    
+    parse_cache = None
+    if use_cache:
+        from core.parse_cache import ParseCache
+        parse_cache = ParseCache(cache_dir or folder / ".code_analyzer" / "cache")
+    
+    scanner = FileScanner(folder, include=include, exclude=exclude, use_gitignore=use_gitignore)
+    watcher = PollingWatcher(scanner, interval=interval)
+    struct_analyzer = StructuralAnalyzer(jobs=jobs, cache=parse_cache, entry_points=_load_entry_points(entry_point, entry_points_file))
     
+    start = time.perf_counter()
+    results = struct_analyzer.analyze_codebase(watcher.files)
+    console.print(
+        f"✓ Watching {len(watcher.files)} files — {len(results['dead_code'])} uncalled function(s), "
+        f"{len(results['function_cycles'])} cycle(s), {len(results['unused_variables'])} unused variable(s) "
+        f"[dim]({time.perf_counter() - start:.2f}s)[/dim]"
+    )
+    graph_db_path = (graph_db or folder / ".code_analyzer" / "graph.db") if store_graph else None
+    if graph_db_path is not None:
+        _store_graph(graph_db_path, struct_analyzer)
+    console.print("[dim]Press Ctrl+C to stop.[/dim]\n")
+    
+    try:
+        for changes in watcher.watch():
+            start = time.perf_counter()
+            delta = struct_analyzer.update_files(changed=changes.changed, removed=changes.removed)
+            elapsed = time.perf_counter() - start
+            
+            names = ", ".join(p.name for p in changes.changed + changes.removed)
+            console.print(f"[bold cyan]↻ {names}[/bold cyan] [dim]({elapsed * 1000:.0f} ms)[/dim]")
+            if graph_db_path is not None:
+                _store_graph(graph_db_path, struct_analyzer, quiet=True)
+            _print_watch_delta(delta)
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped watching.[/dim]")
+
+def _print_watch_delta(delta: dict):
+    shown = False
+    for cycle in delta["circular_dependencies"]["added"]:
+        console.print(f"  [red]+ import cycle[/red] {' → '.join(cycle)}")
+        shown = True
+    for cycle in delta["circular_dependencies"]["removed"]:
+        console.print(f"  [green]- import cycle[/green] {' → '.join(cycle)}")
+        shown = True
+    for sym in delta["dead_code"]["added"]:
+        parent = f" ({sym.parent_name})" if sym.parent_name else ""
+        console.print(f"  [red]+ uncalled[/red] [yellow]{sym.name}[/yellow]{parent} ({sym.file.name}:{sym.line})")
+        shown = True
+    for sym in delta["dead_code"]["removed"]:
+        console.print(f"  [green]- uncalled[/green] {sym.name} ({sym.file.name})")
+        shown = True
+    for cycle in delta["function_cycles"]["added"]:
+        cycle_str = " → ".join(s.name for s in cycle) + f" → {cycle[0].name}"
+        console.print(f"  [red]+ cycle[/red] {cycle_str}")
+        shown = True
+    for cycle in delta["function_cycles"]["removed"]:
+        cycle_str = " → ".join(s.name for s in cycle) + f" → {cycle[0].name}"
+        console.print(f"  [green]- cycle[/green] {cycle_str}")
+        shown = True
+    for var in delta["unused_variables"]["added"]:
+        console.print(f"  [red]+ unused[/red] [yellow]{var['name']}[/yellow] ({var['file']}:{var['line']})")
+        shown = True
+    for var in delta["unused_variables"]["removed"]:
+        console.print(f"  [green]- unused[/green] {var['name']} ({var['file']})")
+        shown = True
+    if not shown:
+        console.print("  [dim]No changes in findings.[/dim]")
+    console.print()
 
+query_app = typer.Typer(help="Answer call-graph questions from the graph database written by analyze / watch")
+app.add_typer(query_app, name="query")
 
+def _snapshot_dir(db_path: Path) -> Path:
+    """Directory of the binary call-graph snapshot written alongside a graph database."""
+    return db_path.with_suffix(".snapshot")
 
+def _open_graph_store(folder: Path, db: Path):
+    from core.graph_store import GraphStore
+    db_path = db or folder / ".code_analyzer" / "graph.db"
+    if not db_path.exists():
+        console.print(f"[red]Error: No graph database at {db_path} — run `analyze` or `watch` on the project first[/red]")
+        raise typer.Exit(1)
+    return GraphStore(db_path)
+
+def _load_call_graph(folder: Path, db: Path):
+    """The snapshot's call graph, or None if it is missing, from another version or older than the database."""
+    from core.compact_graph import CompactGraph
+    db_path = db or folder / ".code_analyzer" / "graph.db"
+    snapshot = _snapshot_dir(db_path) / "functions.npz"
+    try:
+        if snapshot.stat().st_mtime < db_path.stat().st_mtime:
+            return None
+    except OSError:
+        return None
+    return CompactGraph.load(snapshot)
+
+def _resolve_symbols(store, name: str) -> List[dict]:
+    matches = store.find_symbols(name)
+    if not matches:
+        console.print(f"[red]No symbol named {name}[/red]")
+        raise typer.Exit(1)
+    return matches
+
+def _print_symbol_list(title: str, rows: List[dict]):
+    console.print(f"[bold cyan]{title}[/bold cyan]")
+    if not rows:
+        console.print("  [dim](none)[/dim]")
+    for row in rows:
+        location = f"{Path(row['file']).name}:{row['line']}" if row["file"] else "?"
+        console.print(f"  • {row['qualified_name']} [dim]({location})[/dim]")
+
+@query_app.command("callers")
+def query_callers(
+    name: str = typer.Argument(..., help="Function (qualified name, Class.method or bare name)"),
+    folder: Path = typer.Option(Path("."), "--folder", "-f", help="Analyzed project folder"),
+    db: Path = typer.Option(None, "--db", help="Graph database (default: <folder>/.code_analyzer/graph.db)"),
+):
+    """Functions that call NAME."""
+    start = time.perf_counter()
+    with _open_graph_store(folder, db) as store:
+        for symbol in _resolve_symbols(store, name):
+            _print_symbol_list(f"Callers of {symbol['qualified_name']}", store.callers(symbol["qualified_name"]))
+    console.print(f"[dim]({(time.perf_counter() - start) * 1000:.1f} ms)[/dim]")
+
+@query_app.command("callees")
+def query_callees(
+    name: str = typer.Argument(..., help="Function (qualified name, Class.method or bare name)"),
+    folder: Path = typer.Option(Path("."), "--folder", "-f", help="Analyzed project folder"),
+    db: Path = typer.Option(None, "--db", help="Graph database (default: <folder>/.code_analyzer/graph.db)"),
+):
+    """Functions that NAME calls."""
+    start = time.perf_counter()
+    with _open_graph_store(folder, db) as store:
+        for symbol in _resolve_symbols(store, name):
+            _print_symbol_list(f"Callees of {symbol['qualified_name']}", store.callees(symbol["qualified_name"]))
+    console.print(f"[dim]({(time.perf_counter() - start) * 1000:.1f} ms)[/dim]")
+
+@query_app.command("chain")
+def query_chain(
+    source: str = typer.Argument(..., help="Calling function"),
+    target: str = typer.Argument(..., help="Called function"),
+    folder: Path = typer.Option(Path("."), "--folder", "-f", help="Analyzed project folder"),
+    db: Path = typer.Option(None, "--db", help="Graph database (default: <folder>/.code_analyzer/graph.db)"),
+):
+    """Shortest call chain from SOURCE to TARGET."""
+    start = time.perf_counter()
+    with _open_graph_store(folder, db) as store:
+        # In-memory BFS over the snapshot when there is one; SQL BFS over the calls table otherwise
+        graph = _load_call_graph(folder, db)
+        shortest = graph.shortest_path if graph is not None else store.chain
+        best = []
+        for a in _resolve_symbols(store, source):
+            for b in _resolve_symbols(store, target):
+                chain = shortest(a["qualified_name"], b["qualified_name"])
+                if chain and (not best or len(chain) < len(best)):
+                    best = chain
+    if best:
+        console.print(" → ".join(best))
+    else:
+        console.print(f"[yellow]No call chain from {source} to {target}[/yellow]")
+    console.print(f"[dim]({(time.perf_counter() - start) * 1000:.1f} ms)[/dim]")
+
+@query_app.command("file-deps")
+def query_file_deps(
+    path: str = typer.Argument(..., help="File path (or a trailing part of it, e.g. pkg/mod.py)"),
+    reverse: bool = typer.Option(False, "--reverse", "-r", help="List files that depend on PATH instead"),
+    folder: Path = typer.Option(Path("."), "--folder", "-f", help="Analyzed project folder"),
+    db: Path = typer.Option(None, "--db", help="Graph database (default: <folder>/.code_analyzer/graph.db)"),
+):
+    """Files PATH depends on through imports or cross-file calls."""
+    start = time.perf_counter()
+    with _open_graph_store(folder, db) as store:
+        matches = store.resolve_file(path)
+        if not matches:
+            console.print(f"[red]No analyzed file matches {path}[/red]")
+            raise typer.Exit(1)
+        for file_path in matches:
+            title = "Depends on" if not reverse else "Used by"
+            console.print(f"[bold cyan]{title}: {file_path}[/bold cyan]")
+            deps = store.file_deps(file_path, reverse=reverse)
+            if not deps:
+                console.print("  [dim](none)[/dim]")
+            for dep, kind in deps:
+                console.print(f"  • {dep} [dim]\\[{kind}][/dim]")
+    console.print(f"[dim]({(time.perf_counter() - start) * 1000:.1f} ms)[/dim]")
 
 if __name__ == "__main__":
     app()
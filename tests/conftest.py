@@ -0,0 +1,76 @@
+"""
+Shared setup for the test suite: makes the repository root importable and
+points at the sample projects the analyzers are checked against.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+@pytest.fixture
+def sample_files():
+    """Code files of a sample directory (relative to the repository root), in a stable order."""
+    def files(directory: str, pattern: str = "*.py"):
+        return sorted((REPO_ROOT / directory).glob(pattern))
+    return files
+
+@pytest.fixture
+def report_summary():
+    """Comparable form of an analyze_codebase() report (names, files and lines instead of Symbol objects)."""
+    def summary(report):
+        return {
+            "symbols": sorted((q, str(s.file), s.line, s.signature) for q, s in report["symbol_table_object"].symbols.items()),
+            "circular_dependencies": report["circular_dependencies"],
+            "function_cycles": [[s.qualified_name for s in cycle] for cycle in report["function_cycles"]],
+            "dead_code": [s.qualified_name for s in report["dead_code"]],
+            "unused_variables": [(v["path"], v["name"], v["line"], v["type"]) for v in report["unused_variables"]],
+        }
+    return summary
+
+class StubLLM:
+    """
+    LLM client stand-in for duplicate verification: confirms exactly the given
+    function-name pairs, records every (A, B) it was asked about and the peak
+    number of requests in flight.
+    """
+
+    def __init__(self, duplicates=(), delay=0.0):
+        self.duplicates = {frozenset(pair) for pair in duplicates}
+        self.delay = delay  # seconds, or a function of the (A, B) names
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_completion(self, prompt, temperature=0.1, max_tokens=2048):
+        names = tuple(re.findall(r'Function [AB] — "(\w+)"', prompt))
+        self.calls.append(names)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay(names) if callable(self.delay) else self.delay)
+        self.in_flight -= 1
+        verdict = frozenset(names) in self.duplicates
+        return json.dumps({"are_duplicates": verdict, "shared_logic_summary": f"{names[0]} / {names[1]}"})
+
+@pytest.fixture
+def find_duplicates():
+    """Run CrossFileRedundancyDetector over files (after structural analysis, as main.py does)."""
+    from analyzers.cross_file_redundancy import CrossFileRedundancyDetector
+    from analyzers.structural_analyzer import StructuralAnalyzer
+
+    def run(files, llm=None, **options):
+        analyzer = StructuralAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = analyzer.analyze_codebase(files)
+        detector = CrossFileRedundancyDetector(report["symbol_table_object"], llm, tree_registry=analyzer.trees, **options)
+        return asyncio.run(detector.detect_duplicates())
+    return run
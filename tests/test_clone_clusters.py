@@ -0,0 +1,60 @@
+"""Clone clusters: connected similar pairs, each member verified once against the cluster medoid."""
+
+import numpy as np
+
+from conftest import StubLLM
+from core.similarity import cluster_pairs
+
+def test_cluster_pairs():
+    pairs = np.array([[5, 6], [0, 3], [3, 4], [1, 6], [0, 4]])
+    assert cluster_pairs(8, pairs) == [[0, 3, 4], [1, 5, 6]]
+    assert cluster_pairs(3, np.empty((0, 2), dtype=np.int64)) == []
+    # A long chain collapses into one cluster
+    chain = np.stack([np.arange(999), np.arange(1, 1000)], axis=1)[::-1]
+    assert cluster_pairs(1000, chain) == [list(range(1000))]
+
+def test_expected_clusters_in_samples(find_duplicates, sample_files):
+    llm = StubLLM([("process_data", "transform_list"), ("iterative_sum_squares", "recursive_sum_squares")])
+    duplicates = find_duplicates(sample_files("tests/04_redundancy"), llm)
+    assert [[f.qualified_name for f in dup.functions] for dup in duplicates] == [
+        ["duplicate_a.process_data", "duplicate_b.transform_list"],
+        ["logic_match.iterative_sum_squares", "logic_match.recursive_sum_squares"],
+    ]
+    # The structural distractor is checked but never confirmed
+    assert any("process_data_v3" in call for call in llm.calls)
+
+def test_cluster_is_verified_against_its_medoid(tmp_path, find_duplicates):
+    # Five variants of one helper: similar enough to cluster, different enough to need the LLM
+    variants = {
+        "sum_a": "    total = 0\n    for x in xs:\n        total += x\n    return total\n",
+        "sum_b": "    total = 0\n    for x in xs:\n        if x:\n            total += x\n    return total\n",
+        "sum_c": "    total = 0\n    for x in xs:\n        total = total + x\n    return total\n",
+        "sum_d": "    total = 0\n    i = 0\n    for x in xs:\n        total += x\n        i += 1\n    return total\n",
+        "sum_e": "    total = 0\n    for x in list(xs):\n        total += x\n    return total\n",
+    }
+    for name, body in variants.items():
+        (tmp_path / f"{name}_mod.py").write_text(f"def {name}(xs):\n{body}")
+    names = sorted(variants)
+    llm = StubLLM([(a, b) for a in names for b in names if a != b])
+
+    duplicates = find_duplicates(sorted(tmp_path.glob("*.py")), llm)
+    assert len(duplicates) == 1
+    assert sorted(f.name for f in duplicates[0].functions) == names
+    medoid = duplicates[0].functions[0].name
+    # k members cost k - 1 checks, all against the medoid
+    assert len(llm.calls) == len(names) - 1
+    assert all(call[0] == medoid for call in llm.calls)
+
+def test_rejected_members_are_reclustered(tmp_path, find_duplicates):
+    variants = {
+        "sum_a": "    total = 0\n    for x in xs:\n        total += x\n    return total\n",
+        "sum_b": "    total = 0\n    for x in xs:\n        if x:\n            total += x\n    return total\n",
+        "sum_c": "    total = 0\n    for x in xs:\n        total = total + x\n    return total\n",
+    }
+    for name, body in variants.items():
+        (tmp_path / f"{name}_mod.py").write_text(f"def {name}(xs):\n{body}")
+    # sum_a is the medoid and the LLM rejects both members against it; they still match each other
+    llm = StubLLM([("sum_b", "sum_c")])
+    duplicates = find_duplicates(sorted(tmp_path.glob("*.py")), llm)
+    assert [sorted(f.name for f in dup.functions) for dup in duplicates] == [["sum_b", "sum_c"]]
+    assert llm.calls == [("sum_a", "sum_b"), ("sum_a", "sum_c"), ("sum_b", "sum_c")]
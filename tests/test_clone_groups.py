@@ -0,0 +1,27 @@
+"""Renamed clones: functions with one normalized-AST hash are reported as a group without LLM calls."""
+
+from conftest import StubLLM
+
+def test_renamed_clones_in_samples(sample_files, find_duplicates):
+    llm = StubLLM()
+    duplicates = find_duplicates(sample_files("syntax_test", "redundancy_part*.py"), llm)
+
+    groups = sorted(sorted(f.name for f in dup.functions) for dup in duplicates)
+    assert groups == [["calculate_area_circle", "compute_field_size"], ["factorial_recursive", "get_combinations_count"]]
+    assert all(dup.similarity == 1.0 and dup.reason.startswith("Renamed clones") for dup in duplicates)
+    assert llm.calls == []
+
+def test_clone_group_of_three(tmp_path, find_duplicates):
+    body = "    total = 0\n    for {v} in {seq}:\n        total += {v} * {k}\n    return total\n"
+    for i, (name, v, seq, k) in enumerate([("scaled_sum", "x", "xs", 2), ("weighted", "item", "items", 3),
+                                           ("tally", "n", "values", 7)]):
+        (tmp_path / f"mod{i}.py").write_text(f"def {name}({seq}):\n" + body.format(v=v, seq=seq, k=k))
+    # A structurally different function stays out of the group (and the LLM rejects it as a near match)
+    (tmp_path / "other.py").write_text("def product(xs):\n    result = 1\n    while xs:\n        result *= xs.pop()\n    return result\n")
+
+    llm = StubLLM()
+    duplicates = find_duplicates(sorted(tmp_path.glob("*.py")), llm)
+    assert [sorted(f.name for f in dup.functions) for dup in duplicates] == [["scaled_sum", "tally", "weighted"]]
+    # Only the group's representative is compared with the rest
+    assert all("product" in call for call in llm.calls)
+    assert len(llm.calls) == 1
@@ -0,0 +1,66 @@
+"""CompactGraph: CSR queries, vectorised traversals and .npz snapshots."""
+
+import numpy as np
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+from core.call_graph_builder import CallGraphBuilder
+from core.compact_graph import CompactGraph
+
+def _graph():
+    # main -> load -> parse -> tokenize, main -> report; orphan is unreachable; duplicate edge collapses
+    return CompactGraph.from_edges(
+        ["main", "orphan"],
+        [("main", "load"), ("load", "parse"), ("parse", "tokenize"), ("main", "report"), ("main", "load")],
+    )
+
+def test_adjacency_both_ways():
+    graph = _graph()
+    assert len(graph) == 6
+    assert sorted(graph.successors("main")) == ["load", "report"]
+    assert graph.predecessors("load") == ["main"]
+    assert graph.predecessors("main") == []
+    assert graph.successors("missing") == []
+    assert sorted(graph.edges()) == sorted([("main", "load"), ("load", "parse"), ("parse", "tokenize"), ("main", "report")])
+    assert graph.in_degrees().tolist() == [0, 0, 1, 1, 1, 1]
+
+def test_reachability_and_paths():
+    graph = _graph()
+    assert sorted(graph.reachable(["main"])) == ["load", "main", "parse", "report", "tokenize"]
+    assert sorted(graph.reachable(["tokenize"], reverse=True)) == ["load", "main", "parse", "tokenize"]
+    assert not graph.reachable_mask(["main"])[graph.ids["orphan"]]
+    assert graph.shortest_path("main", "tokenize") == ["main", "load", "parse", "tokenize"]
+    assert graph.shortest_path("report", "main") == []
+    parents = graph.bfs_parents(["orphan", "main"])
+    assert graph.parent_chain(parents, "parse") == ["main", "load", "parse"]
+
+def test_snapshot_round_trip(tmp_path):
+    graph = _graph()
+    graph.save(tmp_path / "graph.npz")
+    loaded = CompactGraph.load(tmp_path / "graph.npz")
+    assert loaded.nodes == graph.nodes
+    for name in ("indptr", "indices", "rev_indptr", "rev_indices"):
+        assert np.array_equal(getattr(loaded, name), getattr(graph, name))
+    assert loaded.predecessors("parse") == ["load"]
+
+def test_snapshot_version_and_missing_file(tmp_path):
+    path = tmp_path / "graph.npz"
+    _graph().save(path)
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays["version"] = np.array([CompactGraph.SNAPSHOT_VERSION + 1])
+    np.savez(path, **arrays)
+    assert CompactGraph.load(path) is None
+    assert CompactGraph.load(tmp_path / "missing.npz") is None
+
+def test_call_graph_snapshot(tmp_path, sample_files):
+    analyzer = StructuralAnalyzer()
+    analyzer.analyze_codebase(sample_files("syntax_test/multi_file"))
+    builder = analyzer.call_graph_builder()
+    builder.save_snapshot(tmp_path / "snapshot")
+
+    restored = CallGraphBuilder(analyzer.symbol_table)
+    assert restored.load_snapshot(tmp_path / "snapshot")
+    assert sorted(restored.functions.edges()) == sorted(builder.functions.edges())
+    assert restored.get_call_chain("cycle_b.main", "cycle_a.func_a") == ["cycle_b.main", "cycle_b.func_b", "cycle_a.func_a"]
+    assert restored.find_circular_dependencies() == builder.find_circular_dependencies()
+    assert not CallGraphBuilder(analyzer.symbol_table).load_snapshot(tmp_path / "missing")
@@ -0,0 +1,56 @@
+"""Cycle engine (SCC + bounded shortest cycles) and the import cycles it reports on the samples."""
+
+import numpy as np
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+from core.compact_graph import CompactGraph
+from core.scc import find_cycles, shortest_cycle_through, strongly_connected_components
+
+def _graph(edges, nodes=()):
+    return CompactGraph.from_edges(nodes, edges)
+
+def test_components_and_shortest_cycles():
+    # a -> b -> c -> a plus the shortcut b -> a; d loops on itself; e only points into the cycle
+    graph = _graph([("a", "b"), ("b", "c"), ("c", "a"), ("b", "a"), ("d", "d"), ("e", "a")])
+    components = sorted(sorted(graph.nodes[i] for i in c) for c in strongly_connected_components(graph.indptr, graph.indices))
+    assert components == [["a", "b", "c"], ["d"], ["e"]]
+
+    groups = find_cycles(graph.indptr, graph.indices, max_cycles_per_scc=1, nodes=graph.nodes)
+    assert [sorted(g.members) for g in groups] == [["a", "b", "c"], ["d"]]
+    assert groups[0].cycles == [["a", "b"]]
+    assert groups[1].cycles == [["d"]]
+
+    a, c = graph.ids["a"], graph.ids["c"]
+    cycle = shortest_cycle_through(graph.indptr, graph.indices, c)
+    assert [graph.nodes[i] for i in cycle] == ["c", "a", "b"]
+    assert shortest_cycle_through(graph.indptr, graph.indices, a, within={a}) is None
+
+def test_acyclic_graph_has_no_cycles():
+    graph = _graph([("a", "b"), ("b", "c"), ("a", "c")])
+    assert find_cycles(graph.indptr, graph.indices) == []
+
+def test_long_ring_is_one_component():
+    # Deeper than the recursion limit: the engine must stay iterative
+    n = 50000
+    indptr = np.arange(n + 1, dtype=np.int64)
+    indices = (np.arange(n, dtype=np.int32) + 1) % n
+    groups = find_cycles(indptr, indices)
+    assert len(groups) == 1
+    assert len(groups[0]) == n
+    assert len(groups[0].cycles[0]) == n
+
+def test_import_cycles_in_samples(sample_files):
+    structural = StructuralAnalyzer().analyze_codebase(sample_files("tests/02_structural"))
+    assert structural["circular_dependencies"] == [["circular_dep_a.py", "circular_dep_b.py", "circular_dep_a.py"]]
+
+    multi_file = StructuralAnalyzer().analyze_codebase(sample_files("syntax_test/multi_file"))
+    assert multi_file["circular_dependencies"] == [["cycle_a.py", "cycle_b.py", "cycle_a.py"]]
+
+def test_function_cycles_in_samples(sample_files):
+    report = StructuralAnalyzer().analyze_codebase(sample_files("tests/02_structural", "*.*"))
+    cycles = [[s.qualified_name for s in cycle] for cycle in report["function_cycles"]]
+    # Mutual recursion across the two modules, plain recursion in the C sample
+    assert cycles == [["circular_dep_a.func_a", "circular_dep_b.func_b"], ["simple_recursion.factorial"]]
+
+    report = StructuralAnalyzer().analyze_codebase(sample_files("syntax_test/multi_file"))
+    assert [[s.qualified_name for s in cycle] for cycle in report["function_cycles"]] == [["cycle_a.func_a", "cycle_b.func_b"]]
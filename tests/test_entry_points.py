@@ -0,0 +1,38 @@
+"""Entry-point reachability: dead code is whatever no entry point (or module-level code) reaches."""
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+from core.entry_points import EntryPoints
+
+def test_reachability_on_samples(sample_files):
+    files = sample_files("syntax_test/multi_file") + sample_files("tests/02_structural")
+    analyzer = StructuralAnalyzer(entry_points=EntryPoints.from_patterns([]))
+    report = analyzer.analyze_codebase(files)
+
+    # circular_dep_a.func_a / circular_dep_b.func_b only call each other
+    assert sorted(s.qualified_name for s in report["dead_code"]) == [
+        "circular_dep_a.func_a", "circular_dep_b.func_b", "cycle_a.unused_func_a", "dead_code.unused_function",
+    ]
+    # Reached from the default `main` entry point, and from dead_code.py's module-level code
+    assert analyzer.why_alive("cycle_a.func_a") == ["cycle_b.main", "cycle_b.func_b", "cycle_a.func_a"]
+    chain = analyzer.why_alive("dead_code.used_function")
+    assert chain[0].startswith("<module ") and chain[1:] == ["dead_code.used_function"]
+    assert analyzer.why_alive("cycle_a.unused_func_a") == []
+
+def test_unreachable_recursion_is_dead(tmp_path):
+    source = tmp_path / "service.py"
+    source.write_text(
+        "def ping():\n    pong()\n\n"
+        "def pong():\n    ping()\n\n"
+        "def handler():\n    return 1\n\n"
+        "def main():\n    handler()\n"
+    )
+    # The name heuristic keeps anything with a caller; reachability sees ping/pong only call each other
+    heuristic = StructuralAnalyzer().analyze_codebase([source])
+    assert not {"service.ping", "service.pong"} & {s.qualified_name for s in heuristic["dead_code"]}
+
+    reachability = StructuralAnalyzer(entry_points=EntryPoints.from_patterns([])).analyze_codebase([source])
+    assert sorted(s.qualified_name for s in reachability["dead_code"]) == ["service.ping", "service.pong"]
+
+    # An explicit entry point makes them live again
+    rooted = StructuralAnalyzer(entry_points=EntryPoints.from_patterns(["service.ping"])).analyze_codebase([source])
+    assert rooted["dead_code"] == []
@@ -0,0 +1,46 @@
+"""SQLite graph store: incremental sync and the queries behind the `query` commands."""
+
+from typer.testing import CliRunner
+
+import main
+from analyzers.structural_analyzer import StructuralAnalyzer
+from core.graph_store import GraphStore
+
+def _analyzed(sample_files):
+    analyzer = StructuralAnalyzer()
+    analyzer.analyze_codebase(sample_files("syntax_test/multi_file") + sample_files("tests/02_structural"))
+    return analyzer
+
+def test_sync_and_queries(tmp_path, sample_files):
+    analyzer = _analyzed(sample_files)
+    records = analyzer.graph_records()
+    with GraphStore(tmp_path / "graph.db") as store:
+        assert store.sync(records) == {"written": 5, "unchanged": 0, "removed": 0}
+        assert store.sync(records) == {"written": 0, "unchanged": 5, "removed": 0}
+
+        assert sorted(r["qualified_name"] for r in store.find_symbols("func_b")) == ["circular_dep_b.func_b", "cycle_b.func_b"]
+        assert sorted(r["qualified_name"] for r in store.callers("cycle_b.func_b")) == ["cycle_a.func_a", "cycle_b.main"]
+        assert [r["qualified_name"] for r in store.callees("cycle_b.main")] == ["cycle_b.func_b"]
+        assert store.chain("cycle_b.main", "cycle_a.func_a") == ["cycle_b.main", "cycle_b.func_b", "cycle_a.func_a"]
+        assert store.chain("cycle_a.unused_func_a", "cycle_b.main") == []
+
+        cycle_a = store.resolve_file("multi_file/cycle_a.py")
+        assert len(cycle_a) == 1
+        assert [(dep.rsplit("/", 1)[-1], kind) for dep, kind in store.file_deps(cycle_a[0])] == [("cycle_b.py", "import")]
+        assert {f["name"] for f in store.findings("dead_code")} == {"cycle_a.unused_func_a", "dead_code.unused_function"}
+
+        # Dropping a file removes its rows only
+        del records[cycle_a[0]]
+        assert store.sync(records) == {"written": 0, "unchanged": 4, "removed": 1}
+        assert store.find_symbols("cycle_a.func_a") == []
+        assert [r["qualified_name"] for r in store.callers("cycle_b.func_b")] == ["cycle_b.main"]
+
+def test_query_chain_uses_the_snapshot(tmp_path, sample_files):
+    db_path = tmp_path / "graph.db"
+    main._store_graph(db_path, _analyzed(sample_files), quiet=True)
+    assert (main._snapshot_dir(db_path) / "functions.npz").exists()
+    assert main._load_call_graph(tmp_path, db_path) is not None
+
+    result = CliRunner().invoke(main.app, ["query", "chain", "cycle_b.main", "cycle_a.func_a", "--db", str(db_path)])
+    assert result.exit_code == 0
+    assert "cycle_b.main → cycle_b.func_b → cycle_a.func_a" in result.output
@@ -0,0 +1,51 @@
+"""Incremental analysis: manifest reuse and dependency-aware invalidation give the results of a full run."""
+
+import shutil
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+from core.manifest import AnalysisManifest
+from conftest import REPO_ROOT
+
+def _project(tmp_path):
+    root = tmp_path / "project"
+    shutil.copytree(REPO_ROOT / "syntax_test" / "multi_file", root, ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copy(REPO_ROOT / "tests" / "02_structural" / "dead_code.py", root)
+    return root, sorted(root.glob("*.py"))
+
+def _incremental_run(manifest_path, files):
+    manifest = AnalysisManifest(manifest_path)
+    for f in files:
+        manifest.check(f)
+    dirty = manifest.finalize_scan(files)
+    report = StructuralAnalyzer().analyze_codebase(files, manifest=manifest)
+    manifest.save()
+    return dirty, report
+
+def test_unchanged_files_are_reused(tmp_path, report_summary):
+    root, files = _project(tmp_path)
+    manifest_path = tmp_path / "manifest.bin"
+
+    dirty, first = _incremental_run(manifest_path, files)
+    assert len(dirty) == len(files)
+    assert first["incremental"] == {"reanalyzed": len(files), "reused": 0}
+
+    dirty, second = _incremental_run(manifest_path, files)
+    assert dirty == set()
+    assert second["incremental"] == {"reanalyzed": 0, "reused": len(files)}
+    assert report_summary(second) == report_summary(first)
+    assert second["circular_dependencies"] == [["cycle_a.py", "cycle_b.py", "cycle_a.py"]]
+
+def test_change_invalidates_dependents(tmp_path, report_summary):
+    root, files = _project(tmp_path)
+    manifest_path = tmp_path / "manifest.bin"
+    _incremental_run(manifest_path, files)
+
+    # cycle_a imports cycle_b, so editing cycle_b makes both dirty; dead_code.py stays clean
+    (root / "cycle_b.py").write_text('def func_b():\n    print("In B")\n')
+    dirty, report = _incremental_run(manifest_path, files)
+    assert dirty == {str(root / "cycle_a.py"), str(root / "cycle_b.py")}
+    assert report["incremental"] == {"reanalyzed": 2, "reused": 1}
+
+    fresh = StructuralAnalyzer().analyze_codebase(files)
+    assert report_summary(report) == report_summary(fresh)
+    assert report["circular_dependencies"] == []
@@ -0,0 +1,22 @@
+"""Concurrent LLM verification: bounded in-flight requests, same findings as one at a time."""
+
+from conftest import StubLLM
+
+DUPLICATES = [("process_data", "transform_list"), ("iterative_sum_squares", "recursive_sum_squares")]
+
+def _run(find_duplicates, sample_files, concurrency):
+    # Later requests answer first, so completion order differs from submission order
+    llm = StubLLM(DUPLICATES, delay=lambda names: 0.05 / (1 + len(llm.calls)))
+    duplicates = find_duplicates(sample_files("tests/04_redundancy"), llm, llm_concurrency=concurrency)
+    findings = [([f.qualified_name for f in dup.functions], round(dup.similarity, 6), dup.reason) for dup in duplicates]
+    return findings, llm
+
+def test_concurrent_verification_matches_sequential(find_duplicates, sample_files):
+    sequential, llm = _run(find_duplicates, sample_files, 1)
+    assert llm.peak == 1
+
+    for concurrency in (2, 8):
+        concurrent, llm_concurrent = _run(find_duplicates, sample_files, concurrency)
+        assert concurrent == sequential
+        assert sorted(llm_concurrent.calls) == sorted(llm.calls)
+        assert 1 < llm_concurrent.peak <= concurrency
@@ -0,0 +1,49 @@
+"""MinHash/LSH candidate generation over multiset (weighted) features."""
+
+import numpy as np
+
+from analyzers.cross_file_redundancy import CrossFileRedundancyDetector
+from core.lsh import MinHashLSH, multiset_items
+
+def _weighted_jaccard(a, b):
+    return np.minimum(a, b).sum() / np.maximum(a, b).sum()
+
+def test_multiset_items_preserve_weighted_jaccard():
+    rng = np.random.RandomState(7)
+    for _ in range(50):
+        a, b = rng.randint(0, 4, size=40), rng.randint(0, 4, size=40)
+        items_a, items_b = set(multiset_items(a).tolist()), set(multiset_items(b).tolist())
+        assert len(items_a) == a.sum()
+        jaccard = len(items_a & items_b) / len(items_a | items_b)
+        assert np.isclose(jaccard, _weighted_jaccard(a, b))
+    assert len(multiset_items(np.zeros(5))) == 0
+
+def test_bands_for_the_detector_threshold():
+    detector = CrossFileRedundancyDetector
+    lsh = MinHashLSH.for_threshold(detector.AST_SIMILARITY_THRESHOLD, rows=detector.LSH_ROWS, recall=detector.LSH_RECALL)
+    assert (lsh.bands, lsh.rows) == (110, 3)
+    assert lsh.collision_probability(detector.AST_SIMILARITY_THRESHOLD) >= detector.LSH_RECALL
+    # One band fewer would miss the recall target
+    assert MinHashLSH(lsh.bands - 1, lsh.rows).collision_probability(detector.AST_SIMILARITY_THRESHOLD) < detector.LSH_RECALL
+
+def test_signatures_estimate_jaccard_deterministically():
+    lsh = MinHashLSH(bands=64, rows=4)
+    a, b = np.arange(0, 300), np.arange(100, 400)  # Jaccard 200 / 400
+    sig_a, sig_b = lsh.signature(a), lsh.signature(b)
+    assert np.array_equal(sig_a, MinHashLSH(bands=64, rows=4).signature(a))
+    assert abs((sig_a == sig_b).mean() - 0.5) < 0.1
+    assert lsh.signature(np.empty(0)) is None
+
+def test_candidate_pairs():
+    lsh = MinHashLSH.for_threshold(0.3)
+    base = np.arange(0, 100)
+    signatures = [
+        lsh.signature(base),
+        lsh.signature(np.arange(1000, 1100)),  # disjoint from everything
+        lsh.signature(base),                    # identical to 0
+        None,                                   # empty item never matches
+        lsh.signature(np.arange(20, 120)),      # Jaccard 80 / 120 with 0 and 2
+    ]
+    pairs = lsh.candidate_pairs(signatures)
+    assert pairs.tolist() == [[0, 2], [0, 4], [2, 4]]
+    assert lsh.candidate_pairs(signatures[:1]).shape == (0, 2)
@@ -0,0 +1,11 @@
+"""StructuralAnalyzer(jobs=N) must produce exactly the serial results."""
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+
+def test_jobs_match_serial(sample_files, report_summary):
+    files = (sample_files("tests/02_structural", "*.*") + sample_files("syntax_test/multi_file")
+             + sample_files("semantic_suite") + sample_files("tests/04_redundancy"))
+    serial = report_summary(StructuralAnalyzer().analyze_codebase(files))
+    parallel = report_summary(StructuralAnalyzer(jobs=3).analyze_codebase(files))
+    assert serial["symbols"]
+    assert parallel == serial
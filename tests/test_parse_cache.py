@@ -0,0 +1,29 @@
+"""The on-disk parse cache: warm runs are served from it and match cold and uncached runs."""
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+from core.parse_cache import ParseCache
+
+def test_warm_cache_matches_cold_run(sample_files, report_summary, tmp_path):
+    files = sample_files("tests/02_structural") + sample_files("syntax_test/multi_file") + sample_files("semantic_suite")
+
+    cold_cache = ParseCache(tmp_path)
+    cold = report_summary(StructuralAnalyzer(cache=cold_cache).analyze_codebase(files))
+    assert cold_cache.hits == 0
+
+    # A fresh instance reloads the index from disk, as the next process would
+    warm_cache = ParseCache(tmp_path)
+    warm = report_summary(StructuralAnalyzer(cache=warm_cache).analyze_codebase(files))
+    assert warm_cache.hits == len(files)
+    assert warm_cache.misses == 0
+
+    uncached = report_summary(StructuralAnalyzer().analyze_codebase(files))
+    assert warm == cold == uncached
+
+def test_eviction_keeps_the_cache_within_budget(tmp_path):
+    cache = ParseCache(tmp_path, max_bytes=4096)
+    for i in range(64):
+        cache.put(ParseCache.make_key(f"x = {i}", "python", "test"), {"payload": bytes(range(256)) * 2, "i": i})
+    assert cache._total_bytes <= 4096
+    # The most recent entry survives, the oldest is gone
+    assert cache.get(ParseCache.make_key("x = 63", "python", "test"))["i"] == 63
+    assert cache.get(ParseCache.make_key("x = 0", "python", "test")) is None
@@ -0,0 +1,42 @@
+"""Vectorised structural similarity: count vectors and blockwise pair scoring."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from core.similarity import TokenVocabulary, count_vectors, pair_similarity
+
+def test_count_vectors():
+    vocabulary = TokenVocabulary()
+    arrays = [vocabulary.encode("For Assign BinOp Assign".split()), vocabulary.encode([]), vocabulary.encode(["Return"])]
+    assert vocabulary.ids == {"For": 0, "Assign": 1, "BinOp": 2, "Return": 3}
+
+    vectors = count_vectors(arrays, len(vocabulary), bigram_buckets=8)
+    assert vectors.shape == (3, 4 + 8)
+    assert vectors[0, :4].tolist() == [1, 2, 1, 0]
+    assert vectors[0, 4:].sum() == 3  # three adjacent pairs
+    assert not vectors[1].any()
+    assert vectors[2].tolist() == [0, 0, 0, 1] + [0] * 8
+
+def test_pair_similarity_matches_pairwise_reference():
+    rng = np.random.RandomState(3)
+    vectors = rng.randint(0, 5, size=(12, 30)).astype(np.float32)
+    vectors[4] = 0  # an empty function scores 0 against everything
+    pairs = np.array(list(itertools.combinations(range(12), 2)))
+
+    # Small blocks exercise the block boundaries
+    jaccard = pair_similarity(vectors, pairs, "jaccard", block=7)
+    cosine = pair_similarity(vectors, pairs, "cosine", block=7)
+    for (i, j), jac, cos in zip(pairs.tolist(), jaccard, cosine):
+        a, b = vectors[i].astype(np.float64), vectors[j].astype(np.float64)
+        expected_jac = np.minimum(a, b).sum() / np.maximum(a, b).sum() if np.maximum(a, b).sum() else 0.0
+        norms = np.linalg.norm(a) * np.linalg.norm(b)
+        expected_cos = a @ b / norms if norms else 0.0
+        assert jac == pytest.approx(expected_jac, rel=1e-6)
+        assert cos == pytest.approx(expected_cos, rel=1e-6)
+
+    assert pair_similarity(vectors, np.array([[0, 0]]))[0] == pytest.approx(1.0)
+    assert len(pair_similarity(vectors, np.empty((0, 2), dtype=np.int64))) == 0
+    with pytest.raises(ValueError):
+        pair_similarity(vectors, pairs, "euclidean")
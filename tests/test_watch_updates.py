@@ -0,0 +1,40 @@
+"""Watch mode: update_files() reports the right deltas and ends in the state of a fresh run."""
+
+import shutil
+
+from analyzers.structural_analyzer import StructuralAnalyzer
+from conftest import REPO_ROOT
+
+def _project(tmp_path):
+    root = tmp_path / "project"
+    shutil.copytree(REPO_ROOT / "syntax_test" / "multi_file", root, ignore=shutil.ignore_patterns("__pycache__"))
+    return root
+
+def test_edit_breaks_the_cycle(tmp_path, report_summary):
+    root = _project(tmp_path)
+    analyzer = StructuralAnalyzer()
+    analyzer.analyze_codebase(sorted(root.glob("*.py")))
+
+    (root / "cycle_b.py").write_text('def func_b():\n    print("In B")\n\ndef helper():\n    return 1\n')
+    delta = analyzer.update_files(changed=[root / "cycle_b.py"])
+
+    assert delta["circular_dependencies"]["removed"] == [["cycle_a.py", "cycle_b.py", "cycle_a.py"]]
+    assert [[s.qualified_name for s in c] for c in delta["function_cycles"]["removed"]] == [["cycle_a.func_a", "cycle_b.func_b"]]
+    assert sorted(s.qualified_name for s in delta["dead_code"]["added"]) == ["cycle_a.func_a", "cycle_b.helper"]
+    assert delta["unused_variables"] == {"added": [], "removed": []}
+
+    fresh = StructuralAnalyzer().analyze_codebase(sorted(root.glob("*.py")))
+    assert report_summary(analyzer._findings | {"symbol_table_object": analyzer.symbol_table}) == report_summary(fresh)
+
+def test_removed_file(tmp_path):
+    root = _project(tmp_path)
+    analyzer = StructuralAnalyzer()
+    analyzer.analyze_codebase(sorted(root.glob("*.py")))
+
+    (root / "cycle_a.py").unlink()
+    delta = analyzer.update_files(removed=[root / "cycle_a.py"])
+
+    assert delta["circular_dependencies"]["removed"] == [["cycle_a.py", "cycle_b.py", "cycle_a.py"]]
+    assert sorted(v["name"] for v in delta["unused_variables"]["removed"]) == ["UNUSED_GLOBAL", "func_a.unused_local"]
+    assert analyzer.symbol_table.get_symbol("cycle_a.func_a") is None
+    assert delta["circular_dependencies"]["added"] == []